@@ -0,0 +1,68 @@
+# benchmarks/bench_batch.py
+
+'''
+Compare `BatchExecutor` against looping the scalar VM once per input record.
+
+Usage:
+    python -m benchmarks.bench_batch [--records N] [--statements S]
+'''
+
+import argparse
+import io
+import random
+import time
+from interpreter.executor import BatchExecutor, VirtualMachine
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import Parser
+from .bench_executor import generate_source
+
+# `generate_source` starts by assigning its 16 variables; here they are inputs
+INPUTS = 16
+
+
+def generate_columns(records: int, seed: int = 0) -> dict[str, list[int]]:
+    rng = random.Random(seed)
+    return {
+        f"v{i}": [rng.randint(0, 99) for _ in range(records)]
+        for i in range(INPUTS)
+    }
+
+
+def bench_scalar(program, columns: dict[str, list[int]]) -> float:
+    compiled = VirtualMachine().compile(program)
+    start = time.perf_counter()
+    for row in zip(*columns.values()):
+        executor = VirtualMachine(stdout=io.StringIO())
+        executor.variables.update(zip(columns, row))
+        executor.run(compiled)
+    return time.perf_counter() - start
+
+
+def bench_batch(program, columns: dict[str, list[int]]) -> float:
+    executor = BatchExecutor(columns)
+    start = time.perf_counter()
+    executor.execute(program)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--records", type=int, default=100_000)
+    argument_parser.add_argument("--statements", type=int, default=50)
+    args = argument_parser.parse_args()
+
+    source_code = generate_source(args.statements).split("\n", INPUTS)[INPUTS]
+    program = Parser(tokenize(source_code)).parse()
+    columns = generate_columns(args.records)
+
+    scalar = bench_scalar(program, columns)
+    batch = bench_batch(program, columns)
+    for name, elapsed in (("scalar", scalar), ("batch", batch)):
+        print(
+            f"{name:<8} {args.records / elapsed:>14,.0f} records/s"
+            f"  {scalar / elapsed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
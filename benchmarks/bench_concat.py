@@ -0,0 +1,83 @@
+# benchmarks/bench_concat.py
+
+'''
+Scaling of long string `+` chains, as built by templating scripts.
+
+Every program is one statement, `out = p0 + p1 + ... + pN`, over variables
+holding short strings. Evaluated pairwise, such a chain copies the growing
+prefix at every `+`, so its time grows with the square of N; the engines join
+string chains in one pass, so the time per operand should stay flat as N grows.
+
+The `python` engine leaves `+` to CPython. Its compiler recurses on long chains,
+so it is not run by default and reports "too deep" beyond a few hundred operands.
+
+Usage:
+    python -m benchmarks.bench_concat [--sizes 1000 4000 16000 64000] [--width 16]
+        [--engines tree bytecode closure] [--repeat 3]
+'''
+
+import argparse
+import time
+from interpreter.executor import ENGINES
+from interpreter.executor.output import NullSink
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import PrattParser
+
+DEFAULT_SIZES = [1000, 4000, 16000, 64000]
+DEFAULT_ENGINES = ["tree", "bytecode", "closure"]
+
+# Distinct operand variables; the chain cycles through them
+PARTS = 16
+
+
+def generate_source(operands: int, width: int) -> str:
+    lines = [f'p{index} = "{chr(97 + index) * width}"' for index in range(PARTS)]
+    lines.append("out = " + " + ".join(f"p{index % PARTS}" for index in range(operands)))
+    return "\n".join(lines) + "\n"
+
+
+def bench(engine: str, operands: int, width: int, repeat: int) -> float | None:
+    '''Best run time in seconds, or None if the engine recurses too deep.'''
+    # The Pratt parser never recurses, whatever the chain length
+    program = PrattParser(tokenize(generate_source(operands, width))).parse()
+    executor = ENGINES[engine](stdout=NullSink())
+    best = float("inf")
+    try:
+        compiled = executor.compile(program)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            variables = executor.run(compiled)
+            best = min(best, time.perf_counter() - start)
+    except RecursionError:
+        return None
+    assert len(variables["out"]) == operands * width
+    return best
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    argument_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    argument_parser.add_argument("--width", type=int, default=16)
+    argument_parser.add_argument(
+        "--engines", nargs="+", choices=ENGINES, default=DEFAULT_ENGINES
+    )
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    args = argument_parser.parse_args()
+
+    print(f"{'operands':>10} {'engine':<10} {'time':>10} {'per operand':>14}")
+    for size in args.sizes:
+        for engine in args.engines:
+            elapsed = bench(engine, size, args.width, args.repeat)
+            if elapsed is None:
+                print(f"{size:>10,} {engine:<10} {'too deep':>10}")
+                continue
+            print(
+                f"{size:>10,} {engine:<10} {elapsed * 1000:>8.2f}ms "
+                f"{elapsed / size * 1e9:>11,.0f}ns"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_executor.py
+
+'''
+Compare execution throughput of the engines in `interpreter.executor`.
+
+Usage:
+    python -m benchmarks.bench_executor [--statements N] [--repeat R]
+'''
+
+import argparse
+import io
+import random
+import time
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import Parser
+from interpreter.executor import ENGINES
+
+
+def generate_source(statements: int, seed: int = 0) -> str:
+    '''Arithmetic-heavy program over a small pool of variables.'''
+    rng = random.Random(seed)
+    names = [f"v{i}" for i in range(16)]
+    lines = [f"{name} = {rng.randint(0, 9)}" for name in names]
+    for _ in range(statements):
+        terms = [
+            rng.choice(names) if rng.random() < 0.6 else str(rng.randint(0, 99))
+            for _ in range(rng.randint(2, 6))
+        ]
+        operators = [rng.choice("+-") for _ in terms[1:]]
+        expression = terms[0] + "".join(
+            f" {op} {term}" for op, term in zip(operators, terms[1:])
+        )
+        if rng.random() < 0.1:
+            lines.append(f"print(max({expression}, 0))")
+        else:
+            lines.append(f"{rng.choice(names)} = {expression}")
+    return "\n".join(lines) + "\n"
+
+
+def bench(engine, program, repeat: int) -> float:
+    '''Best wall time of `repeat` runs (compile excluded).'''
+    compiled = engine().compile(program)
+    best = float("inf")
+    for _ in range(repeat):
+        executor = engine(stdout=io.StringIO())
+        start = time.perf_counter()
+        executor.run(compiled)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--statements", type=int, default=100_000)
+    argument_parser.add_argument("--repeat", type=int, default=5)
+    args = argument_parser.parse_args()
+
+    program = Parser(tokenize(generate_source(args.statements))).parse()
+    statements = len(program.statements)
+    baseline = None
+    for engine in ENGINES.values():
+        elapsed = bench(engine, program, args.repeat)
+        baseline = baseline or elapsed
+        print(
+            f"{engine.name:<10} {statements / elapsed:>14,.0f} statements/s"
+            f"  {baseline / elapsed:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# benchmarks/bench_lexer.py
+
+'''
+Compare tokens/second of the lexer engines in `interpreter.lexer.tokenizer.LEXERS`.
+
+Usage:
+    python -m benchmarks.bench_lexer [--megabytes N] [--repeat R]
+'''
+
+import argparse
+import time
+from interpreter.lexer.tokenizer import LEXERS
+from .bench_executor import generate_source
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--megabytes", type=float, default=4)
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    args = argument_parser.parse_args()
+
+    # About 30 bytes per generated statement
+    source_code = generate_source(int(args.megabytes * 1_000_000 / 30))
+    print(f"source: {len(source_code) / 1_000_000:.1f} MB")
+
+    baseline = None
+    for name, lexer in LEXERS.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            tokens = lexer(source_code)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(
+            f"{name:<10} {len(tokens) / best:>14,.0f} tokens/s"
+            f"  {len(source_code) / best / 1_000_000:>6.1f} MB/s"
+            f"  {baseline / best:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
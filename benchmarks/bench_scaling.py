@@ -0,0 +1,236 @@
+# benchmarks/bench_scaling.py
+
+'''
+Scaling suite: throughput and peak memory of `tokenize`, `Parser.parse` and
+execution on generated programs of growing size.
+
+Programs come from `benchmarks.generator`, so the shape of the code (depth,
+width, identifier cardinality, string share, call density) can be varied from
+the command line. Results are printed, can be saved as JSON and are compared
+against a stored baseline: a throughput drop or a memory increase beyond the
+tolerance at any size fails the run with exit status 1.
+
+Baselines are machine-specific; record one with `--update-baseline` on the
+machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.bench_scaling [--sizes 1000 10000 100000] [--depth 2]
+        [--output results.json] [--baseline FILE | --no-baseline]
+        [--tolerance 0.3] [--update-baseline]
+
+    python -m benchmarks.bench_scaling --sizes 1000 10000 100000 1000000 10000000
+'''
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Callable
+from interpreter import __version__
+from interpreter.executor import ENGINES
+from interpreter.executor.output import NullSink
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import Parser
+from .generator import ProgramShape, generate_source
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = [1000, 10_000, 100_000]
+
+PHASES = ("tokenize", "parse", "execute")
+
+
+def best_time(function: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        result = None  # Frees the previous result before the next run
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(function: Callable[[], Any]) -> tuple[int, Any]:
+    '''Bytes allocated at the peak of `function`, beyond what was live before.'''
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        return tracemalloc.get_traced_memory()[1] - before, result
+    finally:
+        tracemalloc.stop()
+
+
+def resident_memory() -> int | None:
+    '''Current resident set size in bytes, where /proc is available.'''
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def measure(shape: ProgramShape, engine: str, repeat: int, memory: bool) -> dict:
+    source_code = generate_source(shape)
+    phases = {
+        "tokenize": lambda: tokenize(source_code),
+        "parse": lambda: Parser(tokens).parse(),
+        "execute": lambda: ENGINES[engine](stdout=NullSink()).execute(program),
+    }
+    seconds = {}
+    rss = resident_memory()
+    seconds["tokenize"], tokens = best_time(phases["tokenize"], repeat)
+    # What the token list adds to the process while it is alive
+    token_rss = resident_memory() - rss if rss is not None else None
+    seconds["parse"], program = best_time(phases["parse"], repeat)
+    seconds["execute"], _ = best_time(phases["execute"], repeat)
+
+    units = {
+        "tokenize": len(tokens),
+        "parse": len(program.statements),
+        "execute": len(program.statements),
+    }
+    result = {
+        "statements": shape.statements,
+        "source_bytes": len(source_code.encode()),
+        "tokens": len(tokens),
+        "token_rss": token_rss,
+        "throughput": {
+            phase: units[phase] / seconds[phase] for phase in PHASES
+        },
+        "seconds": seconds,
+    }
+    if memory:
+        # Measured in separate runs, as tracing slows everything down
+        del tokens, program
+        result["peak_memory"] = {}
+        result["peak_memory"]["tokenize"], tokens = peak_memory(phases["tokenize"])
+        result["peak_memory"]["parse"], program = peak_memory(phases["parse"])
+        result["peak_memory"]["execute"], _ = peak_memory(phases["execute"])
+        result["tokens_per_mb"] = len(tokens) / (result["peak_memory"]["tokenize"] / 1e6)
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    '''Describe every regression of `results` against `baseline`.'''
+    if (results["shape"], results["engine"]) != (baseline["shape"], baseline["engine"]):
+        return ["the baseline was recorded with a different shape or engine"]
+
+    regressions = []
+    recorded = {result["statements"]: result for result in baseline["results"]}
+    for result in results["results"]:
+        old = recorded.get(result["statements"])
+        if old is None:
+            continue
+        for phase in PHASES:
+            new_rate, old_rate = result["throughput"][phase], old["throughput"][phase]
+            if new_rate < old_rate * (1 - tolerance):
+                regressions.append(
+                    f"{result['statements']:,} statements: {phase} throughput "
+                    f"{new_rate:,.0f}/s is {1 - new_rate / old_rate:.0%} below "
+                    f"the baseline's {old_rate:,.0f}/s"
+                )
+            new_peak = result.get("peak_memory", {}).get(phase)
+            old_peak = old.get("peak_memory", {}).get(phase)
+            if new_peak and old_peak and new_peak > old_peak * (1 + tolerance):
+                regressions.append(
+                    f"{result['statements']:,} statements: {phase} peak memory "
+                    f"{new_peak / 1e6:,.1f} MB is {new_peak / old_peak - 1:.0%} "
+                    f"above the baseline's {old_peak / 1e6:,.1f} MB"
+                )
+    return regressions
+
+
+def format_result(result: dict) -> str:
+    throughput, peaks = result["throughput"], result.get("peak_memory", {})
+    columns = [f"{result['statements']:>10,}"]
+    for phase in PHASES:
+        columns.append(f"{throughput[phase]:>14,.0f}/s")
+        columns.append(
+            f"{peaks[phase] / 1e6:>9.1f} MB" if phase in peaks else f"{'-':>12}"
+        )
+    if "tokens_per_mb" in result:
+        columns.append(f"{result['tokens_per_mb']:>11,.0f}")
+    if result["token_rss"] is not None:
+        columns.append(f"{result['token_rss'] / 1e6:>9.1f} MB")
+    return " ".join(columns)
+
+
+def parse_args() -> argparse.Namespace:
+    argument_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    argument_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    defaults = ProgramShape()
+    for shape_field in fields(ProgramShape):
+        if shape_field.name != "statements":
+            argument_parser.add_argument(
+                "--" + shape_field.name.replace("_", "-"),
+                type=type(getattr(defaults, shape_field.name)),
+                default=getattr(defaults, shape_field.name)
+            )
+    argument_parser.add_argument("--engine", choices=ENGINES, default="bytecode")
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    argument_parser.add_argument(
+        "--no-memory", dest="memory", action="store_false",
+        help="skip the (slow) peak memory runs"
+    )
+    argument_parser.add_argument("--output", metavar="FILE", help="save results as JSON")
+    argument_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    argument_parser.add_argument("--no-baseline", action="store_true")
+    argument_parser.add_argument("--tolerance", type=float, default=0.3)
+    argument_parser.add_argument(
+        "--update-baseline", action="store_true",
+        help="overwrite the baseline with these results instead of comparing"
+    )
+    return argument_parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    shape_options = {
+        shape_field.name: getattr(args, shape_field.name)
+        for shape_field in fields(ProgramShape)
+        if shape_field.name != "statements"
+    }
+    results = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "engine": args.engine,
+        "shape": shape_options,
+        "results": [],
+    }
+    print(
+        f"{'statements':>10} " + " ".join(
+            f"{phase:>16} {'peak':>12}" for phase in PHASES
+        ) + f" {'tokens/MB':>11} {'token RSS':>12}"
+    )
+    for size in args.sizes:
+        shape = ProgramShape(statements=size, **shape_options)
+        result = measure(shape, args.engine, args.repeat, args.memory)
+        results["results"].append(result)
+        print(format_result(result), flush=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+    elif not args.no_baseline and args.baseline.exists():
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_sessions.py
+
+'''
+Local socket load test for `AsyncExecutor`: many interactive sessions on one
+event loop.
+
+Every client connects, answers the first `input()`, "thinks" for a while,
+answers the second and reads the output until the session ends. With the
+sessions overlapping, wall time should stay close to the think time as the
+session count grows, until the loop itself is saturated.
+
+Usage:
+    python -m benchmarks.bench_sessions [--sessions 10 100 1000] [--think 0.1]
+'''
+
+import argparse
+import asyncio
+import time
+from interpreter.executor.asynchronous import serve
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import Parser
+
+SOURCE_CODE = '''
+name = input("name? ")
+print("hello " + name)
+count = input("count? ")
+total = sum(1, 2, 3) + 4 - 5
+print(name + " sent " + count, total)
+'''
+
+
+async def client(port: int, index: int, think: float) -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"user{index}\n".encode())
+    await writer.drain()
+    await asyncio.sleep(think)
+    writer.write(f"{index}\n".encode())
+    await writer.drain()
+    output = await reader.read()
+    writer.close()
+    return output
+
+
+async def load(sessions: int, think: float) -> float:
+    program = Parser(tokenize(SOURCE_CODE)).parse()
+    server = await serve(program)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        start = time.perf_counter()
+        outputs = await asyncio.gather(
+            *(client(port, index, think) for index in range(sessions))
+        )
+        elapsed = time.perf_counter() - start
+    assert all(output.endswith(b" 5\n") for output in outputs), outputs[:3]
+    return elapsed
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument(
+        "--sessions", type=int, nargs="+", default=[10, 100, 1000, 5000]
+    )
+    argument_parser.add_argument("--think", type=float, default=0.1)
+    args = argument_parser.parse_args()
+
+    for sessions in args.sessions:
+        elapsed = asyncio.run(load(sessions, args.think))
+        print(
+            f"{sessions:>6} sessions  {elapsed:>7.3f}s  "
+            f"{sessions / elapsed:>10,.0f} sessions/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
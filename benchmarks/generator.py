@@ -0,0 +1,111 @@
+# benchmarks/generator.py
+
+'''
+Seeded generator of synthetic programs following the grammar in
+`interpreter/parser/ast.py`.
+
+Every generated program lexes, parses and runs without errors, and the same
+`ProgramShape` always produces the same source. Values stay small at any size:
+integer and string identifiers are assigned once, from literals, and are only
+ever read; statements assign to separate output identifiers, which are never
+read, so no value grows from one statement to the next.
+
+The grammar has no parentheses, so expressions nest only through calls:
+`depth` is the maximum call nesting and `width` the number of operands in
+every `+`/`-` chain and of arguments in every call.
+
+Usage:
+    from benchmarks.generator import ProgramShape, generate_source
+
+    source_code = generate_source(ProgramShape(statements=10_000, depth=3))
+'''
+
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ProgramShape:
+    statements: int = 1000
+    # Maximum nesting of calls within an expression
+    depth: int = 1
+    # Operands per `+`/`-` chain and arguments per call
+    width: int = 3
+    # Distinct names in each identifier pool (integers, strings, outputs)
+    identifiers: int = 16
+    # Fraction of statements computing a string rather than an integer
+    string_share: float = 0.2
+    # Chance of every operand (below `depth`) being a call
+    call_density: float = 0.1
+    # Fraction of statements that are `print` calls rather than assignments
+    print_share: float = 0.05
+    seed: int = 0
+
+
+class ProgramGenerator:
+    def __init__(self, shape: ProgramShape):
+        self.shape = shape
+        self.rng = random.Random(shape.seed)
+        self.integers = [f"i{index}" for index in range(shape.identifiers)]
+        self.strings = [f"s{index}" for index in range(shape.identifiers)]
+        self.outputs = [f"o{index}" for index in range(shape.identifiers)]
+
+    def lines(self) -> Iterator[str]:
+        rng = self.rng
+        for name in self.integers:
+            yield f"{name} = {rng.randint(0, 99)}"
+        for name in self.strings:
+            yield f"{name} = {self.string_literal()}"
+        for _ in range(self.shape.statements):
+            yield self.statement()
+
+    def statement(self) -> str:
+        rng = self.rng
+        is_string = rng.random() < self.shape.string_share
+        expression = self.expression(is_string, self.shape.depth)
+        if rng.random() < self.shape.print_share:
+            return f"print({expression})"
+        return f"{rng.choice(self.outputs)} = {expression}"
+
+    def expression(self, is_string: bool, depth: int) -> str:
+        rng = self.rng
+        operands = [self.operand(is_string, depth) for _ in range(self.shape.width)]
+        parts = [operands[0]]
+        for operand in operands[1:]:
+            # Strings only support `+`
+            parts.append("+" if is_string or rng.random() < 0.5 else "-")
+            parts.append(operand)
+        return " ".join(parts)
+
+    def operand(self, is_string: bool, depth: int) -> str:
+        rng = self.rng
+        if depth > 0 and rng.random() < self.shape.call_density:
+            # `sum` starts from 0, so it only takes integers
+            function = "max" if is_string else rng.choice(("sum", "max"))
+            arguments = ", ".join(
+                self.expression(is_string, depth - 1)
+                for _ in range(self.shape.width)
+            )
+            return f"{function}({arguments})"
+        if is_string:
+            if rng.random() < 0.5:
+                return rng.choice(self.strings)
+            return self.string_literal()
+        if rng.random() < 0.6:
+            return rng.choice(self.integers)
+        return str(rng.randint(0, 99))
+
+    def string_literal(self) -> str:
+        rng = self.rng
+        text = "".join(rng.choices("abcdefghij", k=rng.randint(1, 8)))
+        return f'"{text}"' if rng.random() < 0.5 else f"'{text}'"
+
+
+def iter_source_lines(shape: ProgramShape) -> Iterator[str]:
+    '''Lines of the program, one at a time, for sources too large to hold.'''
+    return ProgramGenerator(shape).lines()
+
+
+def generate_source(shape: ProgramShape) -> str:
+    return "\n".join(iter_source_lines(shape)) + "\n"
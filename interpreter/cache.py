@@ -0,0 +1,134 @@
+# interpreter/cache.py
+
+'''
+Persistent cache of parsed and optimized programs, like `__pycache__`.
+
+Entries are keyed by a hash of the source, the interpreter `__version__` and
+the front-end options, so editing a script or upgrading the interpreter
+simply misses. Files are written to a temporary name and renamed into place,
+so any number of concurrent runners can share one directory: a reader sees
+either a complete entry or none.
+
+Entries are pickles, and unpickling can run arbitrary code, so anyone who can
+write to the cache directory could run code in the next process that hits it.
+The directory is therefore created private to its user (mode 0o700), and
+entries owned by another user are ignored.
+
+Usage:
+    from interpreter.cache import ProgramCache
+    from interpreter.pipeline import parse_source
+
+    program = parse_source(source_code, cache=ProgramCache())
+'''
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from interpreter import __version__
+from interpreter.parallel import gc_paused
+from interpreter.parser.ast import Program
+
+# Leading bytes of every entry; bump when the file layout changes
+MAGIC = b"PIIP\x01"
+
+
+def default_cache_directory() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "python-interpreter-in-python"
+
+
+def _owned_by_current_user(status: os.stat_result) -> bool:
+    # Windows has no user ids to compare; its ACLs guard the directory instead
+    return not hasattr(os, "getuid") or status.st_uid == os.getuid()
+
+
+class ProgramCache:
+    '''Directory of pickled `Program`s, one file per source hash.
+
+    `options` describes everything besides the source that shapes the cached
+    program (e.g. which optimizer passes ran) and is part of the key.
+
+    Entries are loaded with `pickle`, so the directory must be trusted: it is
+    created with mode 0o700, and on POSIX systems entries not owned by the
+    current user are treated as misses. Do not point it at a directory that
+    other users can write to.
+
+    Usage:
+        cache = ProgramCache("/tmp/cache")
+        program = cache.load(source_code)
+        if program is None:
+            program = Parser(tokenize(source_code)).parse()
+            cache.store(source_code, program)
+    '''
+
+    def __init__(self, directory: str | Path | None = None):
+        self.directory = Path(directory or default_cache_directory())
+        self.hits = self.misses = 0
+
+    def key(self, source_code: str, options: str = "") -> str:
+        digest = hashlib.sha256()
+        for part in (__version__, options, source_code):
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        # Fan out over subdirectories, like git objects, to keep them small
+        return self.directory / key[:2] / f"{key[2:]}.ast"
+
+    def load(self, source_code: str, options: str = "") -> Program | None:
+        '''Return the cached program, or None if there is no usable entry.'''
+        try:
+            with open(self.path(self.key(source_code, options)), "rb") as entry:
+                # Checked on the open file, so it cannot be swapped in between
+                if not _owned_by_current_user(os.fstat(entry.fileno())):
+                    self.misses += 1
+                    return None
+                data = entry.read()
+        except OSError:
+            self.misses += 1
+            return None
+        if not data.startswith(MAGIC):
+            self.misses += 1
+            return None
+        try:
+            # Unpickling millions of nodes is several times faster without
+            # the cyclic collector scanning them
+            with gc_paused():
+                program = pickle.loads(memoryview(data)[len(MAGIC):])
+        except Exception:
+            # Truncated or foreign file; it will be overwritten by `store`
+            self.misses += 1
+            return None
+        self.hits += 1
+        return program
+
+    def store(self, source_code: str, program: Program, options: str = "") -> None:
+        '''Atomically write `program` to the cache; a failure only skips it.'''
+        path = self.path(self.key(source_code, options))
+        try:
+            # Private to this user, as entries are unpickled when loaded
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            path.parent.mkdir(mode=0o700, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError:
+            # Read-only or full file system: run uncached, like Python does
+            return
+        try:
+            with os.fdopen(descriptor, "wb") as temporary_file:
+                temporary_file.write(MAGIC)
+                pickle.dump(program, temporary_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except (OSError, RecursionError):
+            # Out of space, or nested too deeply for pickle
+            os.unlink(temporary)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def clear(self) -> None:
+        '''Remove every entry, including ones left by other versions.'''
+        for entry in self.directory.glob("*/*.ast"):
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,200 @@
+# interpreter/compile_cache.py
+
+'''
+In-process LRU cache of compiled programs, for services evaluating many short,
+mostly repeated snippets.
+
+A snippet is lexed, parsed, optimized and compiled once; later requests for
+the same source get the same `CompiledProgram` and only pay for running it.
+Compiled forms hold no variable state, so one entry can serve any number of
+requests (and threads), each against its own environment.
+
+Usage:
+    from interpreter.compile_cache import CompileCache
+
+    cache = CompileCache(max_entries=10_000, max_bytes=64 << 20)
+    variables = cache.get("z = 2 + 3 + x + y").run({"x": 1, "y": 2})
+    print(cache.statistics())
+'''
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from types import BuiltinFunctionType, CodeType, FunctionType, ModuleType
+from typing import Any, Callable, TextIO
+from interpreter.executor import ENGINES
+from interpreter.optimizer import Optimizer
+from interpreter.pipeline import DEFAULT_ENGINE, parse_source
+
+# Objects shared by every program (and so not charged to any entry)
+SHARED_TYPES = (type, ModuleType, Enum, BuiltinFunctionType, bool, type(None))
+
+
+def approximate_size(root: Any) -> int:
+    '''Bytes reachable from `root`, as counted by `sys.getsizeof`.
+
+    Follows containers, instance dicts, closure cells and code constants,
+    counting every object once. Classes, modules, enum members and builtins
+    are shared between programs and are skipped.
+    '''
+    seen: set[int] = set()
+    pending = [root]
+    total = 0
+    while pending:
+        value = pending.pop()
+        if id(value) in seen or isinstance(value, SHARED_TYPES):
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, dict):
+            pending.extend(value.keys())
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            pending.extend(value)
+        elif isinstance(value, FunctionType):
+            for cell in value.__closure__ or ():
+                try:
+                    pending.append(cell.cell_contents)
+                except ValueError:
+                    pass  # Empty cell
+        elif isinstance(value, CodeType):
+            pending.extend(value.co_consts)
+        elif hasattr(value, "__dict__"):
+            pending.append(vars(value))
+    return total
+
+
+@dataclass(frozen=True)
+class CompiledProgram:
+    '''A program compiled for one engine, runnable any number of times.'''
+    engine: str
+    compiled: Any
+    size: int
+
+    def run(
+        self,
+        variables: dict[str, Any] | None = None,
+        stdin: TextIO | None = None,
+        stdout: TextIO | None = None,
+        functions: dict[str, Callable] | None = None
+    ) -> dict[str, Any]:
+        '''Run against a fresh environment seeded with `variables`.'''
+        executor = ENGINES[self.engine](stdin=stdin, stdout=stdout, functions=functions)
+        executor.variables.update(variables or {})
+        return executor.run(self.compiled)
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CompileCache:
+    '''Thread-safe LRU map from source code to `CompiledProgram`.
+
+    Bounded both by entry count and by the approximate memory of the compiled
+    programs; the least recently used entries are evicted first. Compiling
+    happens outside the lock, so a slow miss never blocks hits. Two threads
+    missing on the same source at once may both compile it; the first result
+    stored wins.
+
+    Usage:
+        cache = CompileCache(engine="closure")
+        program = cache.get(source_code)
+        program.run({"x": 1})
+    '''
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 32 << 20,
+        engine: str = DEFAULT_ENGINE,
+        optimize: bool = True,
+        lexer: str = "regex",
+        parser: str = "recursive"
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.engine = engine
+        self.optimize = optimize
+        self.lexer = lexer
+        self.parser = parser
+        self._entries: OrderedDict[str, CompiledProgram] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, source_code: str) -> CompiledProgram:
+        '''Return the compiled program for `source_code`, compiling on a miss.
+
+        Errors (e.g. `SyntaxError`) propagate and nothing is cached.
+        '''
+        with self._lock:
+            program = self._entries.get(source_code)
+            if program is not None:
+                self._entries.move_to_end(source_code)
+                self.hits += 1
+                return program
+            self.misses += 1
+
+        program = self._compile(source_code)
+        with self._lock:
+            existing = self._entries.get(source_code)
+            if existing is not None:
+                return existing
+            if program.size <= self.max_bytes:
+                self._entries[source_code] = program
+                self._bytes += program.size
+                self._evict()
+        return program
+
+    def run(self, source_code: str, variables: dict[str, Any] | None = None,
+            **kwargs: Any) -> dict[str, Any]:
+        return self.get(source_code).run(variables, **kwargs)
+
+    def statistics(self) -> CacheStatistics:
+        with self._lock:
+            return CacheStatistics(
+                self.hits, self.misses, self.evictions, len(self._entries),
+                self._bytes
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, source_code: str) -> bool:
+        return source_code in self._entries
+
+    def _compile(self, source_code: str) -> CompiledProgram:
+        program = parse_source(
+            source_code, self.lexer, Optimizer() if self.optimize else None,
+            self.parser
+        )
+        compiled = ENGINES[self.engine]().compile(program)
+        size = sys.getsizeof(source_code) + approximate_size(compiled)
+        return CompiledProgram(self.engine, compiled, size)
+
+    def _evict(self) -> None:
+        # Called with the lock held
+        while (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, program = self._entries.popitem(last=False)
+            self._bytes -= program.size
+            self.evictions += 1
@@ -1,5 +1,60 @@
 # interpreter/executor/__init__.py
 
+from .executor import Executor
+from .vm import VirtualMachine
+from .closures import ClosureExecutor
+from .transpiler import PythonExecutor
+from .batch import BatchExecutor
+from .asynchronous import AsyncExecutor
+
+# Execution engines selectable by name, e.g. `ENGINES["closure"]().execute(program)`
+ENGINES = {
+    engine.name: engine
+    for engine in (Executor, VirtualMachine, ClosureExecutor, PythonExecutor)
+}
+
 """
 Executor package for executing parsed AST (Abstract Syntax Tree) statements.
-"""
\ No newline at end of file
+
+Modules:
+    - executor.py: The reference tree-walking `Executor`, the builtin functions
+      and the operator table shared by every engine.
+    - resolver.py: `Resolver`, the pass giving every variable a dense slot index,
+      and the `SymbolTable` mapping names to slots and back.
+    - compiler.py: `Compiler`, which lowers a `Program` into a compact bytecode
+      `CodeObject` (an `array` of opcode/argument words plus constant and name
+      tables).
+    - vm.py: `VirtualMachine`, the stack-based dispatch loop running that bytecode.
+    - closures.py: `ClosureExecutor`, which compiles every AST node once into a
+      pre-bound Python closure and runs the resulting flat list of statements.
+    - transpiler.py: `PythonExecutor`, which translates the AST into a Python
+      `ast.Module`, `compile()`s it and runs the code object natively.
+    - batch.py: `BatchExecutor`, which runs one program over many input records
+      at once, with every variable a NumPy column (requires NumPy). It is not
+      in `ENGINES`, as its variables are arrays rather than single values.
+    - output.py: Output sinks usable as any executor's `stdout`: `StreamSink`,
+      `FileSink`, `ListSink`, `RingBufferSink`, `NullSink` and `BufferedSink`,
+      which batches `print` output and flushes it by size, before `input`, at
+      exit and on the first write after an optional interval.
+    - asynchronous.py: `AsyncExecutor`, whose `execute` is a coroutine and whose
+      `input`/`print` await an async reader and writer, so many interactive
+      sessions share one event loop; and `serve`, a TCP server running a program
+      once per connection.
+    - profiler.py: Per-node and per-line profiles of a tree-walking run, either
+      exact (`ProfilingExecutor`, which times every node) or sampled (`Sampler`,
+      which reads a plain `Executor`'s frames from another thread), reported as
+      a sorted table or as collapsed stacks for flamegraph tools. It is not
+      imported here, nor in `ENGINES`.
+
+Usage:
+    from interpreter.executor import ENGINES, VirtualMachine
+
+    program = Parser(tokenize(source_code)).parse()
+    variables = VirtualMachine().execute(program)
+    variables = ENGINES["closure"]().execute(program)
+
+    Every engine exposes `compile(program)` and `run(compiled)` separately, so a
+    compiled program can be run many times. Every engine in `ENGINES` also
+    accepts an `Arena`; the bytecode and closure compilers read its arrays
+    directly.
+"""
@@ -0,0 +1,163 @@
+# interpreter/executor/asynchronous.py
+
+import asyncio
+import contextlib
+import inspect
+from collections.abc import AsyncIterable, Iterable
+from typing import Any, Awaitable, Callable, Protocol
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Program, Statement,
+    walk
+)
+from .executor import Executor
+
+
+class AsyncReader(Protocol):
+    async def readline(self) -> bytes | str: ...
+
+
+class AsyncWriter(Protocol):
+    def write(self, data: bytes) -> Any: ...
+    async def drain(self) -> None: ...
+
+
+def make_async_builtins(
+    reader: AsyncReader, writer: AsyncWriter, encoding: str = "utf-8"
+) -> dict[str, Callable[..., Awaitable[Any]]]:
+    '''`print` and `input` for a session on an async stream pair.'''
+
+    async def _print(*args: Any) -> None:
+        writer.write((" ".join(map(str, args)) + "\n").encode(encoding))
+        # Waits while the peer is not keeping up with the output
+        await writer.drain()
+
+    async def _input(prompt: Any = "") -> str:
+        if prompt:
+            writer.write(str(prompt).encode(encoding))
+            await writer.drain()
+        line = await reader.readline()
+        if not line:
+            raise EOFError("EOF when reading a line")
+        if isinstance(line, bytes):
+            line = line.decode(encoding)
+        # Socket clients usually end lines with \r\n
+        return line.rstrip("\r\n")
+
+    return {"print": _print, "input": _input}
+
+
+class AsyncExecutor(Executor):
+    '''Tree-walking executor whose `input` and `print` never block the thread.
+
+    `input()` awaits a line from the session's reader and `print()` awaits the
+    writer's `drain()`, so thousands of sessions can share one event loop.
+    Statements without calls run synchronously through `Executor.evaluate`;
+    only statements with calls are walked asynchronously. Host functions may
+    be plain functions or coroutine functions.
+
+    Usage:
+        async def handle(reader, writer):
+            await AsyncExecutor(reader, writer).execute(program)
+
+        await asyncio.start_server(handle, "127.0.0.1", 8000)
+    '''
+
+    name = "async"
+
+    def __init__(
+        self,
+        reader: AsyncReader,
+        writer: AsyncWriter,
+        functions: dict[str, Callable] | None = None,
+        encoding: str = "utf-8"
+    ):
+        super().__init__(functions=functions)
+        self.functions.update(make_async_builtins(reader, writer, encoding))
+        self.functions.update(functions or {})
+        self.reader = reader
+        self.writer = writer
+
+    async def execute(self, program: Program) -> dict[str, Any]:
+        return await self.run(self.compile(program))
+
+    async def execute_stream(
+        self, statements: Iterable[Statement] | AsyncIterable[Statement]
+    ) -> dict[str, Any]:
+        '''Run each statement as soon as it is produced.
+
+        `statements` may be a plain iterable or an async one, e.g. statements
+        parsed from lines read off a socket.
+        '''
+        if isinstance(statements, AsyncIterable):
+            async for statement in statements:
+                await self.run(self.compile(Program([statement])))
+        else:
+            for statement in statements:
+                await self.run(self.compile(Program([statement])))
+        return self.variables
+
+    async def run(self, compiled: Program) -> dict[str, Any]:
+        for statement in compiled.statements:
+            if any(isinstance(node, FunctionCall) for node in walk(statement)):
+                await self.execute_statement_async(statement)
+            else:
+                self.execute_statement(statement)
+        return self.variables
+
+    async def execute_statement_async(self, statement: Statement) -> None:
+        if isinstance(statement, Assignment):
+            self.variables[statement.identifier] = await self.evaluate_async(
+                statement.expression
+            )
+        else:
+            await self.evaluate_async(statement)
+
+    async def evaluate_async(self, expression: Expression) -> Any:
+        match expression:
+            case BinaryExpression():
+                return self.lookup_operator(expression.operator.lexeme)(
+                    await self.evaluate_async(expression.left),
+                    await self.evaluate_async(expression.right)
+                )
+            case FunctionCall():
+                function = self.lookup_function(expression.name.lexeme)
+                arguments = [
+                    await self.evaluate_async(argument)
+                    for argument in expression.arguments
+                ]
+                result = function(*arguments)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            case _:
+                return self.evaluate(expression)
+
+
+async def serve(
+    program: Program,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    functions: dict[str, Callable] | None = None,
+    backlog: int = 4096
+) -> asyncio.Server:
+    '''Start a TCP server running `program` as one session per connection.
+
+    Errors end the session and are reported to the client, like a traceback.
+    `backlog` is far above asyncio's default of 100, so that bursts of
+    connections are queued rather than reset (the kernel may cap it lower).
+    '''
+
+    async def session(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await AsyncExecutor(reader, writer, functions).execute(program)
+        except ConnectionError:
+            pass  # The client went away
+        except Exception as error:
+            writer.write(f"{type(error).__name__}: {error}\n".encode())
+        finally:
+            # Wait for buffered output to be sent and the transport released
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    return await asyncio.start_server(session, host, port, backlog=backlog)
@@ -0,0 +1,205 @@
+# interpreter/executor/batch.py
+
+from collections.abc import Mapping
+from typing import Any, Callable, TextIO
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Literal, Statement,
+    Variable
+)
+from .executor import Executor, literal_value
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Operators with a native NumPy ufunc for int64 and float64 columns. Anything
+# else, including bools, other integer widths and any mix of kinds, runs
+# Python's own operator record by record, so results and errors are exactly
+# those of the scalar engines.
+NUMERIC_UFUNCS = {'+': "add", '-': "subtract", '*': "multiply"}
+NUMERIC_DTYPES = frozenset({"int64", "float64"})
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+class BatchExecutor(Executor):
+    '''Runs one program over many input records at once.
+
+    Every variable is a NumPy array holding one value per record, so each AST
+    node is evaluated once for the whole batch: `+`/`-` on int64 and float64
+    columns are single ufunc calls, `+` on strings is `np.char.add`, and
+    `sum`/`max` reduce their argument columns elementwise. `print` appends one
+    line to each record's output in `outputs`. Host functions and `input`
+    cannot be vectorised and are called once per record; note that this reads
+    all records' input for one call before moving to the next statement.
+
+    Integers are int64 as long as they fit, and Python ints otherwise: an
+    integer ufunc whose result could leave the int64 range runs on Python ints
+    record by record instead, so results never wrap or turn into floats and
+    match the scalar engines. Requires NumPy.
+
+    Usage:
+        executor = BatchExecutor({"x": [1, 2, 3], "y": [10, 20, 30]})
+        variables = executor.execute(Parser(tokenize("z = x + y")).parse())
+        variables["z"]  # -> array([11, 22, 33])
+    '''
+
+    name = "batch"
+
+    def __init__(
+        self,
+        columns: Mapping[str, Any] | None = None,
+        rows: int | None = None,
+        stdin: TextIO | None = None,
+        stdout: TextIO | None = None,
+        functions: dict[str, Callable] | None = None
+    ):
+        if np is None:
+            raise ImportError("BatchExecutor requires NumPy (pip install numpy)")
+        super().__init__(stdin, stdout, functions)
+        self.variables = {
+            name: values if isinstance(values, np.ndarray) else self._array(list(values))
+            for name, values in (columns or {}).items()
+        }
+        lengths = {len(values) for values in self.variables.values()}
+        if rows is not None:
+            lengths.add(rows)
+        if len(lengths) != 1:
+            raise ValueError(
+                "every column needs the same length, and `rows` is required "
+                "without columns"
+            )
+        self.rows = lengths.pop()
+        self.outputs: list[list[str]] = [[] for _ in range(self.rows)]
+        self.vectorised = {
+            "print": self._print, "sum": self._sum, "max": self._max
+        }
+        # Host functions take precedence over the vectorised builtins
+        for name in functions or ():
+            self.vectorised.pop(name, None)
+
+    def output(self, record: int) -> str:
+        '''Everything `print`ed for one record, as the scalar engines write it.'''
+        return "".join(line + "\n" for line in self.outputs[record])
+
+    def execute_statement(self, statement: Statement) -> None:
+        if isinstance(statement, Assignment):
+            self.variables[statement.identifier] = self._column(
+                self.evaluate(statement.expression)
+            )
+        else:
+            self.evaluate(statement)
+
+    def evaluate(self, expression: Expression) -> Any:
+        # Literals stay scalars, so NumPy broadcasts them for free
+        match expression:
+            case Literal():
+                return literal_value(expression.value)
+            case Variable():
+                return self.lookup_variable(expression.name.lexeme)
+            case BinaryExpression():
+                return self._binary(
+                    expression.operator.lexeme,
+                    self.evaluate(expression.left),
+                    self.evaluate(expression.right)
+                )
+            case FunctionCall():
+                name = expression.name.lexeme
+                arguments = [
+                    self.evaluate(argument) for argument in expression.arguments
+                ]
+                if name in self.vectorised:
+                    return self.vectorised[name](*arguments)
+                return self._per_record(self.lookup_function(name), arguments)
+            case _:
+                raise TypeError(f"Cannot evaluate {expression}")
+
+    def _binary(self, lexeme: str, left: Any, right: Any) -> Any:
+        operator = self.lookup_operator(lexeme)
+        if not isinstance(left, np.ndarray) and not isinstance(right, np.ndarray):
+            return operator(left, right)
+        left_dtype, right_dtype = np.asarray(left).dtype, np.asarray(right).dtype
+        if (
+            lexeme in NUMERIC_UFUNCS
+            and left_dtype.name in NUMERIC_DTYPES
+            and right_dtype.name in NUMERIC_DTYPES
+            and not (
+                left_dtype.name == right_dtype.name == "int64"
+                and _may_overflow(lexeme, left, right)
+            )
+        ):
+            return getattr(np, NUMERIC_UFUNCS[lexeme])(left, right)
+        if lexeme == '+' and left_dtype.kind == right_dtype.kind == 'U':
+            return np.char.add(left, right)
+        return self._per_record(operator, [left, right])
+
+    def _sum(self, *columns: Any) -> Any:
+        total = 0
+        for column in columns:
+            total = self._binary('+', total, column)
+        return total
+
+    def _max(self, *columns: Any) -> Any:
+        if not columns:
+            return max(columns)  # Raises the same ValueError as `max()`
+        if not any(isinstance(column, np.ndarray) for column in columns):
+            return max(columns)
+        if all(np.asarray(column).dtype.name in NUMERIC_DTYPES for column in columns):
+            largest = columns[0]
+            for column in columns[1:]:
+                largest = np.maximum(largest, column)
+            return largest
+        return self._per_record(max, list(columns))
+
+    def _print(self, *columns: Any) -> None:
+        if columns:
+            rows = zip(*(self._column(column).tolist() for column in columns))
+        else:
+            rows = [()] * self.rows
+        for output, row in zip(self.outputs, rows):
+            output.append(" ".join(map(str, row)))
+
+    def _per_record(self, function: Callable, arguments: list[Any]) -> Any:
+        if not arguments:
+            return self._array([function() for _ in range(self.rows)])
+        rows = zip(*(self._column(argument).tolist() for argument in arguments))
+        return self._array([function(*row) for row in rows])
+
+    def _column(self, value: Any) -> Any:
+        '''Broadcast a scalar result to one value per record.'''
+        if isinstance(value, np.ndarray) and value.shape == (self.rows,):
+            return value
+        if value is None or isinstance(value, (int, str)):
+            return self._array([value] * self.rows)
+        return np.broadcast_to(value, (self.rows,))
+
+    @staticmethod
+    def _array(values: list[Any]) -> Any:
+        # NumPy would silently turn a mix of ints and strings into strings
+        # or, past the uint64 range, ints into floats
+        kinds = set(map(type, values))
+        if kinds == {str}:
+            return np.array(values)
+        if kinds == {int} and INT64_MIN <= min(values) and max(values) <= INT64_MAX:
+            return np.array(values, dtype=np.int64)
+        return np.array(values, dtype=object)
+
+
+def _may_overflow(lexeme: str, left: Any, right: Any) -> bool:
+    '''Whether integer `left lexeme right` could leave the int64 range.
+
+    Bounds the result by the operands' largest magnitudes, so it may say yes
+    for a batch that would fit, but never no for one that would not.
+    '''
+    left_bound, right_bound = _magnitude(left), _magnitude(right)
+    if lexeme == '*':
+        return left_bound * right_bound > INT64_MAX
+    return left_bound + right_bound > INT64_MAX
+
+
+def _magnitude(value: Any) -> int:
+    values = np.asarray(value)
+    if not values.size:
+        return 0
+    return max(int(values.max()), -int(values.min()))
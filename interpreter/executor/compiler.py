@@ -0,0 +1,232 @@
+# interpreter/executor/compiler.py
+
+from array import array
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any
+from interpreter.parser.arena import (
+    ASSIGNMENT, BINARY, CALL, LITERAL, OPERATORS, PLUS, VARIABLE, Arena
+)
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Literal, Program,
+    Statement, Variable
+)
+from .executor import (
+    BINARY_OPERATORS, LITERAL_ERRORS, add_operands, is_arena_joinable, is_joinable,
+    literal_value
+)
+from .resolver import Resolver, SymbolTable
+
+# Operator lexemes in the order used by the BINARY_OP argument
+OPERATOR_LEXEMES = tuple(BINARY_OPERATORS)
+
+
+class Opcode(IntEnum):
+    LOAD_CONST = 1               # push constants[arg]
+    LOAD_FAST = 2                # push slots[arg]
+    STORE_FAST = 3               # slots[arg] = pop()
+    BINARY_ADD = 4               # push(pop(-2) + pop())
+    BINARY_SUBTRACT = 5          # push(pop(-2) - pop())
+    BINARY_OP = 6                # push(OPERATOR_LEXEMES[arg](pop(-2), pop()))
+    LOAD_FUNCTION = 7            # push functions[function_names[arg]]
+    CALL_FUNCTION = 8            # call with arg positional arguments
+    POP_TOP = 9                  # discard the top of the stack
+    ADD_CHAIN = 10               # push(pop(-2) + pop()), collecting strings
+                                 # until the last one (arg 1) joins them
+    LOAD_LITERAL = 11            # push literal_value(constants[arg]), for
+                                 # literals that raise when decoded
+
+
+@dataclass(frozen=True)
+class CodeObject:
+    '''Compiled program: flat (opcode, argument) word pairs plus side tables.'''
+    code: array
+    constants: tuple[Any, ...]
+    symbols: SymbolTable
+    function_names: tuple[str, ...]
+
+    def disassemble(self) -> list[str]:
+        lines = []
+        for offset in range(0, len(self.code), 2):
+            opcode, argument = Opcode(self.code[offset]), self.code[offset + 1]
+            match opcode:
+                case Opcode.LOAD_CONST | Opcode.LOAD_LITERAL:
+                    detail = f"({self.constants[argument]!r})"
+                case Opcode.LOAD_FAST | Opcode.STORE_FAST:
+                    detail = f"({self.symbols.names[argument]})"
+                case Opcode.LOAD_FUNCTION:
+                    detail = f"({self.function_names[argument]})"
+                case Opcode.BINARY_OP:
+                    detail = f"({OPERATOR_LEXEMES[argument]})"
+                case _:
+                    detail = ""
+            lines.append(f"{offset:>6} {opcode.name:<14} {argument} {detail}".rstrip())
+        return lines
+
+
+class Compiler:
+    '''Lowers a `Program` into a `CodeObject` for the stack-based VM.
+
+    An `Arena` is compiled directly from its arrays, with no dataclass nodes.
+
+    Usage:
+        code = Compiler().compile(program)
+        VirtualMachine().run(code)
+    '''
+
+    def __init__(self):
+        self.code = array('I')
+        self.constants: list[Any] = []
+        self.function_names: list[str] = []
+        self.symbols: SymbolTable | None = None
+        self._constant_indices: dict[tuple[type, Any], int] = {}
+        self._function_indices: dict[str, int] = {}
+
+    def compile(self, program: Program | Arena) -> CodeObject:
+        # Variables are addressed by slot, so resolve them before emitting code
+        self.symbols = Resolver().resolve(program)
+        if isinstance(program, Arena):
+            self._compile_arena(program)
+        else:
+            for statement in program.statements:
+                self._compile_statement(statement)
+        return CodeObject(
+            self.code, tuple(self.constants), self.symbols,
+            tuple(self.function_names)
+        )
+
+    def _compile_statement(self, statement: Statement) -> None:
+        if isinstance(statement, Assignment):
+            self._compile_expression(statement.expression)
+            self._emit(Opcode.STORE_FAST, self.symbols.slots[statement.identifier])
+        else:
+            self._compile_expression(statement)
+            self._emit(Opcode.POP_TOP)
+
+    def _compile_expression(self, expression: Expression) -> None:
+        # Post-order emission with an explicit stack, so arbitrarily deep
+        # expressions compile without recursion. Instructions waiting for their
+        # operands to be emitted sit on the stack as (opcode, argument) pairs.
+        pending: list[Expression | tuple[Opcode, int]] = [expression]
+        while pending:
+            node = pending.pop()
+            match node:
+                case tuple():
+                    self._emit(*node)
+                case Literal():
+                    self._emit(*self._literal_instruction(node.value))
+                case Variable():
+                    self._emit(Opcode.LOAD_FAST, self.symbols.slots[node.name.lexeme])
+                case BinaryExpression() if node.operator.lexeme == '+':
+                    operands = add_operands(node)
+                    self._push_add_chain(pending, operands, is_joinable(operands))
+                case BinaryExpression():
+                    pending.append(self._operator_instruction(node.operator.lexeme))
+                    pending.append(node.right)
+                    pending.append(node.left)
+                case FunctionCall():
+                    self._emit(Opcode.LOAD_FUNCTION, self._function(node.name.lexeme))
+                    pending.append((Opcode.CALL_FUNCTION, len(node.arguments)))
+                    pending.extend(reversed(node.arguments))
+                case _:
+                    raise TypeError(f"Cannot compile {node}")
+
+    def _compile_arena(self, arena: Arena) -> None:
+        kind, left, right, value = arena.kind, arena.left, arena.right, arena.value
+        children, slots = arena.children, self.symbols.slots
+        # Each arena constant and name is decoded once, however often it is used
+        constants: list[tuple[Opcode, int] | None] = [None] * len(arena.constants)
+        names = [token.lexeme for token in arena.names]
+        operators = [self._operator_instruction(lexeme) for lexeme in OPERATORS]
+        emit = self._emit
+        for statement in arena.statements:
+            store = None
+            if kind[statement] == ASSIGNMENT:
+                store = slots[names[value[statement]]]
+                statement = left[statement]
+            # Same explicit-stack post-order as `_compile_expression`
+            pending: list[int | tuple[Opcode, int]] = [statement]
+            while pending:
+                node = pending.pop()
+                if type(node) is tuple:
+                    emit(*node)
+                    continue
+                node_kind = kind[node]
+                if node_kind == LITERAL:
+                    instruction = constants[value[node]]
+                    if instruction is None:
+                        instruction = constants[value[node]] = (
+                            self._literal_instruction(arena.constants[value[node]])
+                        )
+                    emit(*instruction)
+                elif node_kind == VARIABLE:
+                    emit(Opcode.LOAD_FAST, slots[names[value[node]]])
+                elif node_kind == BINARY and arena.operator[node] == PLUS:
+                    operands = arena.add_operands(node)
+                    self._push_add_chain(
+                        pending, operands, is_arena_joinable(arena, operands)
+                    )
+                elif node_kind == BINARY:
+                    pending.append(operators[arena.operator[node]])
+                    pending.append(right[node])
+                    pending.append(left[node])
+                elif node_kind == CALL:
+                    emit(Opcode.LOAD_FUNCTION, self._function(names[value[node]]))
+                    arguments = children[left[node]:right[node]]
+                    pending.append((Opcode.CALL_FUNCTION, len(arguments)))
+                    pending.extend(reversed(arguments))
+                else:
+                    raise TypeError(f"Cannot compile node kind {node_kind}")
+            if store is None:
+                emit(Opcode.POP_TOP)
+            else:
+                emit(Opcode.STORE_FAST, store)
+
+    @staticmethod
+    def _push_add_chain(pending: list, operands: list, joinable: bool) -> None:
+        # A whole `+` chain at once, so long chains are flattened only once.
+        # Joinable ones become `a b ADD_CHAIN 0 c ADD_CHAIN 0 ... z ADD_CHAIN 1`:
+        # operands are still evaluated and added one at a time, but strings
+        # are joined once, by the last instruction.
+        last = (Opcode.ADD_CHAIN, 1) if joinable else (Opcode.BINARY_ADD, 0)
+        step = (Opcode.ADD_CHAIN, 0) if joinable else last
+        pending.append(last)
+        for operand in reversed(operands[2:]):
+            pending.append(operand)
+            pending.append(step)
+        pending.append(operands[1])
+        pending.append(operands[0])
+
+    def _literal_instruction(self, value: int | str) -> tuple[Opcode, int]:
+        try:
+            return Opcode.LOAD_CONST, self._constant(literal_value(value))
+        except LITERAL_ERRORS:
+            # Decoded, and so raised, at run time, when the tree-walker would
+            return Opcode.LOAD_LITERAL, self._constant(value)
+
+    def _operator_instruction(self, lexeme: str) -> tuple[Opcode, int]:
+        if lexeme == '+':
+            return Opcode.BINARY_ADD, 0
+        if lexeme == '-':
+            return Opcode.BINARY_SUBTRACT, 0
+        if lexeme in BINARY_OPERATORS:
+            return Opcode.BINARY_OP, OPERATOR_LEXEMES.index(lexeme)
+        raise SyntaxError(f"Unsupported operator {lexeme!r}")
+
+    def _emit(self, opcode: Opcode, argument: int = 0) -> None:
+        self.code.append(opcode)
+        self.code.append(argument)
+
+    def _constant(self, value: Any) -> int:
+        # Key on the type too so that e.g. 1 and True never share a slot
+        key = (type(value), value)
+        if key not in self._constant_indices:
+            self._constant_indices[key] = len(self.constants)
+            self.constants.append(value)
+        return self._constant_indices[key]
+
+    def _function(self, name: str) -> int:
+        if name not in self._function_indices:
+            self._function_indices[name] = len(self.function_names)
+            self.function_names.append(name)
+        return self._function_indices[name]
@@ -1 +1,275 @@
-# intepreter/executor/executor.py
\ No newline at end of file
+# interpreter/executor/executor.py
+
+import ast as python_ast
+import operator
+import sys
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from typing import Any, Callable, TextIO
+from interpreter.parser.arena import LITERAL, Arena
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Literal, Program,
+    Statement, Variable
+)
+
+# Python implementations of every operator in parser.OPERATOR_PRECEDENCE
+BINARY_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+    '^': operator.pow,
+    '&&': lambda left, right: left and right,
+    '||': lambda left, right: left or right,
+}
+
+
+def literal_value(value: int | str) -> int | str:
+    '''Convert a `Literal.value` into its runtime value.
+
+    String literals keep their quotes in the AST (e.g. '"hello"'), so they are
+    decoded here using Python's own string literal rules.
+    '''
+    if isinstance(value, str):
+        return python_ast.literal_eval(value)
+    return value
+
+
+# What `literal_value` raises for a string literal Python cannot decode, e.g.
+# one spanning a raw newline or with a malformed escape
+LITERAL_ERRORS = (SyntaxError, ValueError)
+
+
+@lru_cache(maxsize=4096)
+def is_valid_literal(value: int | str) -> bool:
+    '''Whether `literal_value(value)` succeeds.
+
+    Compiled engines decode literals ahead of time; one that fails is decoded
+    again each time it is evaluated instead, so the error is raised when its
+    statement runs, exactly as in the tree-walker.
+    '''
+    try:
+        literal_value(value)
+    except LITERAL_ERRORS:
+        return False
+    return True
+
+# `+` chains with at least this many operands are evaluated by `add_chain`
+ADD_CHAIN_MIN = 3
+
+
+def add_operands(expression: Expression) -> list[Expression]:
+    '''Operands of the `+` chain rooted at `expression`, in evaluation order.
+
+    `a + b - c + d` is `((a + b) - c) + d`, so its operands are `a + b - c`
+    and `d`: only the `+` nodes along the left spine belong to the chain.
+    '''
+    operands = []
+    while (
+        isinstance(expression, BinaryExpression)
+        and expression.operator.lexeme == '+'
+    ):
+        operands.append(expression.right)
+        expression = expression.left
+    operands.append(expression)
+    operands.reverse()
+    return operands
+
+
+def operator_chain(
+    expression: BinaryExpression
+) -> tuple[Expression, list[tuple[str, Expression]]]:
+    '''The left spine of a chain of binary operators, in evaluation order.
+
+    `a - b + c` is `(a - b) + c`, so it comes back as `a` and
+    `[('-', b), ('+', c)]`: a chain of any length and any mix of operators can
+    then be evaluated in one loop instead of one recursion per operator.
+    '''
+    steps = []
+    while isinstance(expression, BinaryExpression):
+        steps.append((expression.operator.lexeme, expression.right))
+        expression = expression.left
+    steps.reverse()
+    return expression, steps
+
+
+def is_joinable(operands: list[Expression]) -> bool:
+    '''Whether compiled engines should evaluate a `+` chain with `add_chain`.
+
+    Short chains, and chains with an integer literal (which can never be all
+    strings), are left to plain `+`.
+    '''
+    return len(operands) >= ADD_CHAIN_MIN and not any(
+        isinstance(operand, Literal) and isinstance(operand.value, int)
+        for operand in operands
+    )
+
+
+def is_arena_joinable(arena: Arena, operands: list[int]) -> bool:
+    '''`is_joinable` for the operands of an `Arena` chain.'''
+    kind, value, constants = arena.kind, arena.value, arena.constants
+    return len(operands) >= ADD_CHAIN_MIN and not any(
+        kind[operand] == LITERAL and isinstance(constants[value[operand]], int)
+        for operand in operands
+    )
+
+
+def add_chain(values: Iterator[Any]) -> Any:
+    '''Left-to-right sum of `values`, joining runs of strings in one pass.
+
+    Adding strings pairwise copies the growing prefix at every step, which is
+    quadratic in the total length; while every value is a `str`, they are
+    collected and joined once instead. At the first value of any other type
+    the strings so far are joined and the rest is added pairwise, so numbers,
+    mixed types and their errors behave exactly as with `+`. `values` is
+    consumed lazily, so no operand is evaluated after one that fails.
+    '''
+    value = next(values)
+    if type(value) is str:
+        parts = [value]
+        for value in values:
+            if type(value) is not str:
+                value = "".join(parts) + value
+                break
+            parts.append(value)
+        else:
+            return "".join(parts)
+    for operand in values:
+        value = value + operand
+    return value
+
+
+def make_builtins(stdin: TextIO, stdout: TextIO) -> dict[str, Callable]:
+    '''Build the functions behind the `KEYWORDS` in token_specifications.
+
+    `stdout` may be any object with `write` and `flush`, such as the sinks in
+    `output.py`. `print` never flushes; `input` always does before blocking.
+    '''
+    write = stdout.write
+
+    def _print(*args: Any) -> None:
+        write(" ".join(map(str, args)) + "\n")
+
+    def _input(prompt: Any = "") -> str:
+        if prompt:
+            write(str(prompt))
+        stdout.flush()
+        line = stdin.readline()
+        if not line:
+            raise EOFError("EOF when reading a line")
+        return line.rstrip("\n")
+
+    def _sum(*args: Any) -> Any:
+        return sum(args)
+
+    def _max(*args: Any) -> Any:
+        return max(args)
+
+    return {"print": _print, "input": _input, "sum": _sum, "max": _max}
+
+
+class Executor:
+    '''Reference tree-walking executor.
+
+    Evaluates the AST produced by `Parser.parse()` node by node. Every other
+    execution engine subclasses this one and overrides `compile`/`run`, so they
+    share the same builtins, host functions and variable environment.
+
+    Usage:
+        executor = Executor()
+        variables = executor.execute(Parser(tokenize(source_code)).parse())
+    '''
+
+    name = "tree"
+
+    def __init__(
+        self,
+        stdin: TextIO | None = None,
+        stdout: TextIO | None = None,
+        functions: dict[str, Callable] | None = None
+    ):
+        self.stdin = stdin if stdin is not None else sys.stdin
+        self.stdout = stdout if stdout is not None else sys.stdout
+        self.variables: dict[str, Any] = {}
+        self.functions = make_builtins(self.stdin, self.stdout)
+        self.functions.update(functions or {})
+
+    def execute(self, program: Program) -> dict[str, Any]:
+        return self.run(self.compile(program))
+
+    def execute_stream(self, statements: Iterable[Statement]) -> dict[str, Any]:
+        '''Run each statement as soon as it is produced.'''
+        for statement in statements:
+            self.run(self.compile(Program([statement])))
+        return self.variables
+
+    def compile(self, program: Program | Arena) -> Program:
+        # The tree-walker runs the AST as is, so an arena is expanded first
+        if isinstance(program, Arena):
+            return program.to_program()
+        return program
+
+    def run(self, compiled: Program) -> dict[str, Any]:
+        for statement in compiled.statements:
+            self.execute_statement(statement)
+        return self.variables
+
+    def execute_statement(self, statement: Statement) -> None:
+        if isinstance(statement, Assignment):
+            self.variables[statement.identifier] = self.evaluate(
+                statement.expression
+            )
+        else:
+            self.evaluate(statement)
+
+    def evaluate(self, expression: Expression) -> Any:
+        match expression:
+            case Literal():
+                return literal_value(expression.value)
+            case Variable():
+                return self.lookup_variable(expression.name.lexeme)
+            case BinaryExpression():
+                if type(expression.left) is not BinaryExpression:
+                    return self.lookup_operator(expression.operator.lexeme)(
+                        self.evaluate(expression.left),
+                        self.evaluate(expression.right)
+                    )
+                # Chains of 3 or more operands are evaluated in a loop, not
+                # one recursion per operator; `+` chains join their strings
+                first, steps = operator_chain(expression)
+                if all(lexeme == '+' for lexeme, _ in steps):
+                    return add_chain(map(self.evaluate, [
+                        first, *(right for _, right in steps)
+                    ]))
+                operators = [self.lookup_operator(lexeme) for lexeme, _ in steps]
+                value = self.evaluate(first)
+                for function, (_, right) in zip(operators, steps):
+                    value = function(value, self.evaluate(right))
+                return value
+            case FunctionCall():
+                function = self.lookup_function(expression.name.lexeme)
+                return function(
+                    *[self.evaluate(argument) for argument in expression.arguments]
+                )
+            case _:
+                raise TypeError(f"Cannot evaluate {expression}")
+
+    def lookup_variable(self, name: str) -> Any:
+        try:
+            return self.variables[name]
+        except KeyError:
+            raise NameError(f"name '{name}' is not defined") from None
+
+    def lookup_function(self, name: str) -> Callable:
+        try:
+            return self.functions[name]
+        except KeyError:
+            raise NameError(f"function '{name}' is not defined") from None
+
+    @staticmethod
+    def lookup_operator(lexeme: str) -> Callable[[Any, Any], Any]:
+        try:
+            return BINARY_OPERATORS[lexeme]
+        except KeyError:
+            raise SyntaxError(f"Unsupported operator {lexeme!r}") from None
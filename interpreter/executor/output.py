@@ -0,0 +1,180 @@
+# interpreter/executor/output.py
+
+import atexit
+import sys
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, TextIO
+
+
+class OutputSink(ABC):
+    '''Destination for the output of `print`.
+
+    A sink is passed to an executor as its `stdout`: executors only ever call
+    `write` and `flush`, so file objects and sinks are interchangeable. `input`
+    flushes `stdout` before it blocks, so prompts are always visible. Every
+    sink implements `write`; `flush` and `close` do nothing by default.
+
+    Usage:
+        with BufferedSink(FileSink("out.txt")) as sink:
+            VirtualMachine(stdout=sink).execute(program)
+    '''
+
+    @abstractmethod
+    def write(self, text: str) -> int:
+        ...
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class StreamSink(OutputSink):
+    '''Writes straight through to a text stream (by default `sys.stdout`).'''
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream if stream is not None else sys.stdout
+
+    def write(self, text: str) -> int:
+        return self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class FileSink(StreamSink):
+    '''Writes to a file it opens, and closes it on `close`.'''
+
+    def __init__(self, path: str, mode: str = "w", encoding: str = "utf-8"):
+        super().__init__(open(path, mode, encoding=encoding))
+
+    def close(self) -> None:
+        self.stream.close()
+
+
+class ListSink(OutputSink):
+    '''Keeps every write in memory.'''
+
+    def __init__(self):
+        self.writes: list[str] = []
+
+    def write(self, text: str) -> int:
+        self.writes.append(text)
+        return len(text)
+
+    def getvalue(self) -> str:
+        return "".join(self.writes)
+
+    @property
+    def lines(self) -> list[str]:
+        return self.getvalue().splitlines()
+
+
+class RingBufferSink(OutputSink):
+    '''Keeps only the last `capacity` lines, for long-running programs.'''
+
+    def __init__(self, capacity: int = 1000):
+        self.complete: deque[str] = deque(maxlen=capacity)
+        self.partial = ""
+
+    def write(self, text: str) -> int:
+        *complete, self.partial = (self.partial + text).split("\n")
+        self.complete.extend(complete)
+        return len(text)
+
+    def getvalue(self) -> str:
+        return "".join(line + "\n" for line in self.complete) + self.partial
+
+    @property
+    def lines(self) -> list[str]:
+        return list(self.complete) + ([self.partial] if self.partial else [])
+
+
+class NullSink(OutputSink):
+    '''Discards all output, e.g. to benchmark execution alone.'''
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+class BufferedSink(OutputSink):
+    '''Batches writes and passes them on to `target` in large blocks.
+
+    The buffer is flushed when it holds `buffer_size` characters, before every
+    `input` (which calls `flush`), on `close` and at interpreter exit. With a
+    `flush_interval`, buffered output is also flushed at most that many
+    seconds after it was written: a write flushes if the interval has passed
+    since the last flush, and otherwise the first buffered write arms a daemon
+    timer, so output before a long computation without `print` still appears.
+    Writes and flushes are serialised by a lock, as the timer flushes from its
+    own thread.
+
+    Usage:
+        sink = BufferedSink(sys.stdout, buffer_size=1 << 20, flush_interval=0.5)
+    '''
+
+    def __init__(
+        self,
+        target: TextIO | OutputSink | None = None,
+        buffer_size: int = 1 << 16,
+        flush_interval: float | None = None,
+        flush_at_exit: bool = True
+    ):
+        self.target = target if target is not None else sys.stdout
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._chunks: list[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+        self._timer: threading.Timer | None = None
+        self._lock = threading.RLock()
+        self._at_exit = None
+        if flush_at_exit:
+            # Only a weak reference, so registering does not keep sinks alive
+            reference = weakref.ref(self)
+            self._at_exit = lambda: (sink := reference()) and sink.flush()
+            atexit.register(self._at_exit)
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._chunks.append(text)
+            self._size += len(text)
+            if self._size >= self.buffer_size or (
+                self.flush_interval is not None
+                and time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+            elif self.flush_interval is not None and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._chunks:
+                self.target.write("".join(self._chunks))
+                self._chunks.clear()
+                self._size = 0
+            self.target.flush()
+            self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+        if self._at_exit is not None:
+            atexit.unregister(self._at_exit)
+            self._at_exit = None
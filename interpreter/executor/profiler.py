@@ -0,0 +1,350 @@
+# interpreter/executor/profiler.py
+
+'''
+Per-node and per-line execution profiles, with flamegraph-compatible output.
+
+Two modes, both on the tree-walking `Executor` so that every AST node is still
+a call frame:
+
+    - exact: `ProfilingExecutor` counts every execution of every node and times
+      it with `perf_counter_ns`, splitting inclusive time from self time.
+    - sampling: the program runs on a plain `Executor`, with no instrumentation
+      at all; a `Sampler` thread periodically reads the executing thread's
+      Python frames and attributes one sample to every node on its stack.
+
+The engines themselves are not instrumented in any way, so running without a
+profile costs nothing.
+
+Usage:
+    from interpreter.executor.profiler import parse_with_lines, profile_program
+
+    program, lines = parse_with_lines(source_code)
+    profile = profile_program(program, "sampling", lines)
+    print(profile.report())
+    with open("out.folded", "w") as output:
+        output.write(profile.collapsed())  # flamegraph.pl out.folded > out.svg
+'''
+
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, Callable, TextIO
+from interpreter.lexer.token_buffer import TokenBuffer
+from interpreter.parallel import gc_paused
+from interpreter.parser import PARSERS
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Literal, Program,
+    Statement, Variable
+)
+from .executor import Executor
+
+MODES = ("exact", "sampling")
+
+# Literals are cut to this many characters in frame names
+MAX_LITERAL_LENGTH = 24
+
+
+def parse_with_lines(
+    source_code: str, parser: str = "recursive"
+) -> tuple[Program, list[int]]:
+    '''Parse `source_code` and return the source line of every statement.'''
+    tokens = TokenBuffer.from_source(source_code)
+    statement_parser = PARSERS[parser](tokens)
+    program = statement_parser.parse()
+    return program, [
+        tokens.line_column(start)[0] for start in statement_parser.statement_starts
+    ]
+
+
+def node_label(node: Statement) -> str:
+    '''Short frame name of a node, safe to use in collapsed stacks.'''
+    match node:
+        case Assignment():
+            label = f"{node.identifier} ="
+        case BinaryExpression():
+            label = node.operator.lexeme
+        case FunctionCall():
+            label = f"{node.name.lexeme}()"
+        case Variable():
+            label = node.name.lexeme
+        case Literal():
+            label = str(node.value)
+            if len(label) > MAX_LITERAL_LENGTH:
+                label = label[:MAX_LITERAL_LENGTH - 3] + "..."
+        case _:
+            label = type(node).__name__
+    # ';' separates frames and a line break ends a stack in the collapsed format
+    return label.replace(";", ":").replace("\n", " ")
+
+
+@dataclass
+class NodeStats:
+    label: str
+    line: int
+    count: int = 0
+    inclusive: int = 0
+    exclusive: int = 0
+
+
+@dataclass
+class Profile:
+    '''Results of a profiled run.
+
+    Times are in nanoseconds in exact mode and in samples in sampling mode,
+    where `count` is the number of samples a node was on the stack rather than
+    the number of times it ran.
+    '''
+
+    mode: str
+    nodes: dict[int, NodeStats] = field(default_factory=dict)
+    lines: dict[int, NodeStats] = field(default_factory=dict)
+    stacks: Counter[tuple[str, ...]] = field(default_factory=Counter)
+    # Keeps profiled nodes alive, so that their ids are never reused
+    _nodes: list[Statement] = field(default_factory=list, repr=False)
+
+    @property
+    def unit(self) -> str:
+        return "ns" if self.mode == "exact" else "samples"
+
+    def node(self, node: Statement, line: int) -> NodeStats:
+        stats = self.nodes.get(id(node))
+        if stats is None:
+            stats = self.nodes[id(node)] = NodeStats(node_label(node), line)
+            self._nodes.append(node)
+        return stats
+
+    def line(self, line: int) -> NodeStats:
+        stats = self.lines.get(line)
+        if stats is None:
+            stats = self.lines[line] = NodeStats(f"line {line}", line)
+        return stats
+
+    @property
+    def total(self) -> int:
+        return sum(self.stacks.values())
+
+    def report(self, limit: int = 20) -> str:
+        '''Hottest nodes by self time, then lines by inclusive time.'''
+        total = self.total or 1
+
+        def format_value(value: int) -> str:
+            return f"{value / 1e6:.3f}ms" if self.mode == "exact" else str(value)
+
+        def rows(stats: list[NodeStats], key: str) -> list[str]:
+            stats = sorted(stats, key=lambda s: getattr(s, key), reverse=True)
+            return [
+                f"{s.count:>10} {format_value(s.inclusive):>12} "
+                f"{format_value(s.exclusive):>12} "
+                f"{getattr(s, key) / total:>6.1%}  {s.line:>5}  {s.label}"
+                for s in stats[:limit]
+            ]
+
+        count = "calls" if self.mode == "exact" else "samples"
+        header = f"{count:>10} {'total':>12} {'self':>12} {'%':>6}  {'line':>5}  node"
+        summary = format_value(self.total)
+        if self.mode == "sampling":
+            summary += " samples"
+        return "\n".join([
+            f"{self.mode} profile: {summary}",
+            "", "by node (self):", header,
+            *rows(list(self.nodes.values()), "exclusive"),
+            "", "by line (total):", header,
+            *rows(list(self.lines.values()), "inclusive"),
+        ])
+
+    def collapsed(self) -> str:
+        '''One "frame;frame;frame weight" line per distinct stack.
+
+        This is the input format of flamegraph.pl, inferno and speedscope.
+        '''
+        return "".join(
+            f"{';'.join(stack)} {weight}\n"
+            for stack, weight in sorted(self.stacks.items())
+            if weight
+        )
+
+
+class ProfilingExecutor(Executor):
+    '''Tree-walking executor timing every statement and node it evaluates.
+
+    `lines` holds the source line of each statement, in order (see
+    `parse_with_lines`); without it statements are numbered from 1.
+
+    Usage:
+        executor = ProfilingExecutor(lines=lines)
+        executor.execute(program)
+        print(executor.profile.report())
+    '''
+
+    name = "profile"
+
+    def __init__(
+        self,
+        stdin: TextIO | None = None,
+        stdout: TextIO | None = None,
+        functions: dict[str, Callable] | None = None,
+        lines: Sequence[int] | None = None,
+        clock: Callable[[], int] = time.perf_counter_ns
+    ):
+        super().__init__(stdin, stdout, functions)
+        self.profile = Profile("exact")
+        self.lines = lines or ()
+        self.clock = clock
+        self._statements = 0
+        self._line = 0
+        self._stack: list[str] = []
+        self._children = 0
+
+    def execute_statement(self, statement: Statement) -> None:
+        # Statements keep their index across `run` calls, e.g. when streaming
+        index, self._statements = self._statements, self._statements + 1
+        self._line = self.lines[index] if index < len(self.lines) else index + 1
+        frames = [f"line {self._line}"]
+        if isinstance(statement, Assignment):
+            frames.append(node_label(statement))
+        self._stack.extend(frames)
+        self._children = 0
+        start = self.clock()
+        try:
+            super().execute_statement(statement)
+        finally:
+            elapsed = self.clock() - start
+            self_time = elapsed - self._children
+            line = self.profile.line(self._line)
+            line.count += 1
+            line.inclusive += elapsed
+            line.exclusive += self_time
+            if isinstance(statement, Assignment):
+                stats = self.profile.node(statement, self._line)
+                stats.count += 1
+                stats.inclusive += elapsed
+                stats.exclusive += self_time
+            self.profile.stacks[tuple(self._stack)] += self_time
+            del self._stack[-len(frames):]
+
+    def evaluate(self, expression: Expression) -> Any:
+        stack = self._stack
+        stack.append(node_label(expression))
+        outer_children, self._children = self._children, 0
+        start = self.clock()
+        try:
+            return super().evaluate(expression)
+        finally:
+            elapsed = self.clock() - start
+            self_time = elapsed - self._children
+            stats = self.profile.node(expression, self._line)
+            stats.count += 1
+            stats.inclusive += elapsed
+            stats.exclusive += self_time
+            self.profile.stacks[tuple(stack)] += self_time
+            stack.pop()
+            self._children = outer_children + elapsed
+
+
+_EVALUATE = Executor.evaluate.__code__
+_EXECUTE_STATEMENT = Executor.execute_statement.__code__
+
+
+class Sampler:
+    '''Samples the stack of a thread running a plain `Executor`.
+
+    `lines` maps `id(statement)` to its source line. The sampled thread runs
+    unmodified code; only this thread does any work. Samples can only be taken
+    when the interpreter switches threads, so the switch interval is lowered
+    to `interval` while sampling.
+
+    Usage:
+        with Sampler(profile, lines):
+            Executor().execute(program)
+    '''
+
+    def __init__(
+        self,
+        profile: Profile,
+        lines: dict[int, int] | None = None,
+        interval: float = 0.001,
+        thread_id: int | None = None
+    ):
+        self.profile = profile
+        self.lines = lines or {}
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._switch_interval = sys.getswitchinterval()
+
+    def __enter__(self) -> "Sampler":
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stopped.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _sample_loop(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        nodes: list[Statement] = []
+        line = 0
+        while frame is not None:
+            if frame.f_code is _EVALUATE:
+                nodes.append(frame.f_locals["expression"])
+            elif frame.f_code is _EXECUTE_STATEMENT:
+                statement = frame.f_locals["statement"]
+                line = self.lines.get(id(statement), 0)
+                if isinstance(statement, Assignment):
+                    nodes.append(statement)
+                break
+            frame = frame.f_back
+        if not line and not nodes:
+            return  # Not executing a statement
+        nodes.reverse()
+        profile = self.profile
+        for node in nodes:
+            stats = profile.node(node, line)
+            stats.count += 1
+            stats.inclusive += 1
+        if nodes:
+            profile.node(nodes[-1], line).exclusive += 1
+        line_stats = profile.line(line)
+        line_stats.count += 1
+        line_stats.inclusive += 1
+        line_stats.exclusive += not nodes
+        profile.stacks[(f"line {line}", *map(node_label, nodes))] += 1
+
+
+def profile_program(
+    program: Program,
+    mode: str = "exact",
+    lines: Sequence[int] | None = None,
+    interval: float = 0.001,
+    stdin: TextIO | None = None,
+    stdout: TextIO | None = None,
+    functions: dict[str, Callable] | None = None
+) -> Profile:
+    '''Run `program` once under the profiler and return its profile.'''
+    if mode == "exact":
+        executor = ProfilingExecutor(stdin, stdout, functions, lines)
+        # Otherwise collections triggered by the profile's own allocations are
+        # charged to whichever node happens to be running
+        with gc_paused():
+            executor.execute(program)
+        return executor.profile
+    if mode != "sampling":
+        raise ValueError(f"Unknown profiling mode {mode!r}, expected one of {MODES}")
+    lines = lines or range(1, len(program.statements) + 1)
+    profile = Profile("sampling")
+    statement_lines = {
+        id(statement): line for statement, line in zip(program.statements, lines)
+    }
+    with Sampler(profile, statement_lines, interval):
+        Executor(stdin, stdout, functions).execute(program)
+    return profile
@@ -0,0 +1,82 @@
+# interpreter/executor/resolver.py
+
+from dataclasses import dataclass, field
+from typing import Any
+from interpreter.parser.arena import ASSIGNMENT, VARIABLE, Arena
+from interpreter.parser.ast import Assignment, Program, Statement, Variable, walk
+
+
+class _Unbound:
+    '''Marker stored in a slot whose variable has not been assigned yet.'''
+
+    def __repr__(self) -> str:
+        return "<unbound>"
+
+
+UNBOUND = _Unbound()
+
+
+@dataclass(frozen=True)
+class SymbolTable:
+    '''Dense name <-> slot mapping for every variable a program touches.'''
+    names: tuple[str, ...]
+    slots: dict[str, int] = field(compare=False)
+
+    def allocate(self, variables: dict[str, Any]) -> list[Any]:
+        '''Build the slot list, pre-filled from an existing environment.'''
+        return [variables.get(name, UNBOUND) for name in self.names]
+
+    def store(self, slots: list[Any], variables: dict[str, Any]) -> None:
+        '''Write every bound slot back into a name-keyed environment.'''
+        for name, value in zip(self.names, slots):
+            if value is not UNBOUND:
+                variables[name] = value
+
+    def undefined(self, slot: int) -> NameError:
+        return NameError(f"name '{self.names[slot]}' is not defined")
+
+
+class Resolver:
+    '''Assigns each distinct identifier in a program a slot, in order of first use.
+
+    Usage:
+        symbols = Resolver().resolve(program)
+        symbols.slots["x"]  # -> 0
+    '''
+
+    def __init__(self):
+        self.names: list[str] = []
+        self.slots: dict[str, int] = {}
+
+    def resolve(self, program: Program | Arena) -> SymbolTable:
+        if isinstance(program, Arena):
+            for statement in program.statements:
+                self._resolve_arena_statement(program, statement)
+        else:
+            for statement in program.statements:
+                self._resolve_statement(statement)
+        return SymbolTable(tuple(self.names), dict(self.slots))
+
+    def _resolve_statement(self, statement: Statement) -> None:
+        if isinstance(statement, Assignment):
+            self._declare(statement.identifier)
+            statement = statement.expression
+        # `walk` is iterative and visits variables in evaluation order
+        for node in walk(statement):
+            if isinstance(node, Variable):
+                self._declare(node.name.lexeme)
+
+    def _resolve_arena_statement(self, arena: Arena, statement: int) -> None:
+        kind = arena.kind
+        if kind[statement] == ASSIGNMENT:
+            self._declare(arena.name(statement))
+            statement = arena.left[statement]
+        for node in arena.walk(statement):
+            if kind[node] == VARIABLE:
+                self._declare(arena.name(node))
+
+    def _declare(self, name: str) -> int:
+        if name not in self.slots:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+        return self.slots[name]
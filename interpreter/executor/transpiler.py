@@ -0,0 +1,209 @@
+# interpreter/executor/transpiler.py
+
+import ast as python_ast
+from dataclasses import dataclass
+from types import CodeType
+from typing import Any
+from interpreter.parser.arena import Arena
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Literal, Program,
+    Statement, Variable
+)
+from .executor import BINARY_OPERATORS, LITERAL_ERRORS, Executor, literal_value
+
+# Functions, variables and the interpreter's own helpers share one CPython
+# namespace, so their names get distinct prefixes the lexer never accepts in an
+# identifier. This also keeps names such as `True` or `__builtins__` ordinary
+# variables.
+FUNCTION_PREFIX = "@"
+VARIABLE_PREFIX = "$"
+HELPER_PREFIX = "%"
+
+PYTHON_OPERATORS: dict[str, python_ast.operator] = {
+    '+': python_ast.Add(),
+    '-': python_ast.Sub(),
+    '*': python_ast.Mult(),
+    '/': python_ast.Div(),
+    '%': python_ast.Mod(),
+    '^': python_ast.Pow(),
+}
+
+# Every other operator is a call to its `BINARY_OPERATORS` function, e.g. `&&`
+# and `||`, which evaluate both operands rather than short-circuiting
+HELPERS: dict[str, Any] = {
+    HELPER_PREFIX + lexeme: function
+    for lexeme, function in BINARY_OPERATORS.items()
+    if lexeme not in PYTHON_OPERATORS
+}
+# A string literal that fails to decode is decoded, and so raises, at run time
+LITERAL_HELPER = HELPER_PREFIX + "literal"
+HELPERS[LITERAL_HELPER] = literal_value
+
+# Operators nested in one Python expression at most. A longer chain is cut into
+# segments, each stored in a temporary the next one starts from, so neither
+# this module nor CPython's compiler recurses once per operator.
+MAX_NESTING = 100
+TEMPORARY_PREFIX = HELPER_PREFIX + "chain"
+
+
+@dataclass(frozen=True)
+class PythonProgram:
+    '''Compiled program: a real CPython code object plus the functions it calls.'''
+    code: CodeType
+    functions: frozenset[str]
+
+
+class Transpiler:
+    '''Translates a `Program` into a Python `ast.Module`.'''
+
+    def __init__(self):
+        self._temporaries = 0
+
+    def transpile(self, program: Program) -> python_ast.Module:
+        module = python_ast.Module(
+            body=[self._transpile_statement(s) for s in program.statements],
+            type_ignores=[]
+        )
+        return python_ast.fix_missing_locations(module)
+
+    def compile(self, program: Program, filename: str = "<program>") -> PythonProgram:
+        module = self.transpile(program)
+        functions = frozenset(
+            node.id.removeprefix(FUNCTION_PREFIX)
+            for node in python_ast.walk(module)
+            if isinstance(node, python_ast.Name)
+            and node.id.startswith(FUNCTION_PREFIX)
+        )
+        return PythonProgram(compile(module, filename, "exec"), functions)
+
+    def _transpile_statement(self, statement: Statement) -> python_ast.stmt:
+        if isinstance(statement, Assignment):
+            return python_ast.Assign(
+                targets=[python_ast.Name(
+                    VARIABLE_PREFIX + statement.identifier, python_ast.Store()
+                )],
+                value=self._transpile_expression(statement.expression)
+            )
+        return python_ast.Expr(self._transpile_expression(statement))
+
+    def _transpile_expression(self, expression: Expression) -> python_ast.expr:
+        match expression:
+            case Literal():
+                try:
+                    return python_ast.Constant(literal_value(expression.value))
+                except LITERAL_ERRORS:
+                    return python_ast.Call(
+                        func=python_ast.Name(LITERAL_HELPER, python_ast.Load()),
+                        args=[python_ast.Constant(expression.value)], keywords=[]
+                    )
+            case Variable():
+                return python_ast.Name(
+                    VARIABLE_PREFIX + expression.name.lexeme, python_ast.Load()
+                )
+            case BinaryExpression():
+                return self._transpile_binary_expression(expression)
+            case FunctionCall():
+                return python_ast.Call(
+                    func=python_ast.Name(
+                        FUNCTION_PREFIX + expression.name.lexeme, python_ast.Load()
+                    ),
+                    args=[self._transpile_expression(a) for a in expression.arguments],
+                    keywords=[]
+                )
+            case _:
+                raise TypeError(f"Cannot transpile {expression}")
+
+    def _transpile_binary_expression(
+        self, expression: BinaryExpression
+    ) -> python_ast.expr:
+        # Operators and right operands along the left spine, innermost first:
+        # `a - b + c` is `(a - b) + c`
+        steps = []
+        while isinstance(expression, BinaryExpression):
+            steps.append((expression.operator.lexeme, expression.right))
+            expression = expression.left
+        steps.reverse()
+
+        result = self._transpile_expression(expression)
+        segments, temporary = [], None
+        for count, (lexeme, right) in enumerate(steps, 1):
+            result = self._operator(lexeme, result, self._transpile_expression(right))
+            if count % MAX_NESTING == 0 and count < len(steps):
+                if temporary is None:
+                    temporary = f"{TEMPORARY_PREFIX}{self._temporaries}"
+                    self._temporaries += 1
+                segments.append(python_ast.NamedExpr(
+                    python_ast.Name(temporary, python_ast.Store()), result
+                ))
+                result = python_ast.Name(temporary, python_ast.Load())
+        if not segments:
+            return result
+        # `(t := segment, t := t + ..., last)[-1]`, evaluated left to right
+        return python_ast.Subscript(
+            python_ast.Tuple([*segments, result], python_ast.Load()),
+            python_ast.Constant(-1), python_ast.Load()
+        )
+
+    @staticmethod
+    def _operator(
+        lexeme: str, left: python_ast.expr, right: python_ast.expr
+    ) -> python_ast.expr:
+        if lexeme in PYTHON_OPERATORS:
+            return python_ast.BinOp(left, PYTHON_OPERATORS[lexeme], right)
+        if HELPER_PREFIX + lexeme in HELPERS:
+            return python_ast.Call(
+                func=python_ast.Name(HELPER_PREFIX + lexeme, python_ast.Load()),
+                args=[left, right], keywords=[]
+            )
+        raise SyntaxError(f"Unsupported operator {lexeme!r}")
+
+
+class PythonExecutor(Executor):
+    '''Runs programs transpiled to CPython bytecode.
+
+    The code object is executed against a controlled globals dict holding only
+    the program variables and the interpreter's own functions (no Python
+    builtins), so the native CPython eval loop does all the work.
+
+    Usage:
+        variables = PythonExecutor().execute(program)
+    '''
+
+    name = "python"
+
+    def compile(self, program: Program | Arena) -> PythonProgram:
+        # Python's own compiler needs a Python AST, built from ours
+        if isinstance(program, Arena):
+            program = program.to_program()
+        return Transpiler().compile(program)
+
+    def run(self, compiled: PythonProgram) -> dict[str, Any]:
+        namespace: dict[str, Any] = {"__builtins__": {}, **HELPERS}
+        namespace.update(
+            (FUNCTION_PREFIX + name, self.functions[name])
+            for name in compiled.functions if name in self.functions
+        )
+        namespace.update(
+            (VARIABLE_PREFIX + name, value) for name, value in self.variables.items()
+        )
+        try:
+            exec(compiled.code, namespace)
+        except NameError as error:
+            if error.name and error.name.startswith(FUNCTION_PREFIX):
+                raise NameError(
+                    f"function '{error.name.removeprefix(FUNCTION_PREFIX)}'"
+                    " is not defined"
+                ) from None
+            if error.name and error.name.startswith(VARIABLE_PREFIX):
+                raise NameError(
+                    f"name '{error.name.removeprefix(VARIABLE_PREFIX)}' is not defined"
+                ) from None
+            raise
+        finally:
+            # Keep whatever was assigned, even when the program failed midway
+            self.variables.update(
+                (name.removeprefix(VARIABLE_PREFIX), value)
+                for name, value in namespace.items()
+                if name.startswith(VARIABLE_PREFIX)
+            )
+        return self.variables
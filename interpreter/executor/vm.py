@@ -0,0 +1,116 @@
+# interpreter/executor/vm.py
+
+from typing import Any
+from interpreter.parser.ast import Program
+from .compiler import CodeObject, Compiler, Opcode, OPERATOR_LEXEMES
+from .executor import BINARY_OPERATORS, Executor, literal_value
+from .resolver import UNBOUND
+
+LOAD_CONST = Opcode.LOAD_CONST.value
+LOAD_FAST = Opcode.LOAD_FAST.value
+STORE_FAST = Opcode.STORE_FAST.value
+BINARY_ADD = Opcode.BINARY_ADD.value
+BINARY_SUBTRACT = Opcode.BINARY_SUBTRACT.value
+BINARY_OP = Opcode.BINARY_OP.value
+LOAD_FUNCTION = Opcode.LOAD_FUNCTION.value
+CALL_FUNCTION = Opcode.CALL_FUNCTION.value
+POP_TOP = Opcode.POP_TOP.value
+ADD_CHAIN = Opcode.ADD_CHAIN.value
+LOAD_LITERAL = Opcode.LOAD_LITERAL.value
+
+OPERATOR_FUNCTIONS = tuple(BINARY_OPERATORS[lexeme] for lexeme in OPERATOR_LEXEMES)
+
+
+class _Strings(list):
+    '''Strings of an `ADD_CHAIN` run, standing in for their concatenation.
+
+    Only `ADD_CHAIN` ever sees one on the stack; its own type keeps it apart
+    from any list a host function might return.
+    '''
+
+
+class VirtualMachine(Executor):
+    '''Stack-based VM executing the bytecode produced by `Compiler`.
+
+    Usage:
+        vm = VirtualMachine()
+        variables = vm.execute(program)  # compile + run
+    '''
+
+    name = "bytecode"
+
+    def compile(self, program: Program) -> CodeObject:
+        return Compiler().compile(program)
+
+    def run(self, compiled: CodeObject) -> dict[str, Any]:
+        symbols = compiled.symbols
+        slots = symbols.allocate(self.variables)
+        try:
+            self._dispatch(compiled, slots)
+        finally:
+            symbols.store(slots, self.variables)
+        return self.variables
+
+    def _dispatch(self, compiled: CodeObject, slots: list[Any]) -> None:
+        # Hoist everything the dispatch loop touches into locals
+        constants = compiled.constants
+        function_names = compiled.function_names
+        operators = OPERATOR_FUNCTIONS
+        unbound = UNBOUND
+        strings = _Strings
+        stack: list[Any] = []
+        push = stack.append
+        pop = stack.pop
+
+        # There are no jumps, so the code can be consumed as a pair iterator
+        words = iter(compiled.code.tolist())
+        for opcode, argument in zip(words, words):
+            if opcode == LOAD_FAST:
+                value = slots[argument]
+                if value is unbound:
+                    raise compiled.symbols.undefined(argument)
+                push(value)
+            elif opcode == LOAD_CONST:
+                push(constants[argument])
+            elif opcode == STORE_FAST:
+                slots[argument] = pop()
+            elif opcode == BINARY_ADD:
+                right = pop()
+                stack[-1] = stack[-1] + right
+            elif opcode == BINARY_SUBTRACT:
+                right = pop()
+                stack[-1] = stack[-1] - right
+            elif opcode == ADD_CHAIN:
+                # `add_chain`, one operand at a time
+                right = pop()
+                left = stack[-1]
+                if type(right) is not str:
+                    if type(left) is strings:
+                        left = "".join(left)
+                    stack[-1] = left + right
+                elif type(left) is strings:
+                    left.append(right)
+                    if argument:
+                        stack[-1] = "".join(left)
+                elif type(left) is str and not argument:
+                    stack[-1] = strings((left, right))
+                else:
+                    stack[-1] = left + right
+            elif opcode == LOAD_FUNCTION:
+                push(self.lookup_function(function_names[argument]))
+            elif opcode == CALL_FUNCTION:
+                if argument:
+                    arguments = stack[-argument:]
+                    del stack[-argument:]
+                    stack[-1] = stack[-1](*arguments)
+                else:
+                    stack[-1] = stack[-1]()
+            elif opcode == POP_TOP:
+                pop()
+            elif opcode == BINARY_OP:
+                right = pop()
+                stack[-1] = operators[argument](stack[-1], right)
+            elif opcode == LOAD_LITERAL:
+                push(literal_value(constants[argument]))
+            else:
+                raise RuntimeError(f"Unknown opcode {opcode}")
@@ -8,6 +8,16 @@ by the parser and other components of the interpreter.
 
 Modules:
     - lexer.py: Main lexer logic for tokenizing input source code.
+    - scanner.py: Hand-written single-pass scanner (`scan`), an alternative to
+      the regex engine that dispatches on character classes.
+    - token_buffer.py: `TokenBuffer`, a packed struct-of-arrays token stream
+      (category bytes plus source offsets) with lexemes sliced on demand and
+      line/column lookup.
+    - streaming.py: `iter_tokens`, which lazily tokenizes strings, text or
+      binary files and `mmap`s chunk by chunk, in bounded memory.
+    - interning.py: `TokenInterner`, the flyweight table through which every lexer
+      shares one `Token` per repeated identifier, keyword, operator and
+      punctuation lexeme (identifier strings go through `sys.intern`).
     - token_categories.py: Defines various token categories (e.g., keywords, numbers).
     - token_specifications.py: Defines the regex patterns used to identify tokens.
     - models.py: Contains dataclasses for representing Tokens and Token Specifications.
@@ -20,4 +30,7 @@ Usage:
     tokens = tokenize(source_code)
     
     This will return a list of tokens based on the provided source code.
+
+    The engines are registered in `tokenizer.LEXERS` by name ("regex",
+    "scanner" and "buffer") and produce the same tokens.
 """
@@ -0,0 +1,58 @@
+# interpeter/lexer/interning.py
+
+import sys
+from .token import Token
+from .token_categories import TokenCategory
+
+# Categories whose lexemes repeat over and over in real code; strings and
+# numbers are mostly distinct, so interning them would only grow the table
+INTERNED_CATEGORIES = (
+    TokenCategory.IDENTIFIER,
+    TokenCategory.KEYWORD,
+    TokenCategory.OPERATOR,
+    TokenCategory.OPEN_PAREN,
+    TokenCategory.CLOSE_PAREN,
+    TokenCategory.COMMA,
+    TokenCategory.NEWLINE,
+)
+
+
+class TokenInterner:
+    '''Flyweight table handing out one shared `Token` per (category, lexeme).
+
+    Tokens are frozen, so every occurrence of an identifier, keyword, operator
+    or punctuation character can be the same object. Identifier and keyword
+    lexemes also go through `sys.intern`, so names in the AST, in compiled
+    name tables and in executor environments are one string, and dictionary
+    lookups on them succeed on identity. A table lives as long as the lexer
+    run (or stream) using it, so it never outgrows one source.
+
+    Usage:
+        interner = TokenInterner()
+        token = interner.intern(TokenCategory.IDENTIFIER, "x")
+        assert interner.intern(TokenCategory.IDENTIFIER, "x") is token
+    '''
+
+    def __init__(self):
+        self.tables: dict[TokenCategory, dict[str, Token]] = {
+            category: {} for category in INTERNED_CATEGORIES
+        }
+
+    def intern(self, category: TokenCategory, lexeme: int | str) -> Token:
+        table = self.tables.get(category)
+        if table is None:
+            return Token(category, lexeme)
+        token = table.get(lexeme)
+        if token is None:
+            token = self.add(category, lexeme)
+        return token
+
+    def add(self, category: TokenCategory, lexeme: str) -> Token:
+        '''Create the shared token for a lexeme not in its table yet.'''
+        if category is TokenCategory.IDENTIFIER or category is TokenCategory.KEYWORD:
+            lexeme = sys.intern(lexeme)
+        token = self.tables[category][lexeme] = Token(category, lexeme)
+        return token
+
+    def __len__(self) -> int:
+        return sum(map(len, self.tables.values()))
@@ -0,0 +1,173 @@
+# interpeter/lexer/scanner.py
+
+import re
+from typing import Callable
+from .interning import TokenInterner
+from .token import Token
+from .token_categories import TokenCategory
+from .token_specifications import KEYWORDS, TOKEN_SPECIFICATIONS
+
+# Character classes used by the dispatch table
+(
+    IDENTIFIER_START, DIGIT, QUOTE, OPERATOR, OPEN_PAREN, CLOSE_PAREN, COMMA,
+    NEWLINE, SPACE, MISMATCH
+) = range(10)
+
+# Class of every ASCII character; anything else is classified on the fly
+ASCII_CLASSES = [MISMATCH] * 128
+for _character in range(128):
+    _character = chr(_character)
+    if _character.isalpha() or _character == '_':
+        ASCII_CLASSES[ord(_character)] = IDENTIFIER_START
+    elif _character.isdigit():
+        ASCII_CLASSES[ord(_character)] = DIGIT
+    elif _character == '\n':
+        ASCII_CLASSES[ord(_character)] = NEWLINE
+    elif _character.isspace():
+        ASCII_CLASSES[ord(_character)] = SPACE
+ASCII_CLASSES[ord('"')] = ASCII_CLASSES[ord("'")] = QUOTE
+for _character in '+-=':
+    ASCII_CLASSES[ord(_character)] = OPERATOR
+ASCII_CLASSES[ord('(')] = OPEN_PAREN
+ASCII_CLASSES[ord(')')] = CLOSE_PAREN
+ASCII_CLASSES[ord(',')] = COMMA
+del _character
+
+# Anchored matchers for the runs following a classified first character
+WORD_RUN = re.compile(r'\w*')
+DIGIT_RUN = re.compile(r'\d+')
+SPACE_RUN = re.compile(r'\s+')
+STRING = re.compile(next(
+    spec.regex_pattern for spec in TOKEN_SPECIFICATIONS
+    if spec.category == TokenCategory.STRING
+))
+# Strings that have not been closed yet, possibly ending in a lone backslash
+STRING_PREFIXES = {
+    '"': re.compile(r'"(?:\\.|[^\\"])*\\?'),
+    "'": re.compile(r"'(?:\\.|[^\\'])*\\?"),
+}
+
+# Single character tokens are shared, since tokens are immutable
+SINGLE_CHARACTER_TOKENS = {
+    OPEN_PAREN: Token(TokenCategory.OPEN_PAREN, '('),
+    CLOSE_PAREN: Token(TokenCategory.CLOSE_PAREN, ')'),
+    COMMA: Token(TokenCategory.COMMA, ','),
+    NEWLINE: Token(TokenCategory.NEWLINE, '\n'),
+}
+OPERATOR_TOKENS = {
+    operator: Token(TokenCategory.OPERATOR, operator) for operator in '+-='
+}
+
+
+def classify(character: str) -> int:
+    if character < '\x80':
+        return ASCII_CLASSES[ord(character)]
+    # Mirror the regex engine: `\d` and `\s` are Unicode aware, identifiers
+    # must start with an ASCII letter or underscore
+    if character.isdecimal():
+        return DIGIT
+    if character.isspace():
+        return SPACE
+    return MISMATCH
+
+
+def mismatch(character: str) -> SyntaxError:
+    return SyntaxError(
+        f"Error: Could not find a token category for the lexeme: {character}"
+    )
+
+
+def scan(source_code: str, interner: TokenInterner | None = None) -> list[Token]:
+    '''Single-pass scanner producing the same tokens as `tokenize`.
+
+    Dispatches on the class of the first character of each token instead of
+    trying every alternative of the combined token regex.
+    '''
+    tokens: list[Token] = []
+    scan_into(source_code, tokens.append, interner=interner)
+    return tokens
+
+
+def scan_into(
+    source_code: str,
+    append: Callable[[Token], None],
+    position: int = 0,
+    final: bool = True,
+    interner: TokenInterner | None = None
+) -> int:
+    '''Scan `source_code` from `position`, passing every token to `append`.
+
+    Returns the position scanning stopped at. Unless `final`, scanning stops
+    before a token that could still continue past the end of `source_code`
+    (identifiers, numbers, whitespace runs and unterminated strings), so the
+    caller can resume there once more text is available. Pass the same
+    `interner` when resuming, so tokens stay shared across calls.
+    '''
+    if interner is None:
+        interner = TokenInterner()
+    identifiers = interner.tables[TokenCategory.IDENTIFIER]
+    keyword_tokens = interner.tables[TokenCategory.KEYWORD]
+    keywords = KEYWORDS
+    ascii_classes = ASCII_CLASSES
+    length = len(source_code)
+
+    while position < length:
+        character = source_code[position]
+        if character < '\x80':
+            character_class = ascii_classes[ord(character)]
+        else:
+            character_class = classify(character)
+
+        if character_class == IDENTIFIER_START:
+            end = WORD_RUN.match(source_code, position + 1).end()
+            if end == length and not final:
+                break
+            lexeme = source_code[position:end]
+            # `\b` before a keyword fails right after a number, e.g. "2print"
+            if lexeme in keywords and not (
+                position and classify(source_code[position - 1]) == DIGIT
+            ):
+                append(keyword_tokens.get(lexeme) or interner.add(
+                    TokenCategory.KEYWORD, lexeme
+                ))
+            else:
+                append(identifiers.get(lexeme) or interner.add(
+                    TokenCategory.IDENTIFIER, lexeme
+                ))
+            position = end
+        elif character_class == SPACE:
+            # Like `\s+`, a run of whitespace swallows any newlines after it
+            end = SPACE_RUN.match(source_code, position).end()
+            if end == length and not final:
+                break
+            position = end
+        elif character_class == OPERATOR:
+            append(OPERATOR_TOKENS[character])
+            position += 1
+        elif character_class == DIGIT:
+            end = DIGIT_RUN.match(source_code, position).end()
+            if end == length and not final:
+                break
+            append(Token(TokenCategory.NUMBER, int(source_code[position:end])))
+            position = end
+        elif character_class == QUOTE:
+            match = STRING.match(source_code, position)
+            if match is None:
+                if not final and _is_string_prefix(source_code, position):
+                    break
+                raise mismatch(character)
+            append(Token(TokenCategory.STRING, match.group()))
+            position = match.end()
+        elif character_class == MISMATCH:
+            raise mismatch(character)
+        else:
+            append(SINGLE_CHARACTER_TOKENS[character_class])
+            position += 1
+
+    return position
+
+
+def _is_string_prefix(source_code: str, position: int) -> bool:
+    '''True if the unterminated string at `position` runs into the end of the text.'''
+    prefix = STRING_PREFIXES[source_code[position]].match(source_code, position)
+    return prefix.end() == len(source_code)
@@ -0,0 +1,83 @@
+# interpeter/lexer/streaming.py
+
+import codecs
+import mmap
+from collections.abc import Iterator
+from typing import BinaryIO, TextIO
+from .interning import TokenInterner
+from .scanner import scan_into
+from .token import Token
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+Source = str | TextIO | BinaryIO | mmap.mmap
+
+
+def iter_chunks(
+    source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8"
+) -> Iterator[str]:
+    '''Yield the text of `source` in pieces of about `chunk_size` characters.
+
+    Binary sources (binary files, `mmap`s) are decoded incrementally, so
+    multi-byte characters split across reads are handled.
+    '''
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+        return
+
+    decoder = None
+    while chunk := source.read(chunk_size):
+        if isinstance(chunk, (bytes, bytearray)):
+            decoder = decoder or codecs.getincrementaldecoder(encoding)()
+            chunk = decoder.decode(chunk)
+            if not chunk:
+                continue
+        yield chunk
+    if decoder is not None and (tail := decoder.decode(b"", final=True)):
+        yield tail
+
+
+def iter_tokens(
+    source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8"
+) -> Iterator[Token]:
+    '''Lazily tokenize a `str`, a text or binary file object, or an `mmap`.
+
+    Yields the same tokens as `tokenize`, but only ever holds one chunk of
+    text (plus the token being scanned when the chunk ended) in memory.
+    Tokens longer than a chunk cost time linear in their length.
+
+    Usage:
+        with open("script.py", "rb") as source_file:
+            for token in iter_tokens(source_file):
+                ...
+    '''
+    # `lookbehind` is the character before `pending`, needed for the `\b`
+    # rule on keywords; `pending` is text not tokenized yet
+    lookbehind, pending = "", ""
+    # Chunks read since the last scan. A token spanning many chunks is only
+    # rescanned once at least its own length of new text has arrived, so
+    # its scans cover geometrically growing buffers and total work is linear.
+    unscanned: list[str] = []
+    unscanned_size = 0
+    tokens: list[Token] = []
+    interner = TokenInterner()
+    for chunk in iter_chunks(source, chunk_size, encoding):
+        unscanned.append(chunk)
+        unscanned_size += len(chunk)
+        if unscanned_size < len(pending):
+            continue
+        buffer = lookbehind + pending + "".join(unscanned)
+        unscanned.clear()
+        unscanned_size = 0
+        position = scan_into(
+            buffer, tokens.append, len(lookbehind), final=False, interner=interner
+        )
+        yield from tokens
+        tokens.clear()
+        if position:
+            lookbehind = buffer[position - 1]
+        pending = buffer[position:]
+
+    scan_into(lookbehind + pending + "".join(unscanned), tokens.append, len(lookbehind), interner=interner)
+    yield from tokens
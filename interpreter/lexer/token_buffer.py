@@ -0,0 +1,164 @@
+# interpeter/lexer/token_buffer.py
+
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterator, Sequence
+from .scanner import (
+    ASCII_CLASSES, CLOSE_PAREN, COMMA, DIGIT, DIGIT_RUN, IDENTIFIER_START,
+    MISMATCH, NEWLINE, OPEN_PAREN, OPERATOR, QUOTE, SPACE, SPACE_RUN, STRING,
+    WORD_RUN, classify, mismatch
+)
+from .interning import TokenInterner
+from .token import Token
+from .token_categories import TokenCategory
+from .token_specifications import KEYWORDS
+
+# TokenCategory by value, for decoding the `categories` array
+CATEGORIES = {category.value: category for category in TokenCategory}
+NUMBER = TokenCategory.NUMBER.value
+
+# Category codes of the tokens produced by a single character class
+SINGLE_CHARACTER_CATEGORIES = {
+    OPERATOR: TokenCategory.OPERATOR.value,
+    OPEN_PAREN: TokenCategory.OPEN_PAREN.value,
+    CLOSE_PAREN: TokenCategory.CLOSE_PAREN.value,
+    COMMA: TokenCategory.COMMA.value,
+    NEWLINE: TokenCategory.NEWLINE.value,
+}
+
+
+class TokenBuffer(Sequence[Token]):
+    '''Packed token stream: parallel arrays of categories and source offsets.
+
+    Each token costs 13 bytes (one category byte, start and end offsets, and
+    an index into `constants`, the distinct number values) instead of a
+    `Token` object and its lexeme. Lexemes are sliced out of the source only
+    when asked for. The parsers read `categories` and `lexeme` directly and
+    only index the buffer for the tokens the AST keeps (names and operators);
+    indexing returns regular `Token`s, so any consumer of tokens accepts it.
+
+    Usage:
+        tokens = TokenBuffer.from_source(source_code)
+        program = Parser(tokens).parse()
+        tokens.line_column(3)  # -> (1, 5)
+    '''
+
+    def __init__(self, source_code: str):
+        self.source_code = source_code
+        self.categories = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        # Index into `constants` of each NUMBER token's value, 0 for the others
+        self.values = array('I')
+        self.constants: list[int] = []
+        self._line_starts: array | None = None
+        # Tokens are built on access; repeated names and punctuation are shared
+        self._interner = TokenInterner()
+
+    @classmethod
+    def from_source(cls, source_code: str) -> "TokenBuffer":
+        buffer = cls(source_code)
+        buffer._scan()
+        return buffer
+
+    def _scan(self) -> None:
+        source_code = self.source_code
+        categories, starts, ends = self.categories, self.starts, self.ends
+        add_category, add_start, add_end, add_value = (
+            categories.append, starts.append, ends.append, self.values.append
+        )
+        constants = self.constants
+        constant_indices: dict[int, int] = {}
+        keyword, identifier = TokenCategory.KEYWORD.value, TokenCategory.IDENTIFIER.value
+        number, string = TokenCategory.NUMBER.value, TokenCategory.STRING.value
+        ascii_classes = ASCII_CLASSES
+        position, length = 0, len(source_code)
+
+        while position < length:
+            character = source_code[position]
+            if character < '\x80':
+                character_class = ascii_classes[ord(character)]
+            else:
+                character_class = classify(character)
+
+            value = 0
+            if character_class == IDENTIFIER_START:
+                end = WORD_RUN.match(source_code, position + 1).end()
+                is_keyword = source_code[position:end] in KEYWORDS and not (
+                    position and classify(source_code[position - 1]) == DIGIT
+                )
+                add_category(keyword if is_keyword else identifier)
+            elif character_class == SPACE:
+                position = SPACE_RUN.match(source_code, position).end()
+                continue
+            elif character_class == DIGIT:
+                end = DIGIT_RUN.match(source_code, position).end()
+                constant = int(source_code[position:end])
+                value = constant_indices.get(constant)
+                if value is None:
+                    value = constant_indices[constant] = len(constants)
+                    constants.append(constant)
+                add_category(number)
+            elif character_class == QUOTE:
+                match = STRING.match(source_code, position)
+                if match is None:
+                    raise mismatch(character)
+                end = match.end()
+                add_category(string)
+            elif character_class == MISMATCH:
+                raise mismatch(character)
+            else:
+                end = position + 1
+                add_category(SINGLE_CHARACTER_CATEGORIES[character_class])
+            add_start(position)
+            add_end(end)
+            add_value(value)
+            position = end
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def __getitem__(self, index: int) -> Token:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._interner.intern(
+            CATEGORIES[self.categories[index]], self.lexeme(index)
+        )
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def category(self, index: int) -> TokenCategory:
+        return CATEGORIES[self.categories[index]]
+
+    def lexeme(self, index: int) -> int | str:
+        if self.categories[index] == NUMBER:
+            return self.constants[self.values[index]]
+        return self.source_code[self.starts[index]:self.ends[index]]
+
+    def span(self, index: int) -> tuple[int, int]:
+        return self.starts[index], self.ends[index]
+
+    def line_column(self, index: int) -> tuple[int, int]:
+        '''1-based line and column of the start of a token.'''
+        if self._line_starts is None:
+            self._line_starts = array('I', [0])
+            newline = self.source_code.find('\n')
+            while newline != -1:
+                self._line_starts.append(newline + 1)
+                newline = self.source_code.find('\n', newline + 1)
+        start = self.starts[index]
+        line = bisect_right(self._line_starts, start)
+        return line, start - self._line_starts[line - 1] + 1
+
+    def nbytes(self) -> int:
+        '''Approximate memory held by the token data (excluding the source).'''
+        arrays = (self.categories, self.starts, self.ends, self.values)
+        constants = sys.getsizeof(self.constants) + sum(
+            map(sys.getsizeof, self.constants)
+        )
+        return sum(a.itemsize * len(a) for a in arrays) + constants
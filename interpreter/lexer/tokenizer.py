@@ -4,9 +4,16 @@ import re
 from .token import Token
 from .token_categories import TokenCategory
 from .token_specifications import TOKEN_REGEX_PATTERNS
+from .interning import TokenInterner
+from .scanner import scan
+from .token_buffer import TokenBuffer
 
-def tokenize(source_code: str) -> list[Token]:
+def tokenize(source_code: str, interner: TokenInterner | None = None) -> list[Token]:
     tokens = []
+    # Repeated identifiers, keywords, operators and punctuation share one token
+    if interner is None:
+        interner = TokenInterner()
+    tables = interner.tables
     
     # Use regex to find all tokens
     for capture in re.finditer(TOKEN_REGEX_PATTERNS, source_code):
@@ -27,8 +34,24 @@ def tokenize(source_code: str) -> list[Token]:
         # Handle numeric token conversion
         if token_category == TokenCategory.NUMBER:
             capture_value = int(capture_value)
+
+        table = tables.get(token_category)
+        if table is not None:
+            token = table.get(capture_value) or interner.add(
+                token_category, capture_value
+            )
+        else:
+            token = Token(category=token_category, lexeme=capture_value)
         
         # Add valid token to the list
-        tokens.append(Token(category=token_category, lexeme=capture_value))
+        tokens.append(token)
 
     return tokens
+
+
+# Interchangeable lexer engines producing identical token streams
+LEXERS = {
+    "regex": tokenize,
+    "scanner": scan,
+    "buffer": TokenBuffer.from_source,
+}
@@ -0,0 +1,306 @@
+# interpreter/metrics.py
+
+'''
+Per-run instrumentation of the pipeline: phase timings, sizes and cache use.
+
+An `Instrumentation` hub hands out one `RunMetrics` per run. The pipeline
+times each phase it goes through (`cache` lookups and stores, `lex`, `parse`,
+`optimize`, `execute`) in wall and CPU time, and records the token, statement
+and AST node counts and whether the program cache hit. When the run ends, the
+finished `RunEvent` is passed to every subscriber. Two subscribers are built
+in: `HistogramAggregator` and `JsonLinesExporter`.
+
+Nothing is measured unless an `Instrumentation` is passed in. Tracing peak
+memory with `tracemalloc` slows the front end down several times, so it is
+opt-in with `trace_memory=True`.
+
+Usage:
+    from interpreter.metrics import (
+        HistogramAggregator, Instrumentation, JsonLinesExporter
+    )
+    from interpreter.pipeline import run_source
+
+    instrumentation = Instrumentation()
+    histograms = instrumentation.subscribe(HistogramAggregator())
+    instrumentation.subscribe(JsonLinesExporter("metrics.jsonl"))
+    run_source(source_code, instrumentation=instrumentation)
+    print(histograms.format())
+'''
+
+import json
+import time
+import tracemalloc
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+PHASES = ("cache", "lex", "parse", "optimize", "execute")
+
+Subscriber = Callable[["RunEvent"], Any]
+
+
+@dataclass
+class PhaseTiming:
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+@dataclass
+class RunEvent:
+    '''Everything measured during one run. Unmeasured values stay `None`.
+
+    CPU time is process-wide, so it includes work done by other threads.
+    '''
+
+    timestamp: float
+    labels: dict[str, Any] = field(default_factory=dict)
+    phases: dict[str, PhaseTiming] = field(default_factory=dict)
+    tokens: int | None = None
+    statements: int | None = None
+    nodes: int | None = None
+    peak_memory: int | None = None
+    cache: str | None = None  # "hit" or "miss" when a program cache is used
+    error: str | None = None
+
+    @property
+    def wall(self) -> float:
+        return sum(timing.wall for timing in self.phases.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class RunMetrics:
+    '''Collects the measurements of one run; emits its event when closed.
+
+    Usage:
+        with instrumentation.record(path=path) as run:
+            with run.phase("lex"):
+                tokens = tokenize(source_code)
+            run.event.tokens = len(tokens)
+    '''
+
+    def __init__(self, instrumentation: "Instrumentation", labels: dict[str, Any]):
+        self.instrumentation = instrumentation
+        self.event = RunEvent(time.time(), labels)
+        self._tracing = False
+
+    def __enter__(self) -> "RunMetrics":
+        if self.instrumentation.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._tracing = True
+        return self
+
+    def __exit__(self, exc_type: Any, exc: BaseException | None, traceback: Any) -> None:
+        if exc is not None:
+            self.event.error = f"{type(exc).__name__}: {exc}"
+        if self.instrumentation.trace_memory:
+            self.event.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._tracing:
+                tracemalloc.stop()
+        self.instrumentation.emit(self.event)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        # A phase entered twice (e.g. per statement) accumulates
+        timing = self.event.phases.setdefault(name, PhaseTiming())
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            timing.wall += time.perf_counter() - wall
+            timing.cpu += time.process_time() - cpu
+
+
+class NullRunMetrics:
+    '''Stands in for `RunMetrics` when nothing is measured.'''
+
+    event = None
+
+    def __enter__(self) -> "NullRunMetrics":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        yield
+
+
+NULL_RUN = NullRunMetrics()
+
+
+class Instrumentation:
+    '''Hub that runs report to and subscribers listen on.'''
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.subscribers: list[Subscriber] = []
+
+    def subscribe(self, subscriber: Subscriber) -> Subscriber:
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.remove(subscriber)
+
+    def record(self, **labels: Any) -> RunMetrics:
+        '''Start a run; `labels` (e.g. engine, path) are copied into its event.'''
+        return RunMetrics(self, labels)
+
+    def emit(self, event: RunEvent) -> None:
+        for subscriber in self.subscribers:
+            subscriber(event)
+
+
+# Upper bounds of the default histogram buckets: 1-2-5 steps from 1 µs to 500 s
+# for times, which also cover counts and bytes from 1 up to 5e8
+DEFAULT_BOUNDS = tuple(
+    mantissa * 10.0 ** exponent
+    for exponent in range(-6, 9)
+    for mantissa in (1, 2, 5)
+)
+
+
+class Histogram:
+    '''Fixed-bucket histogram, like a Prometheus histogram.
+
+    Quantiles are interpolated within buckets, so they are estimates.
+    '''
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BOUNDS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # The last one is unbounded
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, in_bucket in enumerate(self.buckets):
+            if in_bucket and seen + in_bucket >= rank:
+                lower = self.bounds[index - 1] if index else self.min
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / in_bucket
+            seen += in_bucket
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count, "sum": self.sum, "min": self.min, "max": self.max,
+            "buckets": {
+                str(bound): count
+                for bound, count in zip((*self.bounds, "+Inf"), self.buckets)
+                if count
+            },
+        }
+
+
+class HistogramAggregator:
+    '''Subscriber keeping one histogram per phase time and per size metric.
+
+    Metric names are "<phase>.wall" and "<phase>.cpu" (seconds), "tokens",
+    "statements", "nodes" and "peak_memory" (bytes); cache hits, misses and
+    errors are counted.
+    '''
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BOUNDS):
+        self.bounds = bounds
+        self.histograms: dict[str, Histogram] = {}
+        self.runs = self.errors = 0
+        self.cache = {"hit": 0, "miss": 0}
+
+    def __call__(self, event: RunEvent) -> None:
+        self.runs += 1
+        self.errors += event.error is not None
+        if event.cache is not None:
+            self.cache[event.cache] += 1
+        for phase, timing in event.phases.items():
+            self.add(f"{phase}.wall", timing.wall)
+            self.add(f"{phase}.cpu", timing.cpu)
+        for name in ("tokens", "statements", "nodes", "peak_memory"):
+            value = getattr(event, name)
+            if value is not None:
+                self.add(name, value)
+
+    def add(self, name: str, value: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(self.bounds)
+        histogram.add(value)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "runs": self.runs, "errors": self.errors, "cache": dict(self.cache),
+            "histograms": {
+                name: histogram.to_dict()
+                for name, histogram in sorted(self.histograms.items())
+            },
+        }
+
+    def format(self) -> str:
+        lines = [
+            f"{self.runs} runs, {self.errors} errors, cache "
+            f"{self.cache['hit']} hits / {self.cache['miss']} misses",
+            f"{'metric':<16} {'count':>7} {'mean':>11} {'p50':>11} "
+            f"{'p90':>11} {'p99':>11} {'max':>11}",
+        ]
+        for name, histogram in sorted(self.histograms.items()):
+            lines.append(
+                f"{name:<16} {histogram.count:>7} "
+                + " ".join(
+                    f"{value:>11.6g}" for value in (
+                        histogram.mean, histogram.quantile(0.5),
+                        histogram.quantile(0.9), histogram.quantile(0.99),
+                        histogram.max
+                    )
+                )
+            )
+        return "\n".join(lines)
+
+
+class JsonLinesExporter:
+    '''Subscriber appending one JSON object per run to a file or stream.
+
+    Each line is flushed as it is written, so the file can be tailed or
+    scraped while runs are still being recorded.
+    '''
+
+    def __init__(self, target: str | Path | TextIO):
+        if isinstance(target, (str, Path)):
+            self.stream = open(target, "a", encoding="utf-8")
+            self._owned = True
+        else:
+            self.stream = target
+            self._owned = False
+
+    def __call__(self, event: RunEvent) -> None:
+        self.stream.write(json.dumps(event.to_dict(), default=str) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self._owned:
+            self.stream.close()
@@ -0,0 +1,33 @@
+# interpreter/optimizer/__init__.py
+
+from .optimizer import Optimizer, optimize
+
+"""
+Optimizer package for rewriting the AST between parsing and execution.
+
+Modules:
+    - optimizer.py: `Optimizer`, which runs a list of passes and records a
+      per-pass `OptimizationReport` (rewrites, node counts and time).
+    - passes.py: The passes themselves:
+        - `ConstantFolding`: folds `+`/`-` between literals (numbers and strings);
+          `run_arena` folds an `Arena` in place of a `Program`.
+        - `Reassociation`: regroups `+`/`-` chains of known kind so constants merge
+          even when variables sit in between (`2 + x + 4 - 1` -> `x + 5`).
+        - `IdentityElimination`: drops `x + 0`, `x - 0`, `x + ""` and friends.
+    - dataflow.py: Whole-program passes over the straight-line statement list:
+        - `ConstantPropagation`: substitutes variables holding known constants.
+        - `CommonSubexpressionElimination`: reuses a variable already holding the
+          value of a repeated call-free expression.
+        - `DeadStoreElimination`: removes assignments overwritten before any read.
+    - inference.py: Infers whether variables always hold ints or strings, which
+      decides when reassociation and identity elimination are safe.
+
+Usage:
+    from interpreter.optimizer import optimize
+
+    program = optimize(Parser(tokenize(source_code)).parse())
+
+Notes:
+    - Every pass preserves the observable behaviour of the program, including
+      the errors it raises (e.g. `"a" + 1` is never folded).
+"""
@@ -0,0 +1,225 @@
+# interpreter/optimizer/dataflow.py
+
+from interpreter.lexer.tokenizer import Token, TokenCategory
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Literal, Program,
+    Statement, Variable, walk
+)
+from .inference import Kind, expression_kind, infer_variable_kinds, literal_kind
+from .passes import ConstantFolding, OptimizationPass
+
+
+def read_variables(expression: Expression) -> set[str]:
+    return {
+        node.name.lexeme for node in walk(expression) if isinstance(node, Variable)
+    }
+
+
+def _split(statement: Statement) -> tuple[str | None, Expression]:
+    if isinstance(statement, Assignment):
+        return statement.identifier, statement.expression
+    return None, statement
+
+
+def _join(statement: Statement, expression: Expression) -> Statement:
+    if isinstance(statement, Assignment):
+        if expression is statement.expression:
+            return statement
+        return Assignment(statement.identifier, expression)
+    return expression
+
+
+class ConstantPropagation(ConstantFolding):
+    '''Substitutes variables holding known constants and folds the result.
+
+    `x = 2` followed by `y = x + 1` becomes `y = 3`, which in turn makes `y` a
+    known constant for the statements after it.
+    '''
+
+    name = "constant-propagation"
+    # Folding alone is not propagation, so there is no arena version
+    run_arena = None
+
+    def run(self, program: Program) -> Program:
+        self.constants: dict[str, Literal] = {}
+        statements = []
+        for statement in program.statements:
+            identifier, expression = _split(statement)
+            expression = self.visit_expression(expression)
+            if identifier is not None:
+                if isinstance(expression, Literal):
+                    self.constants[identifier] = expression
+                else:
+                    self.constants.pop(identifier, None)
+            statements.append(_join(statement, expression))
+
+        if all(new is old for new, old in zip(statements, program.statements)):
+            return program
+        return Program(statements)
+
+    def rewrite(self, expression: Expression) -> Expression:
+        if isinstance(expression, Variable):
+            return self.constants.get(expression.name.lexeme, expression)
+        return super().rewrite(expression)
+
+
+class CommonSubexpressionElimination(OptimizationPass):
+    '''Reuses a variable that already holds the value of a repeated expression.
+
+    `x = a + b` followed by `y = a + b + c` becomes `y = x + c`, as long as none
+    of `x`, `a` and `b` was reassigned in between. Expressions containing calls
+    are never reused, since calls may have side effects.
+    '''
+
+    name = "common-subexpression-elimination"
+
+    def run(self, program: Program) -> Program:
+        # Every distinct expression shape gets a number, e.g. `a + b` wherever
+        # it occurs, so repeated expressions are found without deep hashing
+        self.shapes: dict[tuple, int] = {}
+        # id -> (node, shape number, whether it contains a call), filled in
+        # bottom-up as `visit_expression` reaches each node
+        self.nodes: dict[int, tuple[Expression, int, bool]] = {}
+        # shape number -> variable currently holding its value
+        self.available: dict[int, str] = {}
+        # variable -> available shapes that read it or are held by it
+        self.dependants: dict[str, set[int]] = {}
+
+        statements = []
+        for statement in program.statements:
+            identifier, expression = _split(statement)
+            expression = self.visit_expression(expression)
+            if identifier is not None:
+                self._invalidate(identifier)
+                self._make_available(identifier, expression)
+            statements.append(_join(statement, expression))
+
+        if all(new is old for new, old in zip(statements, program.statements)):
+            return program
+        return Program(statements)
+
+    def rewrite(self, expression: Expression) -> Expression:
+        shape, calls = self._describe(expression)
+        if (
+            isinstance(expression, BinaryExpression)
+            and not calls
+            and shape in self.available
+        ):
+            variable = Variable(Token(TokenCategory.IDENTIFIER, self.available[shape]))
+            self._describe(variable)
+            return variable
+        return expression
+
+    def _describe(self, expression: Expression) -> tuple[int, bool]:
+        '''Shape number of `expression`, and whether it contains a call.
+
+        Children are always described first (`rewrite` runs bottom-up), so
+        this is constant time per node.
+        '''
+        if (entry := self.nodes.get(id(expression))) is not None:
+            return entry[1], entry[2]
+        match expression:
+            case BinaryExpression():
+                left, left_calls = self._describe(expression.left)
+                right, right_calls = self._describe(expression.right)
+                key = (BinaryExpression, left, expression.operator, right)
+                calls = left_calls or right_calls
+            case FunctionCall():
+                arguments = tuple(self._describe(a)[0] for a in expression.arguments)
+                key = (FunctionCall, expression.name, arguments)
+                calls = True
+            case Literal():
+                key = (Literal, type(expression.value), expression.value)
+                calls = False
+            case _:
+                key = (type(expression), expression)
+                calls = False
+        shape = self.shapes.setdefault(key, len(self.shapes))
+        self.nodes[id(expression)] = (expression, shape, calls)
+        return shape, calls
+
+    def _invalidate(self, identifier: str) -> None:
+        for shape in self.dependants.pop(identifier, ()):
+            self.available.pop(shape, None)
+
+    def _make_available(self, identifier: str, expression: Expression) -> None:
+        if not isinstance(expression, BinaryExpression):
+            return
+        shape, calls = self._describe(expression)
+        if calls:
+            return
+        reads = read_variables(expression)
+        if identifier in reads:
+            # e.g. `x = x + 1`: x no longer holds the value of `x + 1`
+            return
+        self.available[shape] = identifier
+        for name in reads | {identifier}:
+            self.dependants.setdefault(name, set()).add(shape)
+
+
+class DeadStoreElimination(OptimizationPass):
+    '''Removes assignments whose value is overwritten before it is ever read.
+
+    A store is only removed when its expression can neither fail nor have side
+    effects, and no statement between it and the overwrite can fail either, so
+    the variables seen after an error are unchanged too.
+    '''
+
+    name = "dead-store-elimination"
+
+    def run(self, program: Program) -> Program:
+        self.variable_kinds = infer_variable_kinds(program)
+
+        # Variables definitely bound before each statement runs
+        bound_before = []
+        bound: set[str] = set()
+        for statement in program.statements:
+            bound_before.append(frozenset(bound))
+            if isinstance(statement, Assignment):
+                bound.add(statement.identifier)
+
+        # Walk backwards tracking variables that are overwritten before any read
+        kept: list[Statement] = []
+        overwritten: set[str] = set()
+        for statement, bound in zip(
+            reversed(program.statements), reversed(bound_before)
+        ):
+            identifier, expression = _split(statement)
+            safe = self._is_safe(expression, bound)
+            if identifier is not None and identifier in overwritten and safe:
+                self.rewrites += 1
+                continue
+
+            kept.append(statement)
+            if not safe:
+                overwritten.clear()
+            elif identifier is not None:
+                overwritten.add(identifier)
+            overwritten -= read_variables(expression)
+
+        if len(kept) == len(program.statements):
+            return program
+        return Program(kept[::-1])
+
+    def _is_safe(self, expression: Expression, bound: frozenset[str]) -> bool:
+        '''True if evaluating `expression` can neither raise nor have side effects.'''
+        kinds: dict[int, tuple[Expression, Kind | None]] = {}
+        for node in walk(expression):
+            match node:
+                case Literal() if literal_kind(node) is not Kind.UNKNOWN:
+                    continue
+                case Variable():
+                    if node.name.lexeme not in bound:
+                        return False
+                case BinaryExpression() if node.operator.lexeme in ('+', '-'):
+                    operand_kinds = {
+                        expression_kind(node.left, self.variable_kinds, kinds),
+                        expression_kind(node.right, self.variable_kinds, kinds),
+                    }
+                    if not (operand_kinds == {Kind.INT} or (
+                        operand_kinds == {Kind.STR} and node.operator.lexeme == '+'
+                    )):
+                        return False
+                case _:
+                    return False
+        return True
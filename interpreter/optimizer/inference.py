@@ -0,0 +1,115 @@
+# interpreter/optimizer/inference.py
+
+from enum import Enum, auto
+from interpreter.executor.executor import is_valid_literal
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, Literal, Program,
+    Variable, walk
+)
+
+
+class Kind(Enum):
+    INT = auto()      # Always an int at run time
+    STR = auto()      # Always a str at run time
+    UNKNOWN = auto()  # Anything (function results, external variables, ...)
+
+
+def literal_kind(literal: Literal) -> Kind:
+    # String literals keep their quotes in the AST, numbers are ints
+    if not isinstance(literal.value, str):
+        return Kind.INT
+    # One that fails to decode raises when evaluated, so it is no known string
+    return Kind.STR if is_valid_literal(literal.value) else Kind.UNKNOWN
+
+
+def expression_kind(
+    expression: Expression, variable_kinds: dict[str, Kind | None],
+    memo: dict[int, tuple[Expression, Kind | None]] | None = None
+) -> Kind | None:
+    '''Kind of an expression; None means "no information yet" during inference.
+
+    Computed with an explicit post-order stack, so chains of any length never
+    hit the recursion limit. Callers asking about many overlapping subtrees
+    pass the same `memo`, which maps node ids to their node and kind, so each
+    node is only ever looked at once.
+    '''
+    memo = {} if memo is None else memo
+    pending: list[tuple[Expression, bool]] = [(expression, False)]
+    while pending:
+        node, ready = pending.pop()
+        if id(node) in memo:
+            continue
+        match node:
+            case Literal():
+                kind = literal_kind(node)
+            case Variable():
+                kind = variable_kinds.get(node.name.lexeme, Kind.UNKNOWN)
+            case BinaryExpression() if node.operator.lexeme in ('+', '-'):
+                if not ready:
+                    pending.append((node, True))
+                    pending.append((node.right, False))
+                    pending.append((node.left, False))
+                    continue
+                kind = _binary_kind(
+                    node.operator.lexeme, memo[id(node.left)][1],
+                    memo[id(node.right)][1]
+                )
+            case _:
+                kind = Kind.UNKNOWN
+        memo[id(node)] = (node, kind)
+    return memo[id(expression)][1]
+
+
+def _binary_kind(lexeme: str, left: Kind | None, right: Kind | None) -> Kind | None:
+    kinds = {left, right} - {None}
+    if not kinds:
+        return None
+    if kinds == {Kind.INT}:
+        return Kind.INT
+    if kinds == {Kind.STR} and lexeme == '+':
+        return Kind.STR
+    return Kind.UNKNOWN
+
+
+def infer_variable_kinds(program: Program) -> dict[str, Kind]:
+    '''Flow-insensitive kind of every variable in a straight-line program.
+
+    A variable only gets a precise kind when the program assigns it before any
+    read; otherwise its first read sees a value from outside the program.
+    '''
+    assignments: dict[str, list[Expression]] = {}
+    external: set[str] = set()
+    for statement in program.statements:
+        # The right-hand side is evaluated before the identifier is bound
+        expression = (
+            statement.expression if isinstance(statement, Assignment) else statement
+        )
+        for node in walk(expression):
+            if isinstance(node, Variable) and node.name.lexeme not in assignments:
+                external.add(node.name.lexeme)
+        if isinstance(statement, Assignment):
+            assignments.setdefault(statement.identifier, []).append(
+                statement.expression
+            )
+
+    # Optimistic fixpoint: start from "no information" and only ever widen
+    kinds: dict[str, Kind | None] = {
+        name: Kind.UNKNOWN if name in external else None for name in assignments
+    }
+    changed = True
+    while changed:
+        changed = False
+        for name, expressions in assignments.items():
+            if kinds[name] is Kind.UNKNOWN:
+                continue
+            candidates = {expression_kind(e, kinds) for e in expressions} - {None}
+            kind = (
+                candidates.pop() if len(candidates) == 1
+                else Kind.UNKNOWN if candidates
+                else None
+            )
+            if kind != kinds[name]:
+                kinds[name] = kind
+                changed = True
+
+    return {name: kind or Kind.UNKNOWN for name, kind in kinds.items()}
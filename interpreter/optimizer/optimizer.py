@@ -0,0 +1,113 @@
+# interpreter/optimizer/optimizer.py
+
+import time
+from dataclasses import dataclass, field
+from interpreter.parser.arena import Arena
+from interpreter.parser.ast import Program, count_nodes, walk
+from .dataflow import (
+    CommonSubexpressionElimination, ConstantPropagation, DeadStoreElimination
+)
+from .passes import (
+    ConstantFolding, IdentityElimination, OptimizationPass, Reassociation
+)
+
+
+def default_passes() -> list[OptimizationPass]:
+    return [
+        ConstantFolding(), Reassociation(), IdentityElimination(),
+        ConstantPropagation(), CommonSubexpressionElimination(),
+        DeadStoreElimination(),
+    ]
+
+
+@dataclass(frozen=True)
+class PassStatistics:
+    name: str
+    rewrites: int
+    nodes_before: int
+    nodes_after: int
+    seconds: float
+
+
+@dataclass
+class OptimizationReport:
+    passes: list[PassStatistics] = field(default_factory=list)
+
+    @property
+    def nodes_eliminated(self) -> int:
+        return sum(p.nodes_before - p.nodes_after for p in self.passes)
+
+    def format(self) -> str:
+        lines = [f"{'pass':<32} {'rewrites':>9} {'nodes':>17} {'time':>10}"]
+        for p in self.passes:
+            lines.append(
+                f"{p.name:<32} {p.rewrites:>9} "
+                f"{f'{p.nodes_before} -> {p.nodes_after}':>17} "
+                f"{p.seconds * 1000:>8.2f}ms"
+            )
+        lines.append(f"{'total nodes eliminated':<32} {self.nodes_eliminated:>9}")
+        return "\n".join(lines)
+
+
+class Optimizer:
+    '''Runs a sequence of AST passes between parsing and execution.
+
+    Usage:
+        optimizer = Optimizer()
+        program = optimizer.optimize(Parser(tokens).parse())
+        print(optimizer.report.format())
+    '''
+
+    def __init__(self, passes: list[OptimizationPass] | None = None):
+        self.passes = default_passes() if passes is None else passes
+        self.report = OptimizationReport()
+
+    def optimize(self, program: Program) -> Program:
+        nodes = count_nodes(program)
+        for optimization_pass in self.passes:
+            start = time.perf_counter()
+            rewrites = optimization_pass.rewrites
+            program = optimization_pass.run(program)
+            elapsed = time.perf_counter() - start
+            nodes_after = count_nodes(program)
+            self.report.passes.append(PassStatistics(
+                optimization_pass.name, optimization_pass.rewrites - rewrites,
+                nodes, nodes_after, elapsed
+            ))
+            nodes = nodes_after
+        return program
+
+    def optimize_arena(self, arena: Arena) -> Arena:
+        '''Run every pass on `arena`, producing the same program as `optimize`.
+
+        Passes with a `run_arena` (only constant folding so far) walk the
+        arena directly; for each run of the others, the arena is rebuilt as a
+        dataclass `Program` once and flattened again afterwards.
+        '''
+        nodes = len(arena)
+        program = None
+        for optimization_pass in self.passes:
+            run_arena = getattr(optimization_pass, "run_arena", None)
+            start = time.perf_counter()
+            rewrites = optimization_pass.rewrites
+            if run_arena is not None:
+                if program is not None:
+                    arena, program = Arena.from_program(program), None
+                arena = run_arena(arena)
+                nodes_after = len(arena)
+            else:
+                if program is None:
+                    program = arena.to_program()
+                program = optimization_pass.run(program)
+                # Distinct nodes without `Program`, as `len(arena)` counts them
+                nodes_after = len({id(node) for node in walk(program)}) - 1
+            elapsed = time.perf_counter() - start
+            self.report.passes.append(PassStatistics(
+                optimization_pass.name, optimization_pass.rewrites - rewrites,
+                nodes, nodes_after, elapsed
+            ))
+            nodes = nodes_after
+        return arena if program is None else Arena.from_program(program)
+
+def optimize(program: Program) -> Program:
+    return Optimizer().optimize(program)
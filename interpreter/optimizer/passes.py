@@ -0,0 +1,339 @@
+# interpreter/optimizer/passes.py
+
+from interpreter.lexer.tokenizer import Token, TokenCategory
+from interpreter.parser.arena import BINARY, LITERAL, OPERATORS, Arena
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Literal, Program,
+    Statement, Variable, same_tree
+)
+from interpreter.executor.executor import literal_value
+from .inference import Kind, expression_kind, infer_variable_kinds, literal_kind
+
+PLUS = Token(TokenCategory.OPERATOR, '+')
+MINUS = Token(TokenCategory.OPERATOR, '-')
+
+
+def make_literal(value: int | str) -> Literal:
+    # String literals are stored quoted, exactly like the parser does
+    return Literal(repr(value) if isinstance(value, str) else value)
+
+
+class OptimizationPass:
+    '''Base class for AST to AST rewrites.
+
+    Subclasses override `rewrite`, which is called bottom-up on every expression
+    whose children have already been rewritten, and/or `replace_subtree`, which
+    is called top-down before an expression's children are visited and may
+    replace the whole subtree at once. Unchanged subtrees are returned as the
+    very same objects. The tree is walked with an explicit stack, so
+    expressions of any size never hit the recursion limit.
+    '''
+
+    name = "pass"
+
+    def __init__(self):
+        self.rewrites = 0
+
+    def run(self, program: Program) -> Program:
+        statements = [self.visit_statement(s) for s in program.statements]
+        if all(new is old for new, old in zip(statements, program.statements)):
+            return program
+        return Program(statements)
+
+    def visit_statement(self, statement: Statement) -> Statement:
+        if isinstance(statement, Assignment):
+            expression = self.visit_expression(statement.expression)
+            if expression is statement.expression:
+                return statement
+            return Assignment(statement.identifier, expression)
+        return self.visit_expression(statement)
+
+    def visit_expression(self, expression: Expression) -> Expression:
+        # Iterative post-order: a node is rebuilt and rewritten once all its
+        # children have been, their results waiting on `results`
+        results: list[Expression] = []
+        pending: list[tuple[Expression, bool]] = [(expression, False)]
+        replace_subtree = (
+            self.replace_subtree
+            if type(self).replace_subtree is not OptimizationPass.replace_subtree
+            else None
+        )
+        while pending:
+            node, ready = pending.pop()
+            if not ready:
+                if replace_subtree is not None and (
+                    (replaced := replace_subtree(node)) is not None
+                ):
+                    results.append(replaced)
+                    continue
+                match node:
+                    case BinaryExpression():
+                        pending.append((node, True))
+                        pending.append((node.right, False))
+                        pending.append((node.left, False))
+                        continue
+                    case FunctionCall() if node.arguments:
+                        pending.append((node, True))
+                        pending.extend((a, False) for a in reversed(node.arguments))
+                        continue
+            else:
+                match node:
+                    case BinaryExpression():
+                        right = results.pop()
+                        left = results.pop()
+                        if left is not node.left or right is not node.right:
+                            node = BinaryExpression(left, node.operator, right)
+                    case FunctionCall():
+                        arguments = results[-len(node.arguments):]
+                        del results[-len(node.arguments):]
+                        if any(
+                            new is not old for new, old in zip(arguments, node.arguments)
+                        ):
+                            node = FunctionCall(node.name, arguments)
+            rewritten = self.rewrite(node)
+            if rewritten is not node:
+                self.rewrites += 1
+            results.append(rewritten)
+        return results.pop()
+
+    def replace_subtree(self, expression: Expression) -> Expression | None:
+        return None
+
+    def rewrite(self, expression: Expression) -> Expression:
+        return expression
+
+
+class ConstantFolding(OptimizationPass):
+    '''Evaluates `+`/`-` between two literals, e.g. `2 + 3` or `"a" + "b"`.
+
+    `run_arena` does the same on an `Arena`, in one forward loop over its
+    nodes.
+    '''
+
+    name = "constant-folding"
+
+    def rewrite(self, expression: Expression) -> Expression:
+        if not (
+            isinstance(expression, BinaryExpression)
+            and isinstance(expression.left, Literal)
+            and isinstance(expression.right, Literal)
+        ):
+            return expression
+        folded = self.fold(expression.operator.lexeme, expression.left, expression.right)
+        return expression if folded is None else folded
+
+    def run_arena(self, arena: Arena) -> Arena:
+        kind, left, right, value = arena.kind, arena.left, arena.right, arena.value
+        # `Literal.value` of every node known to be constant, and of those folded
+        values: dict[int, int | str] = {}
+        folded: dict[int, int | str] = {}
+        # Children precede their parents, so operands are final when reached
+        for index in range(len(kind)):
+            node_kind = kind[index]
+            if node_kind == LITERAL:
+                values[index] = arena.constants[value[index]]
+            elif (
+                node_kind == BINARY
+                and left[index] in values and right[index] in values
+            ):
+                literal = self.fold(
+                    OPERATORS[arena.operator[index]],
+                    Literal(values[left[index]]), Literal(values[right[index]])
+                )
+                if literal is not None:
+                    values[index] = folded[index] = literal.value
+                    self.rewrites += 1
+        return arena.rewritten(folded) if folded else arena
+
+    @staticmethod
+    def fold(lexeme: str, left: Literal, right: Literal) -> Literal | None:
+        kinds = {literal_kind(left), literal_kind(right)}
+        if Kind.UNKNOWN in kinds:
+            return None
+        left_value = literal_value(left.value)
+        right_value = literal_value(right.value)
+        match lexeme:
+            case '+' if len(kinds) == 1:
+                return make_literal(left_value + right_value)
+            case '-' if kinds == {Kind.INT}:
+                return make_literal(left_value - right_value)
+        # Mixed types must still fail at run time, so leave them alone
+        return None
+
+
+class Reassociation(OptimizationPass):
+    '''Regroups `+`/`-` chains of known kind so that their constants merge.
+
+    `2 + x + 4 - 1` becomes `x + 5`, and `x + "a" + "b"` becomes `x + "ab"`. Only
+    chains whose operands are all known ints or all known strings are touched;
+    variables keep their evaluation order.
+    '''
+
+    name = "reassociation"
+
+    def run(self, program: Program) -> Program:
+        self.variable_kinds = infer_variable_kinds(program)
+        # Ids of chain nodes already known not to be rebuildable
+        self._rejected: set[int] = set()
+        return super().run(program)
+
+    def replace_subtree(self, expression: Expression) -> Expression | None:
+        if not self._is_chain(expression):
+            return None
+        if id(expression) in self._rejected:
+            self._rejected.discard(id(expression))
+            return None
+
+        # The left spine holds the chain's prefixes, which only ever gain
+        # terms going up. Once a prefix can't be rebuilt no longer one can, so
+        # one bottom-up scan finds the topmost rebuildable node (the first one
+        # the visit reaches) and every node above it is rejected in advance.
+        spine = [expression]
+        while self._is_chain(spine[-1].left):
+            spine.append(spine[-1].left)
+        # Signed operands in evaluation order, collected going up the spine
+        terms: list[tuple[int, Expression]] = []
+        kinds: set[Kind] = set()
+        positive = True
+        rebuildable = None
+        for depth in range(len(spine) - 1, -1, -1):
+            node = spine[depth]
+            start = len(terms)
+            if depth == len(spine) - 1:
+                terms.extend(self._flatten(node))
+            else:
+                sign = 1 if node.operator.lexeme == '+' else -1
+                terms.extend((sign * s, term) for s, term in self._flatten(node.right))
+            for term_sign, term in terms[start:]:
+                kinds.add(self._kind(term))
+                positive = positive and term_sign > 0
+            if not (kinds == {Kind.INT} or (kinds == {Kind.STR} and positive)):
+                break
+            rebuildable = depth
+        if rebuildable != 0:
+            self._rejected.update(
+                id(node) for node in spine[1:rebuildable or len(spine)]
+            )
+            return None
+
+        if kinds == {Kind.INT}:
+            rebuilt = self._rebuild_numeric(terms)
+        else:
+            rebuilt = self._rebuild_string(terms)
+        if same_tree(rebuilt, expression):
+            return expression
+        self.rewrites += 1
+        return rebuilt
+
+    @staticmethod
+    def _is_chain(expression: Expression) -> bool:
+        return (
+            isinstance(expression, BinaryExpression)
+            and expression.operator.lexeme in ('+', '-')
+        )
+
+    def _flatten(self, expression: Expression) -> list[tuple[int, Expression]]:
+        '''Signed operands of a `+`/`-` chain, in evaluation order.'''
+        terms = []
+        pending = [(1, expression)]
+        while pending:
+            sign, node = pending.pop()
+            if self._is_chain(node):
+                right_sign = sign if node.operator.lexeme == '+' else -sign
+                pending.append((right_sign, node.right))
+                pending.append((sign, node.left))
+            else:
+                terms.append((sign, node))
+        return terms
+
+    def _kind(self, term: Expression) -> Kind:
+        match term:
+            case Literal():
+                return literal_kind(term)
+            case Variable():
+                return self.variable_kinds.get(term.name.lexeme, Kind.UNKNOWN)
+        return Kind.UNKNOWN
+
+    @staticmethod
+    def _rebuild_numeric(terms: list[tuple[int, Expression]]) -> Expression:
+        constant = sum(
+            sign * term.value for sign, term in terms if isinstance(term, Literal)
+        )
+        variables = [(sign, term) for sign, term in terms if isinstance(term, Variable)]
+        if not variables:
+            return make_literal(constant)
+
+        # There is no unary minus, so a leading negative term needs a left operand
+        if variables[0][0] > 0:
+            result = variables.pop(0)[1]
+        else:
+            result, constant = make_literal(constant), 0
+        for sign, term in variables:
+            result = BinaryExpression(result, PLUS if sign > 0 else MINUS, term)
+        if constant:
+            result = BinaryExpression(
+                result, PLUS if constant > 0 else MINUS, make_literal(abs(constant))
+            )
+        return result
+
+    @staticmethod
+    def _rebuild_string(terms: list[tuple[int, Expression]]) -> Expression:
+        # Merge runs of adjacent literals and drop the ones that end up empty
+        operands: list[Expression | str] = []
+        for _, term in terms:
+            if isinstance(term, Literal):
+                value = literal_value(term.value)
+                if operands and isinstance(operands[-1], str):
+                    operands[-1] += value
+                else:
+                    operands.append(value)
+            else:
+                operands.append(term)
+        operands = [
+            make_literal(operand) if isinstance(operand, str) else operand
+            for operand in operands if operand != ""
+        ]
+        if not operands:
+            return make_literal("")
+        result = operands[0]
+        for operand in operands[1:]:
+            result = BinaryExpression(result, PLUS, operand)
+        return result
+
+
+class IdentityElimination(OptimizationPass):
+    '''Drops `x + 0`, `0 + x`, `x - 0` for int `x` and `x + ""`, `"" + x` for str `x`.'''
+
+    name = "identity-elimination"
+
+    def run(self, program: Program) -> Program:
+        self.variable_kinds = infer_variable_kinds(program)
+        self._kinds: dict[int, tuple[Expression, Kind | None]] = {}
+        return super().run(program)
+
+    def rewrite(self, expression: Expression) -> Expression:
+        if not isinstance(expression, BinaryExpression):
+            return expression
+
+        lexeme = expression.operator.lexeme
+        if lexeme == '+' and self._is_identity_for(expression.left, expression.right):
+            return expression.right
+        if lexeme in ('+', '-') and self._is_identity_for(
+            expression.right, expression.left
+        ):
+            # "x" - "" is still a type error, so only ints have a '-' identity
+            if lexeme == '+' or expression.right.value == 0:
+                return expression.left
+        return expression
+
+    def _is_identity_for(self, candidate: Expression, operand: Expression) -> bool:
+        if (
+            not isinstance(candidate, Literal)
+            or literal_kind(candidate) is Kind.UNKNOWN
+        ):
+            return False
+        value = literal_value(candidate.value)
+        if value != 0 and value != "":
+            return False
+        kind = expression_kind(operand, self.variable_kinds, self._kinds)
+        return (kind is Kind.INT and value == 0) or (kind is Kind.STR and value == "")
@@ -0,0 +1,183 @@
+# interpreter/parallel.py
+
+'''
+Parallel front end: lex and parse large sources on a process pool.
+
+Statements never span a NEWLINE token, so a source cut right after one can be
+tokenized and parsed piece by piece. `split_source` finds such cuts without
+tokenizing, and `parse_parallel` parses the pieces on a `ProcessPoolExecutor`
+and joins their statements in order, giving the same `Program` (and the same
+first error) as the serial `Parser(tokenize(source_code)).parse()`.
+
+Usage:
+    from interpreter.parallel import parse_parallel
+
+    program = parse_parallel(source_code, workers=16)
+'''
+
+import gc
+import os
+import re
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
+from interpreter.lexer.scanner import STRING
+from interpreter.lexer.tokenizer import LEXERS, Token
+from interpreter.parser import PARSERS
+from interpreter.parser.ast import Program, Statement
+from interpreter.parser.nodes import HashConsingNodeFactory
+
+# Below this many characters per piece, pool start-up and pickling cost more
+# than they save
+MIN_CHUNK_SIZE = 1 << 18
+
+# Pieces per worker, so a slow piece does not leave the other workers idle
+CHUNKS_PER_WORKER = 4
+
+# A quote (which may open a string literal) or a newline the lexer surely
+# turns into a NEWLINE token. A newline after whitespace may be part of a SKIP
+# run (`\s+`, which also swallows newlines) and does not end the line.
+SPLIT_POINT = re.compile(r"""["']|(?<!\s)\n""")
+QUOTE = re.compile(r"""["']""")
+
+# Outcomes of `_parse_chunk`
+PARSED, LEXING_FAILED, PARSING_FAILED = range(3)
+
+
+def split_source(source_code: str, parts: int) -> list[str]:
+    '''Cut `source_code` into at most `parts` pieces of similar size.
+
+    Every cut is made right after a newline the lexer turns into a NEWLINE
+    token, never inside a string literal, so the pieces tokenize and parse to
+    exactly the tokens and statements of the whole source. Sources without
+    such newlines (e.g. with `\\r\\n` line endings, where `\\r` starts a SKIP
+    run) come back in one piece.
+    '''
+    length = len(source_code)
+    cuts, position = [0], 0
+    for part in range(1, parts):
+        target = length * part // parts
+        # Skip string literals opening before the target; only the positions
+        # of quotes are visited, the text in between is searched by `re`
+        while position < target and (
+            quote := QUOTE.search(source_code, position, target)
+        ):
+            string = STRING.match(source_code, quote.start())
+            # An unterminated quote is a lone MISMATCH character
+            position = string.end() if string else quote.end()
+        position = max(position, target)
+
+        while match := SPLIT_POINT.search(source_code, position):
+            if match.group() == "\n":
+                position = match.end()
+                break
+            string = STRING.match(source_code, match.start())
+            position = string.end() if string else match.end()
+        else:
+            break
+        if position < length:
+            cuts.append(position)
+    cuts.append(length)
+    return [source_code[start:end] for start, end in zip(cuts, cuts[1:])]
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    '''Suspend the cyclic garbage collector.
+
+    Building millions of acyclic nodes (by parsing or by unpickling) triggers
+    a collection every few hundred allocations, each scanning every node built
+    so far. Unpickling the statements of a large source is ~10x slower with
+    the collector running.
+    '''
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _share_equal_tokens(tokens: Sequence[Token]) -> list[Token]:
+    '''Replace equal tokens by a single shared instance.
+
+    Pickle sends a shared object once and back-references it afterwards, so
+    this halves the size of the pickled statements and the time the parent
+    spends rebuilding them (which is the part that does not run in parallel).
+    '''
+    shared: dict[Token, Token] = {}
+    return [shared.setdefault(token, token) for token in tokens]
+
+
+def _parse_chunk(
+    chunk: str, lexer: str, parser: str, share_nodes: bool = False
+) -> tuple[int, list[Statement] | Exception, int]:
+    # Errors are returned rather than raised, so the caller can tell lexing
+    # errors (which the serial path reports first) from parsing errors. The
+    # last item is the number of tokens.
+    with gc_paused():
+        try:
+            tokens = _share_equal_tokens(LEXERS[lexer](chunk))
+        except SyntaxError as error:
+            return LEXING_FAILED, error, 0
+        try:
+            nodes = HashConsingNodeFactory() if share_nodes else None
+            statements = PARSERS[parser](tokens, nodes).parse().statements
+            return PARSED, statements, len(tokens)
+        except Exception as error:
+            return PARSING_FAILED, error, len(tokens)
+
+
+def parse_parallel(
+    source_code: str,
+    workers: int | None = None,
+    lexer: str = "regex",
+    parser: str = "recursive",
+    min_chunk_size: int = MIN_CHUNK_SIZE,
+    share_nodes: bool = False
+) -> Program:
+    '''Lex and parse `source_code` on up to `workers` processes.
+
+    `workers` defaults to the number of CPUs. Sources too small to be worth
+    splitting are parsed in this process. With `share_nodes`, equal subtrees
+    are shared within each chunk.
+    '''
+    return parse_parallel_counted(
+        source_code, workers, lexer, parser, min_chunk_size, share_nodes
+    )[0]
+
+
+def parse_parallel_counted(
+    source_code: str,
+    workers: int | None = None,
+    lexer: str = "regex",
+    parser: str = "recursive",
+    min_chunk_size: int = MIN_CHUNK_SIZE,
+    share_nodes: bool = False
+) -> tuple[Program, int]:
+    '''`parse_parallel`, also returning the number of tokens in all chunks.'''
+    workers = workers or os.cpu_count() or 1
+    parts = min(workers * CHUNKS_PER_WORKER, len(source_code) // min_chunk_size)
+    chunks = split_source(source_code, parts) if workers > 1 else [source_code]
+    if len(chunks) <= 1:
+        results = [_parse_chunk(source_code, lexer, parser, share_nodes)]
+    else:
+        # Results are unpickled here, on a pool thread: pause collection for
+        # the whole process, not just this thread
+        with gc_paused(), ProcessPoolExecutor(min(workers, len(chunks))) as pool:
+            results = list(pool.map(
+                _parse_chunk, chunks, repeat(lexer), repeat(parser),
+                repeat(share_nodes)
+            ))
+
+    # The serial path tokenizes everything before parsing anything
+    for failure in (LEXING_FAILED, PARSING_FAILED):
+        for outcome, result, _ in results:
+            if outcome == failure:
+                raise result
+    program = Program([
+        statement for _, statements, _ in results for statement in statements
+    ])
+    return program, sum(tokens for _, _, tokens in results)
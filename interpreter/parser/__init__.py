@@ -1,6 +1,9 @@
 # interpreter/parser/__init__.py
 
-from .parser import Parser
+from .nodes import HashConsingNodeFactory, NodeFactory
+from .parser import Parser, iter_statements
+from .pratt import PARSERS, PrattParser
+from .arena import Arena, NodeKind, parse_arena
 
 """
 Parser package for interpreting tokenized source code.
@@ -10,7 +13,14 @@ which represents the structure of the source code.
 
 Modules:
     - parser.py: Contains the `Parser` class, which parses tokens into an AST.
+    - pratt.py: Contains `PrattParser`, an iterative, table-driven parser producing the same AST
+      without recursion, so very long expressions and deeply nested calls never hit Python's
+      recursion limit. `PARSERS` maps names to both parsers.
     - ast.py: Defines the AST structure, including nodes like `Program`, `Statement`, and `Expression`.
+    - nodes.py: `NodeFactory`, through which both parsers build their nodes, and
+      `HashConsingNodeFactory`, which shares equal subtrees so the AST becomes a DAG.
+    - arena.py: `Arena`, a flat AST whose nodes are indices into parallel typed arrays,
+      with converters from and to the dataclass AST and `parse_arena` to parse into one.
 
 Usage:
     To use the parser, instantiate the `Parser` class with a list of tokens and call its `parse()` method:
@@ -24,6 +34,25 @@ Usage:
 
     The resulting `program` is an AST that represents the source code.
 
+    `PrattParser(tokens).parse()` is a drop-in replacement, roughly twice as fast on large inputs.
+
+    To share equal subtrees (every `x`, every `1`, every repeated `x + 1`) pass a
+    `HashConsingNodeFactory` to either parser:
+
+    program = Parser(tokens, HashConsingNodeFactory()).parse()
+
+    For very large programs, `parse_arena(tokens)` builds an `Arena` instead, which the
+    bytecode and closure compilers (and `ConstantFolding.run_arena`) walk directly:
+
+    arena = parse_arena(tokens, PrattParser)
+    program = arena.to_program()  # back to dataclass nodes, e.g. for `Optimizer`
+
+    To parse lazily, `iter_statements` takes any iterable of tokens (e.g. from
+    `iter_tokens`) and yields statements line by line:
+
+    for statement in iter_statements(iter_tokens(source_file)):
+        ...
+
 Error Handling:
     Syntax errors encountered during parsing will raise `SyntaxError` exceptions with helpful messages.
 
@@ -0,0 +1,334 @@
+# intepreter/parser/arena.py
+
+from array import array
+from collections.abc import Iterator, Sequence
+from enum import IntEnum
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Literal, Program,
+    Statement, Variable
+)
+from ..lexer.tokenizer import Token, TokenCategory
+from .parser import OPERATOR_PRECEDENCE, Parser
+
+# Operator lexemes in the order used by the `operator` column
+OPERATORS = tuple(OPERATOR_PRECEDENCE)
+_OPERATOR_CODES = {lexeme: code for code, lexeme in enumerate(OPERATORS)}
+PLUS = _OPERATOR_CODES['+']
+
+
+class NodeKind(IntEnum):
+    ASSIGNMENT = 1
+    BINARY = 2
+    CALL = 3
+    VARIABLE = 4
+    LITERAL = 5
+
+
+ASSIGNMENT = NodeKind.ASSIGNMENT.value
+BINARY = NodeKind.BINARY.value
+CALL = NodeKind.CALL.value
+VARIABLE = NodeKind.VARIABLE.value
+LITERAL = NodeKind.LITERAL.value
+
+
+class Arena:
+    '''Flat AST: every node is an index into parallel typed arrays.
+
+    Per node, `kind` holds its `NodeKind` and the other columns mean:
+
+        kind        left            right         operator   value
+        ASSIGNMENT  expression      -             -          names index
+        BINARY      left operand    right operand code       -
+        CALL        children start  children end  -          names index
+        VARIABLE    -               -             -          names index
+        LITERAL     -               -             -          constants index
+
+    Call arguments are the range `children[left:right]` of one shared index
+    array, and `statements` lists the root of every statement. Names (as
+    tokens) and literal values are stored once each in `names`/`constants`.
+    Children are always added before their parent, so every child index is
+    smaller than its parent's: a single forward loop visits a program
+    bottom-up, with no recursion and no stack.
+
+    The builder methods have the same signatures as `NodeFactory`, so either
+    parser can build an arena directly (see `parse_arena`).
+
+    Usage:
+        arena = Arena.from_program(program)      # or parse_arena(tokens)
+        VirtualMachine().execute(arena)
+        assert arena.to_program() == program
+    '''
+
+    __slots__ = (
+        "kind", "left", "right", "operator", "value", "children", "statements",
+        "names", "constants", "_name_indices", "_constant_indices"
+    )
+
+    def __init__(self):
+        self.kind = array('B')
+        self.left = array('I')
+        self.right = array('I')
+        self.operator = array('B')
+        self.value = array('I')
+        self.children = array('I')
+        self.statements = array('I')
+        self.names: list[Token] = []
+        self.constants: list[int | str] = []
+        self._name_indices: dict[Token, int] = {}
+        # Keyed on the type too so that e.g. 1 and True never share an entry
+        self._constant_indices: dict[tuple[type, int | str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    @property
+    def nbytes(self) -> int:
+        '''Bytes held by the node columns and the children/statement arrays.'''
+        columns = (
+            self.kind, self.left, self.right, self.operator, self.value,
+            self.children, self.statements
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def _add(
+        self, kind: int, left: int = 0, right: int = 0, operator: int = 0,
+        value: int = 0
+    ) -> int:
+        self.kind.append(kind)
+        self.left.append(left)
+        self.right.append(right)
+        self.operator.append(operator)
+        self.value.append(value)
+        return len(self.kind) - 1
+
+    def _name(self, token: Token) -> int:
+        index = self._name_indices.get(token)
+        if index is None:
+            index = self._name_indices[token] = len(self.names)
+            self.names.append(token)
+        return index
+
+    def _constant(self, value: int | str) -> int:
+        key = (type(value), value)
+        index = self._constant_indices.get(key)
+        if index is None:
+            index = self._constant_indices[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+    # Builders, in `NodeFactory` form; each returns the new node's index
+
+    def assignment(self, identifier: str, expression: int) -> int:
+        token = Token(TokenCategory.IDENTIFIER, identifier)
+        return self._add(ASSIGNMENT, left=expression, value=self._name(token))
+
+    def binary(self, left: int, operator: Token, right: int) -> int:
+        try:
+            code = _OPERATOR_CODES[operator.lexeme]
+        except KeyError:
+            raise SyntaxError(f"Unsupported operator {operator.lexeme!r}") from None
+        return self._add(BINARY, left, right, code)
+
+    def call(self, name: Token, arguments: Sequence[int]) -> int:
+        return self._add_call(self._name(name), arguments)
+
+    def _add_call(self, name: int, arguments: Sequence[int]) -> int:
+        start = len(self.children)
+        self.children.extend(arguments)
+        return self._add(CALL, start, len(self.children), value=name)
+
+    def variable(self, name: Token) -> int:
+        return self._add(VARIABLE, value=self._name(name))
+
+    def literal(self, value: int | str) -> int:
+        return self._add(LITERAL, value=self._constant(value))
+
+    # Accessors
+
+    def name(self, index: int) -> str:
+        '''Identifier of an assignment, variable or call node.'''
+        return self.names[self.value[index]].lexeme
+
+    def arguments(self, index: int) -> array:
+        return self.children[self.left[index]:self.right[index]]
+
+    def add_operands(self, index: int) -> list[int]:
+        '''Operands of the `+` chain rooted at `index`, like `add_operands`.'''
+        kind, left, right, operator = self.kind, self.left, self.right, self.operator
+        operands = []
+        while kind[index] == BINARY and operator[index] == PLUS:
+            operands.append(right[index])
+            index = left[index]
+        operands.append(index)
+        operands.reverse()
+        return operands
+
+    def operator_chain(self, index: int) -> tuple[int, list[tuple[str, int]]]:
+        '''The left spine of the chain rooted at `index`, like `operator_chain`.'''
+        kind, left, right, operator = self.kind, self.left, self.right, self.operator
+        steps = []
+        while kind[index] == BINARY:
+            steps.append((OPERATORS[operator[index]], right[index]))
+            index = left[index]
+        steps.reverse()
+        return index, steps
+
+    def walk(self, index: int) -> Iterator[int]:
+        '''Yield `index` and every node below it, in the same order as `walk`.'''
+        kind, left, right, children = self.kind, self.left, self.right, self.children
+        pending = [index]
+        while pending:
+            index = pending.pop()
+            yield index
+            match kind[index]:
+                case NodeKind.ASSIGNMENT:
+                    pending.append(left[index])
+                case NodeKind.BINARY:
+                    pending.append(right[index])
+                    pending.append(left[index])
+                case NodeKind.CALL:
+                    pending.extend(reversed(children[left[index]:right[index]]))
+
+    # Conversions
+
+    @classmethod
+    def from_program(cls, program: Program) -> "Arena":
+        '''Flatten a dataclass AST; subtrees shared in it stay shared here.'''
+        arena = cls()
+        indices: dict[int, int] = {}
+        for statement in program.statements:
+            arena.statements.append(arena._flatten(statement, indices))
+        return arena
+
+    def _flatten(self, root: Statement, indices: dict[int, int]) -> int:
+        # Iterative post-order: a node is added once all its children have been
+        pending: list[tuple[Statement, bool]] = [(root, False)]
+        while pending:
+            node, ready = pending.pop()
+            if id(node) in indices:
+                continue
+            match node:
+                case Literal():
+                    index = self.literal(node.value)
+                case Variable():
+                    index = self.variable(node.name)
+                case _ if not ready:
+                    pending.append((node, True))
+                    pending.extend((child, False) for child in _children(node))
+                    continue
+                case Assignment():
+                    index = self.assignment(
+                        node.identifier, indices[id(node.expression)]
+                    )
+                case BinaryExpression():
+                    index = self.binary(
+                        indices[id(node.left)], node.operator,
+                        indices[id(node.right)]
+                    )
+                case FunctionCall():
+                    index = self.call(
+                        node.name, [indices[id(a)] for a in node.arguments]
+                    )
+                case _:
+                    raise TypeError(f"Cannot flatten {node}")
+            indices[id(node)] = index
+        return indices[id(root)]
+
+    def to_program(self) -> Program:
+        '''Rebuild the dataclass AST; shared indices become shared nodes.'''
+        nodes: list[Statement] = []
+        append = nodes.append
+        kind, left, right, value = self.kind, self.left, self.right, self.value
+        operator, names, constants = self.operator, self.names, self.constants
+        operators = [Token(TokenCategory.OPERATOR, lexeme) for lexeme in OPERATORS]
+        children = self.children
+        # Children come first, so every node's children are already built
+        for index in range(len(kind)):
+            match kind[index]:
+                case NodeKind.ASSIGNMENT:
+                    append(Assignment(names[value[index]].lexeme, nodes[left[index]]))
+                case NodeKind.BINARY:
+                    append(BinaryExpression(
+                        nodes[left[index]], operators[operator[index]],
+                        nodes[right[index]]
+                    ))
+                case NodeKind.CALL:
+                    append(FunctionCall(names[value[index]], [
+                        nodes[child] for child in children[left[index]:right[index]]
+                    ]))
+                case NodeKind.VARIABLE:
+                    append(Variable(names[value[index]]))
+                case NodeKind.LITERAL:
+                    append(Literal(constants[value[index]]))
+        return Program([nodes[index] for index in self.statements])
+
+    def rewritten(self, literals: dict[int, int | str]) -> "Arena":
+        '''Copy of the reachable nodes, with `literals` replacing some subtrees.
+
+        Each key of `literals` is a node index and each value the literal value
+        (as stored in `Literal.value`) taking that node's place. Nodes no longer
+        reachable from any statement are dropped.
+        '''
+        arena = Arena()
+        arena.names = self.names.copy()
+        arena._name_indices = self._name_indices.copy()
+        kind, left, right, children = self.kind, self.left, self.right, self.children
+        indices: dict[int, int] = {}
+        for root in self.statements:
+            pending = [(root, False)]
+            while pending:
+                index, ready = pending.pop()
+                if index in indices:
+                    continue
+                if index in literals:
+                    indices[index] = arena.literal(literals[index])
+                    continue
+                node_kind = kind[index]
+                if node_kind == CALL:
+                    arguments = children[left[index]:right[index]]
+                elif node_kind == BINARY:
+                    arguments = (left[index], right[index])
+                elif node_kind == ASSIGNMENT:
+                    arguments = (left[index],)
+                else:
+                    arguments = ()
+                if arguments and not ready:
+                    pending.append((index, True))
+                    pending.extend((child, False) for child in reversed(arguments))
+                    continue
+                if node_kind == LITERAL:
+                    new = arena.literal(self.constants[self.value[index]])
+                elif node_kind == CALL:
+                    new = arena._add_call(
+                        self.value[index], [indices[child] for child in arguments]
+                    )
+                else:
+                    new = arena._add(
+                        node_kind, *(indices[child] for child in arguments),
+                        operator=self.operator[index], value=self.value[index]
+                    )
+                indices[index] = new
+            arena.statements.append(indices[root])
+        return arena
+
+
+def _children(node: Statement) -> list[Expression]:
+    '''Children of a compound node, last first (the order they are popped in).'''
+    match node:
+        case Assignment():
+            return [node.expression]
+        case BinaryExpression():
+            return [node.right, node.left]
+        case FunctionCall():
+            return node.arguments[::-1]
+    return []
+
+
+def parse_arena(tokens: list[Token], parser: type = Parser) -> Arena:
+    '''Parse straight into an `Arena`, never building dataclass nodes.
+
+    `parser` is `Parser` or `PrattParser`.
+    '''
+    arena = Arena()
+    arena.statements.extend(parser(tokens, arena).parse().statements)
+    return arena
@@ -17,6 +17,7 @@ literal            ::= TokenCategory.NUMBER
 '''
 
 from abc import ABC
+from collections.abc import Iterator
 from dataclasses import dataclass
 from ..lexer.tokenizer import Token
 
@@ -54,4 +55,57 @@ class Variable(Expression):
 
 @dataclass(frozen=True)
 class Literal(Expression):
-    value: int | str
\ No newline at end of file
+    value: int | str
+
+def walk(node: Program | Statement) -> Iterator[Program | Statement]:
+    '''Yield `node` and every node below it (iteratively, in pre-order).'''
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        yield node
+        match node:
+            case Program():
+                pending.extend(reversed(node.statements))
+            case Assignment():
+                pending.append(node.expression)
+            case BinaryExpression():
+                pending.append(node.right)
+                pending.append(node.left)
+            case FunctionCall():
+                pending.extend(reversed(node.arguments))
+
+
+def same_tree(left: Statement, right: Statement) -> bool:
+    '''`left == right`, compared iteratively so that deep trees never recurse.'''
+    pending = [(left, right)]
+    while pending:
+        left, right = pending.pop()
+        if left is right:
+            continue
+        if type(left) is not type(right):
+            return False
+        match left:
+            case Assignment():
+                if left.identifier != right.identifier:
+                    return False
+                pending.append((left.expression, right.expression))
+            case BinaryExpression():
+                if left.operator != right.operator:
+                    return False
+                pending.append((left.right, right.right))
+                pending.append((left.left, right.left))
+            case FunctionCall():
+                if (
+                    left.name != right.name
+                    or len(left.arguments) != len(right.arguments)
+                ):
+                    return False
+                pending.extend(zip(left.arguments, right.arguments))
+            case _:
+                if left != right:
+                    return False
+    return True
+
+
+def count_nodes(node: Program | Statement) -> int:
+    return sum(1 for _ in walk(node))
@@ -0,0 +1,100 @@
+# intepreter/parser/nodes.py
+
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, Expression, FunctionCall, Literal, Statement,
+    Variable
+)
+from ..lexer.tokenizer import Token
+
+# Entries a hash-consing table holds before it stops growing
+DEFAULT_MAX_NODES = 1 << 20
+
+
+class NodeFactory:
+    '''Builds the AST nodes for `Parser` and `PrattParser`.
+
+    This default factory allocates a new node every time; its methods are the
+    node classes themselves, so using it costs nothing over calling them.
+    '''
+
+    assignment = Assignment
+    binary = BinaryExpression
+    call = FunctionCall
+    variable = Variable
+    literal = Literal
+
+
+class HashConsingNodeFactory(NodeFactory):
+    '''Node factory returning one shared node per distinct subtree.
+
+    Nodes are built bottom-up, so the children of a node are already shared
+    by the time it is built: a node is identified by its type, its own fields
+    and the identities of its children, which makes every lookup O(1). The
+    AST becomes a DAG in which equal subtrees are the very same object, e.g.
+    every `x`, every `1` and every repeated `x + 1`.
+
+    Use one factory per parse; the table is dropped with it. Once the table
+    holds `max_size` nodes it stops growing, and new subtrees are then built
+    without being shared.
+
+    Usage:
+        factory = HashConsingNodeFactory()
+        program = Parser(tokens, factory).parse()
+        print(factory.hits, len(factory))
+    '''
+
+    def __init__(self, max_size: int = DEFAULT_MAX_NODES):
+        # Keys hold the ids of children; each entry's node keeps those alive
+        self.table: dict[tuple, Statement] = {}
+        self.max_size = max_size
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def _shared(self, key: tuple, node: Statement) -> Statement:
+        if len(self.table) < self.max_size:
+            self.table[key] = node
+        return node
+
+    def assignment(self, identifier: str, expression: Expression) -> Assignment:
+        key = (Assignment, identifier, id(expression))
+        node = self.table.get(key)
+        if node is None:
+            return self._shared(key, Assignment(identifier, expression))
+        self.hits += 1
+        return node
+
+    def binary(
+        self, left: Expression, operator: Token, right: Expression
+    ) -> BinaryExpression:
+        key = (BinaryExpression, id(left), operator, id(right))
+        node = self.table.get(key)
+        if node is None:
+            return self._shared(key, BinaryExpression(left, operator, right))
+        self.hits += 1
+        return node
+
+    def call(self, name: Token, arguments: list[Expression]) -> FunctionCall:
+        key = (FunctionCall, name, *map(id, arguments))
+        node = self.table.get(key)
+        if node is None:
+            return self._shared(key, FunctionCall(name, arguments))
+        self.hits += 1
+        return node
+
+    def variable(self, name: Token) -> Variable:
+        key = (Variable, name)
+        node = self.table.get(key)
+        if node is None:
+            return self._shared(key, Variable(name))
+        self.hits += 1
+        return node
+
+    def literal(self, value: int | str) -> Literal:
+        key = (Literal, value)
+        node = self.table.get(key)
+        if node is None:
+            return self._shared(key, Literal(value))
+        self.hits += 1
+        return node
@@ -1,10 +1,12 @@
 # intepreter/parser/parser.py
 
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from interpreter.parser.ast import (
-    BinaryExpression, FunctionCall, Program, Statement,
-    Assignment, Expression, Literal, Variable
+    FunctionCall, Program, Statement, Assignment, Expression, Literal, Variable
 )
+from ..lexer.token_buffer import CATEGORIES, TokenBuffer
 from ..lexer.tokenizer import Token, TokenCategory
+from .nodes import NodeFactory
 
 # Define operator precedence levels
 OPERATOR_PRECEDENCE = {
@@ -18,10 +20,44 @@ OPERATOR_PRECEDENCE = {
     '||': 0, # Logical OR
 }
 
+# Category values the parser compares against
+IDENTIFIER = TokenCategory.IDENTIFIER.value
+KEYWORD = TokenCategory.KEYWORD.value
+STRING = TokenCategory.STRING.value
+NUMBER = TokenCategory.NUMBER.value
+OPERATOR = TokenCategory.OPERATOR.value
+OPEN_PAREN = TokenCategory.OPEN_PAREN.value
+CLOSE_PAREN = TokenCategory.CLOSE_PAREN.value
+COMMA = TokenCategory.COMMA.value
+NEWLINE = TokenCategory.NEWLINE.value
+
+
+def token_columns(
+    tokens: Sequence[Token]
+) -> tuple[Sequence[int], Callable[[int], int | str]]:
+    '''Category values of `tokens`, and a function giving a token's lexeme.
+
+    The parsers decide everything from these and only index `tokens` for the
+    tokens the AST keeps (names and operators). A `TokenBuffer` serves both
+    straight from its arrays, so no `Token` is built for any other token.
+    '''
+    if isinstance(tokens, TokenBuffer):
+        return tokens.categories, tokens.lexeme
+    return (
+        [token.category._value_ for token in tokens],
+        lambda index: tokens[index].lexeme
+    )
+
+
 class Parser:
-    def __init__(self, tokens: list[Token]):
+    def __init__(self, tokens: list[Token], nodes: NodeFactory | None = None):
         self.tokens = tokens
+        self.categories, self.lexeme = token_columns(tokens)
         self.current_token_idx = 0
+        # Builds every node, e.g. a `HashConsingNodeFactory` to share subtrees
+        self.nodes = nodes if nodes is not None else NodeFactory()
+        # Index of the first token of every statement, e.g. for line numbers
+        self.statement_starts: list[int] = []
     
     def parse(self) -> Program:
         statements = []
@@ -30,6 +66,7 @@ class Parser:
         self._skip_newlines()
 
         while self.current_token_idx < len(self.tokens):
+            self.statement_starts.append(self.current_token_idx)
             statements.append(self._parse_statement())
             self._skip_newlines()  # Consume empty lines between statements
 
@@ -37,26 +74,28 @@ class Parser:
 
     def _parse_statement(self) -> Statement:
         if (
-            self._current_token().category == TokenCategory.IDENTIFIER 
-            and self._peek_next_token().lexeme == '='
+            self._current_category() == IDENTIFIER
+            and self._peek_next_category() is not None
+            and self.lexeme(self.current_token_idx + 1) == '='
         ):
             return self._parse_assignment()
         return self._parse_expression()
     
     def _parse_assignment(self) -> Assignment:
         ''' Assignment: IDENTIFIER '=' expression '''
-        identifier_token = self._consume(TokenCategory.IDENTIFIER)
-        operator_token = self._consume(TokenCategory.OPERATOR)
+        identifier = self._consume(TokenCategory.IDENTIFIER)
+        operator = self._consume(TokenCategory.OPERATOR)
 
         # Error handling for incorrect operator token lexeme
-        if operator_token.lexeme != '=':
+        if self.lexeme(operator) != '=':
             raise SyntaxError(
                 "Could not parse assignment. Expected '=' operator but got"
-                f"{operator_token}"
+                f"{self.tokens[operator]}"
                 )
 
         expression = self._parse_expression()
-        return Assignment(identifier_token.lexeme, expression)
+        # The token's lexeme, which lexers intern, rather than a fresh slice
+        return self.nodes.assignment(self.tokens[identifier].lexeme, expression)
 
     def _parse_expression(self) -> Expression:
         return self._parse_binary_expression()
@@ -67,42 +106,38 @@ class Parser:
 
         # Keep going as long as we find operators with precedence >= min_precedence
         while (
-            self._current_token() and
-            self._current_token().category == TokenCategory.OPERATOR and
-            self.get_precedence(self._current_token().lexeme) >= min_precedence
+            self._current_category() == OPERATOR and
+            self.get_precedence(self.lexeme(self.current_token_idx)) >= min_precedence
         ):
-            operator = self._current_token()
-            current_precedence = self.get_precedence(operator.lexeme)
+            current_precedence = self.get_precedence(self.lexeme(self.current_token_idx))
             
             # Consume the operator
-            self._consume(TokenCategory.OPERATOR)
+            operator = self.tokens[self._consume(TokenCategory.OPERATOR)]
             
             # Parse the right side with a higher precedence to ensure proper associativity
             right = self._parse_binary_expression(current_precedence + 1)
             
             # Create a new binary expression
-            left = BinaryExpression(left=left, operator=operator, right=right)
+            left = self.nodes.binary(left, operator, right)
         
         return left
 
     def _parse_primary_expression(self) -> Expression:
         '''Parse primary expressions (literals, variables, function calls)'''
-        match self._current_token().category:
-            case TokenCategory.KEYWORD:
-                return self._parse_function_call(True)
-            case TokenCategory.IDENTIFIER:
-                if (
-                    self._peek_next_token() and
-                    self._peek_next_token().category == TokenCategory.OPEN_PAREN
-                ):
-                    return self._parse_function_call(False)
-                return self._parse_variable()
-            case TokenCategory.STRING:
-                return self._parse_string_literal()
-            case TokenCategory.NUMBER:
-                return self._parse_numeric_literal()
-            case _:
-                raise SyntaxError(f"Unexpected token {self._current_token()}")
+        category = self._current_category()
+        if category is None:
+            raise SyntaxError("Unexpected end of input, expected an expression")
+        if category == KEYWORD:
+            return self._parse_function_call(True)
+        if category == IDENTIFIER:
+            if self._peek_next_category() == OPEN_PAREN:
+                return self._parse_function_call(False)
+            return self._parse_variable()
+        if category == STRING:
+            return self._parse_string_literal()
+        if category == NUMBER:
+            return self._parse_numeric_literal()
+        raise SyntaxError(f"Unexpected token {self.tokens[self.current_token_idx]}")
         
     def get_precedence(self, operator: str) -> int:
         return OPERATOR_PRECEDENCE.get(operator, -1)  # Default -1 for unknown operators
@@ -114,58 +149,84 @@ class Parser:
         self._consume(TokenCategory.OPEN_PAREN)
         arguments = self._parse_arguments()
         self._consume(TokenCategory.CLOSE_PAREN)
-        return FunctionCall(function_name, arguments)
+        return self.nodes.call(self.tokens[function_name], arguments)
 
     def _parse_arguments(self) -> list[Expression]:
         # Parse list of arguments
         arguments = []
-        while self._current_token().category != TokenCategory.CLOSE_PAREN:
+        while self._current_category() != CLOSE_PAREN:
             arguments.append(self._parse_expression())
-            if self._current_token().category == TokenCategory.COMMA:
+            if self._current_category() == COMMA:
                 self._consume(TokenCategory.COMMA)
         return arguments
 
     def _parse_variable(self) -> Variable:
-        token = self._consume(TokenCategory.IDENTIFIER)
-        return Variable(token)
+        index = self._consume(TokenCategory.IDENTIFIER)
+        return self.nodes.variable(self.tokens[index])
     
     def _parse_string_literal(self) -> Literal:
-        token = self._consume(TokenCategory.STRING)
-        return Literal(token.lexeme)
+        index = self._consume(TokenCategory.STRING)
+        return self.nodes.literal(self.lexeme(index))
 
     def _parse_numeric_literal(self) -> Literal:
-        token = self._consume(TokenCategory.NUMBER)
-        return Literal(int(token.lexeme))
+        index = self._consume(TokenCategory.NUMBER)
+        return self.nodes.literal(int(self.lexeme(index)))
 
-    def _current_token(self) -> Token:
+    def _current_category(self) -> int | None:
         return (
-            self.tokens[self.current_token_idx]
-            if self.current_token_idx < len(self.tokens)
+            self.categories[self.current_token_idx]
+            if self.current_token_idx < len(self.categories)
             else None
         )
     
-    def _peek_next_token(self) -> Token:
+    def _peek_next_category(self) -> int | None:
         return (
-            self.tokens[self.current_token_idx + 1]
-            if self.current_token_idx + 1 < len(self.tokens)
+            self.categories[self.current_token_idx + 1]
+            if self.current_token_idx + 1 < len(self.categories)
             else None
         )
     
-    def _consume(
-            self, expected_token_category: TokenCategory
-    ) -> Token | None:
-        token = self.tokens[self.current_token_idx]
-        if token.category != expected_token_category:
+    def _consume(self, expected_token_category: TokenCategory) -> int:
+        '''Consume a token of the given category and return its index.'''
+        if self.current_token_idx >= len(self.categories):
+            raise SyntaxError(
+                f"Expected {expected_token_category}, but reached the end of input"
+            )
+        index = self.current_token_idx
+        category = self.categories[index]
+        if category != expected_token_category._value_:
             raise SyntaxError(
                 f"Expected {expected_token_category}"
-                f", but got {token.category}"
+                f", but got {CATEGORIES[category]}"
             )
         self.current_token_idx += 1
-        return token
+        return index
     
     def _skip_newlines(self):
-        while (
-            self._current_token() and 
-            self._current_token().category == TokenCategory.NEWLINE
-        ):
-            self._consume(TokenCategory.NEWLINE)
\ No newline at end of file
+        while self._current_category() == NEWLINE:
+            self._consume(TokenCategory.NEWLINE)
+
+
+def iter_statements(
+    tokens: Iterable[Token], parser: type = Parser
+) -> Iterator[Statement]:
+    '''Parse a (possibly lazy) token stream one logical line at a time.
+
+    Statements never span a NEWLINE token, so each line is parsed as soon as
+    its NEWLINE arrives and its statements are yielded right away. Only the
+    tokens of the current line are held in memory. `parser` is any class
+    taking a token list, e.g. `Parser` or `PrattParser`.
+    '''
+    line: list[Token] = []
+    for token in tokens:
+        if token.category == TokenCategory.NEWLINE:
+            if line:
+                # Keep the NEWLINE so an incomplete line fails on it exactly
+                # as it does when the whole source is parsed at once
+                line.append(token)
+                yield from parser(line).parse().statements
+                line = []
+        else:
+            line.append(token)
+    if line:
+        yield from parser(line).parse().statements
@@ -0,0 +1,209 @@
+# intepreter/parser/pratt.py
+
+from collections.abc import Callable, Sequence
+from interpreter.parser.ast import Expression, Program, Statement
+from ..lexer.tokenizer import Token, TokenCategory
+from .nodes import NodeFactory
+from ..lexer.token_buffer import CATEGORIES
+from .parser import OPERATOR_PRECEDENCE, Parser, token_columns
+
+# Prefix actions: what a token means where an operand is expected
+LITERAL, NUMBER, NAME, CALL = range(4)
+PREFIX_ACTIONS = {
+    TokenCategory.STRING: LITERAL,
+    TokenCategory.NUMBER: NUMBER,
+    TokenCategory.IDENTIFIER: NAME,
+    TokenCategory.KEYWORD: CALL,
+}
+
+# Infix actions: what a token means after a complete operand
+BINARY, ARGUMENT_END = range(2, 4)
+INFIX_ACTIONS = {
+    TokenCategory.OPERATOR: BINARY,
+    TokenCategory.COMMA: ARGUMENT_END,
+    TokenCategory.CLOSE_PAREN: ARGUMENT_END,
+}
+
+
+def _by_value(actions: dict[TokenCategory, int]) -> list[int | None]:
+    '''Flatten a table into a list indexed by category value.
+
+    Hashing an Enum member runs Python code, indexing a list by its `_value_`
+    does not, and this lookup happens once per token.
+    '''
+    table: list[int | None] = [None] * (max(c._value_ for c in TokenCategory) + 1)
+    for category, action in actions.items():
+        table[category._value_] = action
+    return table
+
+
+PREFIX_TABLE = _by_value(PREFIX_ACTIONS)
+INFIX_TABLE = _by_value(INFIX_ACTIONS)
+
+
+class _Frame:
+    '''Operand and operator stacks of one expression being parsed.
+
+    Every function call argument gets its own frame, so nested calls only grow
+    the frame list, never the Python call stack.
+    '''
+    __slots__ = ("operands", "operators", "call", "arguments", "binary")
+
+    def __init__(self, binary: Callable, call: Token | None = None):
+        self.binary = binary
+        self.operands: list[Expression] = []
+        self.operators: list[tuple[int, Token]] = []
+        self.call = call
+        self.arguments: list[Expression] = []
+
+    def reduce(self, precedence: int) -> None:
+        '''Fold pending operators binding at least as tightly as `precedence`.'''
+        operands, operators = self.operands, self.operators
+        while operators and operators[-1][0] >= precedence:
+            _, operator = operators.pop()
+            right = operands.pop()
+            operands[-1] = self.binary(operands[-1], operator, right)
+
+
+class PrattParser:
+    '''Iterative, table-driven parser producing the same AST as `Parser`.
+
+    Expressions are parsed with explicit operand/operator stacks and dispatch
+    tables keyed by `TokenCategory`, so arbitrarily long expressions and deeply
+    nested calls parse in linear time with constant Python stack depth. Like
+    `Parser`, it reads categories and lexemes through `token_columns`.
+
+    Usage:
+        program = PrattParser(tokens).parse()
+    '''
+
+    def __init__(self, tokens: Sequence[Token], nodes: NodeFactory | None = None):
+        self.tokens = tokens
+        self.categories, self.lexeme = token_columns(tokens)
+        self.current_token_idx = 0
+        self.nodes = nodes if nodes is not None else NodeFactory()
+        self.statement_starts: list[int] = []
+
+    def parse(self) -> Program:
+        categories, statements = self.categories, []
+        length = len(categories)
+        newline = TokenCategory.NEWLINE._value_
+
+        while self.current_token_idx < length:
+            if categories[self.current_token_idx] == newline:
+                self.current_token_idx += 1
+                continue
+            self.statement_starts.append(self.current_token_idx)
+            statements.append(self._parse_statement())
+
+        return Program(statements)
+
+    def _parse_statement(self) -> Statement:
+        categories, index = self.categories, self.current_token_idx
+        if (
+            categories[index] == TokenCategory.IDENTIFIER._value_
+            and index + 1 < len(categories)
+            and self.lexeme(index + 1) == '='
+        ):
+            operator = categories[index + 1]
+            if operator != TokenCategory.OPERATOR._value_:
+                raise SyntaxError(
+                    f"Expected {TokenCategory.OPERATOR}, but got {CATEGORIES[operator]}"
+                )
+            self.current_token_idx = index + 2
+            # The token's lexeme, which lexers intern, rather than a fresh slice
+            identifier = self.tokens[index].lexeme
+            return self.nodes.assignment(identifier, self._parse_expression())
+        return self._parse_expression()
+
+    def _parse_expression(self) -> Expression:
+        tokens, index = self.tokens, self.current_token_idx
+        categories, lexeme = self.categories, self.lexeme
+        length = len(categories)
+        precedences = OPERATOR_PRECEDENCE
+        prefix_table, infix_table = PREFIX_TABLE, INFIX_TABLE
+        open_paren = TokenCategory.OPEN_PAREN._value_
+        close_paren = TokenCategory.CLOSE_PAREN._value_
+        nodes = self.nodes
+        variable, literal, call = nodes.variable, nodes.literal, nodes.call
+        frames = [_Frame(nodes.binary)]
+        frame = frames[0]
+        operands, operators = frame.operands, frame.operators
+
+        while True:
+            # Prefix position: an operand is expected
+            if index >= length:
+                raise SyntaxError("Unexpected end of input, expected an expression")
+            action = prefix_table[categories[index]]
+            if action == NAME and not (
+                index + 1 < length and categories[index + 1] == open_paren
+            ):
+                operands.append(variable(tokens[index]))
+                index += 1
+            elif action == NUMBER:
+                operands.append(literal(int(lexeme(index))))
+                index += 1
+            elif action == LITERAL:
+                operands.append(literal(lexeme(index)))
+                index += 1
+            elif action == NAME or action == CALL:
+                token = tokens[index]
+                index = self._expect(index + 1, TokenCategory.OPEN_PAREN)
+                if index < length and categories[index] == close_paren:
+                    # Empty argument list: the call itself is the operand
+                    operands.append(call(token, []))
+                    index += 1
+                else:
+                    frame = _Frame(nodes.binary, call=token)
+                    frames.append(frame)
+                    operands, operators = frame.operands, frame.operators
+                    continue
+            else:
+                raise SyntaxError(f"Unexpected token {tokens[index]}")
+
+            # Infix position: operators extend the operand, anything else ends it
+            while True:
+                category = categories[index] if index < length else None
+                action = infix_table[category] if category is not None else None
+                if action == BINARY:
+                    precedence = precedences.get(lexeme(index), -1)
+                    if precedence >= 0:
+                        if operators and operators[-1][0] >= precedence:
+                            frame.reduce(precedence)
+                        operators.append((precedence, tokens[index]))
+                        index += 1
+                        break
+
+                if operators:
+                    frame.reduce(0)
+                expression = operands.pop()
+                if frame.call is None:
+                    self.current_token_idx = index
+                    return expression
+
+                # End of a call argument; a comma between arguments is optional
+                frame.arguments.append(expression)
+                if action == ARGUMENT_END and category != close_paren:
+                    index += 1
+                if index < length and categories[index] == close_paren:
+                    index += 1
+                    node = call(frame.call, frame.arguments)
+                    frames.pop()
+                    frame = frames[-1]
+                    operands, operators = frame.operands, frame.operators
+                    operands.append(node)
+                    continue
+                # Another argument follows
+                break
+
+    def _expect(self, index: int, category: TokenCategory) -> int:
+        if index >= len(self.categories):
+            raise SyntaxError(f"Expected {category}, but reached the end of input")
+        found = self.categories[index]
+        if found != category._value_:
+            raise SyntaxError(f"Expected {category}, but got {CATEGORIES[found]}")
+        return index + 1
+
+
+# Interchangeable parsers producing identical ASTs, selectable by name
+PARSERS = {"recursive": Parser, "pratt": PrattParser}
@@ -0,0 +1,183 @@
+# interpreter/pipeline.py
+
+'''
+End-to-end entry points chaining the lexer, parser, optimizer and executor.
+
+Usage:
+    from interpreter.pipeline import run_source, run_stream
+
+    variables = run_source(source_code, engine="closure")
+
+    with open("script.py", "rb") as source_file:
+        run_stream(source_file)  # executes while the file is still being read
+'''
+
+from collections.abc import Iterator
+from typing import Any, Callable, TextIO
+from interpreter.cache import ProgramCache
+from interpreter.lexer.streaming import DEFAULT_CHUNK_SIZE, Source, iter_tokens
+from interpreter.lexer.tokenizer import LEXERS
+from interpreter.parser import PARSERS, Arena, iter_statements, parse_arena
+from interpreter.parser.nodes import HashConsingNodeFactory
+from interpreter.parser.ast import Program, Statement, count_nodes
+from interpreter.executor import ENGINES
+from interpreter.optimizer import Optimizer
+from interpreter.optimizer.passes import ConstantFolding
+from interpreter.metrics import NULL_RUN, Instrumentation, NullRunMetrics, RunMetrics
+from interpreter.parallel import parse_parallel_counted
+
+DEFAULT_ENGINE = "bytecode"
+
+
+def parse_source(
+    source_code: str,
+    lexer: str = "regex",
+    optimizer: Optimizer | None = None,
+    parser: str = "recursive",
+    workers: int | None = 1,
+    cache: ProgramCache | None = None,
+    run: RunMetrics | None = None,
+    share_nodes: bool = False,
+    arena: bool = False
+) -> Program | Arena:
+    '''Lex, parse and optimize `source_code`.
+
+    Parsing runs on `workers` processes if that is not 1. With a `cache`, a
+    program parsed and optimized before is loaded from it instead, and
+    `optimizer` is not run (so its report stays empty). With a
+    `run`, each phase is timed and the program's size is recorded. With
+    `share_nodes`, equal subtrees are parsed into one shared node. With
+    `arena`, the result is a flat `Arena`, optimized by the same passes; see
+    `Optimizer.optimize_arena`.
+    '''
+    if arena and share_nodes:
+        raise ValueError("share_nodes does not apply to an arena")
+    run = run or NULL_RUN
+    # Lexers and parsers are interchangeable; only the passes and node sharing
+    # shape the result
+    options = ",".join(
+        optimization_pass.name for optimization_pass in optimizer.passes
+    ) if optimizer is not None else ""
+    if share_nodes:
+        options += ";share-nodes"
+    if arena:
+        options += ";arena"
+    if cache is not None:
+        with run.phase("cache"):
+            cached = cache.load(source_code, options)
+        if run.event is not None:
+            run.event.cache = "miss" if cached is None else "hit"
+        if cached is not None:
+            _record_size(run, cached)
+            return cached
+
+    if workers == 1:
+        with run.phase("lex"):
+            tokens = LEXERS[lexer](source_code)
+        with run.phase("parse"):
+            if arena:
+                program = parse_arena(tokens, PARSERS[parser])
+            else:
+                nodes = HashConsingNodeFactory() if share_nodes else None
+                program = PARSERS[parser](tokens, nodes).parse()
+        if run.event is not None:
+            run.event.tokens = len(tokens)
+    else:
+        # Workers lex and parse each chunk in one go
+        with run.phase("parse"):
+            program, tokens = parse_parallel_counted(
+                source_code, workers, lexer, parser, share_nodes=share_nodes
+            )
+            if arena:
+                program = Arena.from_program(program)
+        if run.event is not None:
+            run.event.tokens = tokens
+    if optimizer is not None:
+        with run.phase("optimize"):
+            if arena:
+                program = optimizer.optimize_arena(program)
+            else:
+                program = optimizer.optimize(program)
+    _record_size(run, program)
+    if cache is not None:
+        with run.phase("cache"):
+            cache.store(source_code, program, options)
+    return program
+
+
+def _record_size(run: RunMetrics | NullRunMetrics, program: Program | Arena) -> None:
+    if run.event is not None:
+        run.event.statements = len(program.statements)
+        # An arena has no `Program` node
+        run.event.nodes = (
+            len(program) + 1 if isinstance(program, Arena) else count_nodes(program)
+        )
+
+
+def run_source(
+    source_code: str,
+    engine: str = DEFAULT_ENGINE,
+    lexer: str = "regex",
+    optimize: bool = True,
+    stdin: TextIO | None = None,
+    stdout: TextIO | None = None,
+    functions: dict[str, Callable] | None = None,
+    parser: str = "recursive",
+    workers: int | None = 1,
+    cache: ProgramCache | None = None,
+    instrumentation: Instrumentation | None = None,
+    share_nodes: bool = False,
+    arena: bool = False
+) -> dict[str, Any]:
+    '''Lex and parse everything, optimize the whole program, then run it.
+
+    With `instrumentation`, the run is reported to its subscribers, even when
+    it fails.
+    '''
+    run = instrumentation.record(
+        engine=engine, lexer=lexer, parser=parser
+    ) if instrumentation is not None else NULL_RUN
+    with run:
+        program = parse_source(
+            source_code, lexer, Optimizer() if optimize else None, parser,
+            workers, cache, run, share_nodes, arena
+        )
+        executor = ENGINES[engine](stdin=stdin, stdout=stdout, functions=functions)
+        with run.phase("execute"):
+            return executor.execute(program)
+
+
+def stream_statements(
+    source: Source,
+    optimize: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parser: str = "recursive"
+) -> Iterator[Statement]:
+    '''Lazily lex and parse `source`, yielding statements line by line.'''
+    statements = iter_statements(iter_tokens(source, chunk_size), PARSERS[parser])
+    if not optimize:
+        return statements
+    # Whole-program passes need every statement up front; folding does not
+    folding = ConstantFolding()
+    return (folding.visit_statement(statement) for statement in statements)
+
+
+def run_stream(
+    source: Source,
+    engine: str = DEFAULT_ENGINE,
+    optimize: bool = True,
+    stdin: TextIO | None = None,
+    stdout: TextIO | None = None,
+    functions: dict[str, Callable] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parser: str = "recursive"
+) -> dict[str, Any]:
+    '''Pipelined run: each statement executes as soon as its line is parsed.
+
+    Time to the first output no longer depends on the size of the source, and
+    neither the full token list nor the full AST is ever resident.
+    '''
+    executor = ENGINES[engine](stdin=stdin, stdout=stdout, functions=functions)
+    return executor.execute_stream(
+        stream_statements(source, optimize, chunk_size, parser)
+    )
@@ -0,0 +1,202 @@
+# interpreter/runner.py
+
+'''
+Run many independent programs concurrently on a pool of pre-warmed processes.
+
+Each job is lexed, parsed, optimized and executed in a fresh executor with its
+own captured stdout and its own input stream, so jobs never see each other's
+output or variables. Worker processes are started, and the interpreter
+imported and exercised (which compiles the lexer's regexes), before the first
+job is handed out. Results are yielded as jobs finish, not in submission order.
+
+Usage:
+    from interpreter.runner import Job, JobRunner
+
+    with JobRunner(workers=8) as runner:
+        for result in runner.run(Job.from_file(path) for path in paths):
+            print(result.name, result.stdout, result.error)
+        print(runner.metrics.format())
+'''
+
+import io
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+from interpreter.lexer.tokenizer import LEXERS
+from interpreter.pipeline import DEFAULT_ENGINE, run_source
+
+# Jobs handed to the pool ahead of time per worker: enough to keep every worker
+# busy, few enough that a huge or endless job iterable is consumed lazily
+JOBS_IN_FLIGHT_PER_WORKER = 4
+
+WARM_UP_SOURCE = 'x = 1 + 2\ny = "a" + "b"\nprint(sum(x, 1), max(x, 2), y)\n'
+
+
+@dataclass(frozen=True)
+class Job:
+    source_code: str
+    stdin: str = ""
+    name: str = ""
+
+    @classmethod
+    def from_file(cls, path: str, stdin: str = "") -> "Job":
+        with open(path) as source_file:
+            return cls(source_file.read(), stdin, path)
+
+
+@dataclass(frozen=True)
+class JobResult:
+    index: int
+    name: str
+    stdout: str
+    variables: dict[str, Any]
+    error: str | None
+    seconds: float
+    worker: int
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class RunnerMetrics:
+    workers: int
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def in_flight(self) -> int:
+        return self.submitted - self.completed
+
+    @property
+    def queue_depth(self) -> int:
+        '''Jobs handed to the pool that no worker has picked up yet.'''
+        return max(0, self.in_flight - self.workers)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def throughput(self) -> float:
+        '''Completed jobs per second.'''
+        return self.completed / self.elapsed
+
+    @property
+    def worker_busy(self) -> float:
+        '''Fraction of the pool's worker time spent running jobs.'''
+        return self.busy_seconds / (self.workers * self.elapsed)
+
+    def format(self) -> str:
+        return (
+            f"{self.completed} jobs ({self.failed} failed) in {self.elapsed:.2f}s: "
+            f"{self.throughput:,.1f} jobs/s, workers {self.worker_busy:.0%} busy, "
+            f"queue depth {self.queue_depth}"
+        )
+
+
+def _warm_up(engine: str) -> None:
+    # Pool initializer: import and exercise every stage before the first job
+    for lexer in LEXERS.values():
+        lexer(WARM_UP_SOURCE)
+    run_source(WARM_UP_SOURCE, engine, stdout=io.StringIO())
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _run_job(index: int, job: Job, engine: str, optimize: bool) -> JobResult:
+    stdout = io.StringIO()
+    start = time.perf_counter()
+    variables, error = {}, None
+    try:
+        variables = run_source(
+            job.source_code, engine, optimize=optimize,
+            stdin=io.StringIO(job.stdin), stdout=stdout
+        )
+    except Exception as exception:
+        error = f"{type(exception).__name__}: {exception}"
+    return JobResult(
+        index, job.name, stdout.getvalue(), variables, error,
+        time.perf_counter() - start, os.getpid()
+    )
+
+
+class JobRunner:
+    '''Pool of pre-warmed worker processes executing `Job`s.
+
+    Usage:
+        with JobRunner(workers=4, engine="closure") as runner:
+            results = list(runner.run(jobs))
+    '''
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        engine: str = DEFAULT_ENGINE,
+        optimize: bool = True
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.optimize = optimize
+        self.metrics = RunnerMetrics(self.workers)
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "JobRunner":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def start(self) -> None:
+        '''Start and warm up every worker; returns once all are ready.'''
+        if self._pool is not None:
+            return
+        self._pool = ProcessPoolExecutor(
+            self.workers, initializer=_warm_up, initargs=(self.engine,)
+        )
+        for future in [self._pool.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+        self.metrics = RunnerMetrics(self.workers)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def run(self, jobs: Iterable[Job]) -> Iterator[JobResult]:
+        '''Yield the result of every job as soon as it finishes.'''
+        self.start()
+        jobs = enumerate(jobs)
+        pending: set[Future] = set()
+        limit = self.workers * JOBS_IN_FLIGHT_PER_WORKER
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < limit:
+                try:
+                    index, job = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(self._pool.submit(
+                    _run_job, index, job, self.engine, self.optimize
+                ))
+                self.metrics.submitted += 1
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                self.metrics.completed += 1
+                self.metrics.failed += not result.ok
+                self.metrics.busy_seconds += result.seconds
+                yield result
@@ -1,7 +1,17 @@
 # main.py
 
+import argparse
+import sys
 from interpreter.lexer.tokenizer import *
 from interpreter.parser import *
+from interpreter.executor import ENGINES
+from interpreter.executor.output import BufferedSink, NullSink
+from interpreter.executor.profiler import MODES, parse_with_lines, profile_program
+from interpreter.cache import ProgramCache
+from interpreter.metrics import NULL_RUN, Instrumentation, JsonLinesExporter
+from interpreter.optimizer import Optimizer
+from interpreter.pipeline import parse_source, run_stream
+from interpreter.runner import Job, JobRunner
 
 def test_tokenizer():
     source_code = """
@@ -25,10 +35,178 @@ def test_parser(tokens: list[Token]):
     p = Parser(tokens)
     return p.parse()
 
+def run_file(
+    path: str, engine: str, optimize: bool = True, optimizer_stats: bool = False,
+    lexer: str = "regex", stream: bool = False, parser: str = "recursive",
+    jobs: int = 1, cache: bool = True, discard_output: bool = False,
+    instrumentation: Instrumentation | None = None, share_nodes: bool = False,
+    arena: bool = False
+) -> None:
+    # Output is written in large blocks rather than once per `print`
+    sink = NullSink() if discard_output else BufferedSink(flush_interval=0.1)
+    with sink:
+        run = instrumentation.record(
+            path=path, engine=engine, lexer="stream" if stream else lexer,
+            parser=parser
+        ) if instrumentation is not None else NULL_RUN
+        if stream:
+            # Lexing, parsing and execution interleave, so they are one phase
+            with run, run.phase("execute"), open(path, "rb") as source_file:
+                run_stream(source_file, engine, optimize, stdout=sink, parser=parser)
+            return
+
+        with run:
+            with open(path) as source_file:
+                optimizer = Optimizer() if optimize else None
+                # A cache hit would skip the optimizer and leave its report empty
+                use_cache = cache and not (optimizer and optimizer_stats)
+                program = parse_source(
+                    source_file.read(), lexer, optimizer, parser, jobs or None,
+                    ProgramCache() if use_cache else None, run, share_nodes, arena
+                )
+            if optimizer and optimizer_stats:
+                print(optimizer.report.format(), file=sys.stderr)
+            with run.phase("execute"):
+                ENGINES[engine](stdout=sink).execute(program)
+
+def profile_file(
+    path: str, mode: str, parser: str = "recursive", output: str | None = None,
+    discard_output: bool = False
+) -> None:
+    # Profiles the unoptimized AST on the tree-walker, so nodes match the source
+    with open(path) as source_file:
+        program, lines = parse_with_lines(source_file.read(), parser)
+    sink = NullSink() if discard_output else BufferedSink(flush_interval=0.1)
+    with sink:
+        profile = profile_program(program, mode, lines, stdout=sink)
+    print(profile.report(), file=sys.stderr)
+    if output:
+        with open(output, "w") as output_file:
+            output_file.write(profile.collapsed())
+
+def run_files(paths: list[str], engine: str, optimize: bool, workers: int) -> None:
+    with JobRunner(workers or None, engine, optimize) as runner:
+        for result in runner.run(Job.from_file(path) for path in paths):
+            print(f"==> {result.name} <==")
+            print(result.stdout, end="")
+            if result.error:
+                print(f"{result.name}: {result.error}", file=sys.stderr)
+    print(runner.metrics.format(), file=sys.stderr)
+
+def parse_args() -> argparse.Namespace:
+    argument_parser = argparse.ArgumentParser(
+        description="Run a program, or show the tokens and AST of a demo."
+    )
+    argument_parser.add_argument(
+        "paths", nargs="*", metavar="path", help="source files to run"
+    )
+    argument_parser.add_argument(
+        "--engine", choices=ENGINES, default="bytecode",
+        help="execution engine (default: %(default)s)"
+    )
+    argument_parser.add_argument(
+        "--lexer", choices=LEXERS, default="regex",
+        help="lexer engine (default: %(default)s)"
+    )
+    argument_parser.add_argument(
+        "--parser", choices=PARSERS, default="recursive",
+        help="parser engine (default: %(default)s; 'pratt' never hits the "
+             "recursion limit, and neither do the optimizer and the bytecode "
+             "engine)"
+    )
+    argument_parser.add_argument(
+        "--jobs", type=int, default=1, metavar="N",
+        help="lex and parse large files on N processes (0: one per CPU)"
+    )
+    argument_parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="run the files as independent jobs on N pre-warmed processes "
+             "(0: one per CPU); outputs are printed as jobs finish and jobs "
+             "read from an empty input stream"
+    )
+    argument_parser.add_argument(
+        "--share-nodes", action="store_true",
+        help="parse equal subtrees into one shared node (smaller ASTs for "
+             "repetitive code)"
+    )
+    argument_parser.add_argument(
+        "--arena", action="store_true",
+        help="parse into a flat, array-based AST (less memory for large "
+             "programs)"
+    )
+    argument_parser.add_argument(
+        "--discard-output", action="store_true",
+        help="throw away everything the program prints (for benchmarking)"
+    )
+    argument_parser.add_argument(
+        "--no-cache", dest="cache", action="store_false",
+        help="always parse; do not read or write the on-disk program cache"
+    )
+    argument_parser.add_argument(
+        "--no-optimize", dest="optimize", action="store_false",
+        help="skip the AST optimizer"
+    )
+    argument_parser.add_argument(
+        "--stream", action="store_true",
+        help="execute each statement as soon as it is parsed (constant time "
+             "to first output; only per-statement optimizations apply)"
+    )
+    argument_parser.add_argument(
+        "--profile", choices=MODES,
+        help="run on the unoptimized tree-walker and print the hottest nodes "
+             "and lines to stderr; 'sampling' has far less overhead"
+    )
+    argument_parser.add_argument(
+        "--profile-output", metavar="FILE",
+        help="with --profile, also write collapsed stacks for flamegraph tools"
+    )
+    argument_parser.add_argument(
+        "--metrics", metavar="FILE",
+        help="append one JSON line per run with phase timings, token, statement "
+             "and node counts and cache use"
+    )
+    argument_parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="with --metrics, also record peak memory (slows lexing and parsing)"
+    )
+    argument_parser.add_argument(
+        "--optimizer-stats", action="store_true",
+        help="print per-pass optimizer statistics to stderr (always optimizes, "
+             "bypassing the program cache)"
+    )
+    args = argument_parser.parse_args()
+    if args.arena and args.share_nodes:
+        argument_parser.error("--arena cannot be combined with --share-nodes")
+    return args
+
 if __name__ == "__main__":
-    tokens = test_tokenizer()
-    print(tokens)
-    print(test_parser(tokens))
+    args = parse_args()
+    if args.workers is not None:
+        run_files(args.paths, args.engine, args.optimize, args.workers)
+    elif args.profile:
+        for path in args.paths:
+            profile_file(
+                path, args.profile, args.parser, args.profile_output,
+                args.discard_output
+            )
+    elif args.paths:
+        instrumentation, exporter = None, None
+        if args.metrics:
+            instrumentation = Instrumentation(args.trace_memory)
+            exporter = instrumentation.subscribe(JsonLinesExporter(args.metrics))
+        for path in args.paths:
+            run_file(
+                path, args.engine, args.optimize, args.optimizer_stats,
+                args.lexer, args.stream, args.parser, args.jobs, args.cache,
+                args.discard_output, instrumentation, args.share_nodes,
+                args.arena
+            )
+        if exporter is not None:
+            exporter.close()
+    else:
+        tokens = test_tokenizer()
+        print(tokens)
+        print(test_parser(tokens))
 
 '''
 [
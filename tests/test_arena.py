@@ -0,0 +1,143 @@
+# test/test_arena.py
+
+import io
+import pytest
+from benchmarks.generator import ProgramShape, generate_source
+from interpreter.cache import ProgramCache
+from interpreter.executor import ENGINES
+from interpreter.executor.closures import ClosureCompiler
+from interpreter.executor.compiler import Compiler
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.optimizer import Optimizer
+from interpreter.optimizer.passes import ConstantFolding
+from interpreter.parser import (
+    PARSERS, Arena, HashConsingNodeFactory, NodeKind, Parser, parse_arena
+)
+from interpreter.parser.ast import walk
+from interpreter.pipeline import parse_source, run_source
+
+SOURCE_CODE = generate_source(ProgramShape(statements=300, depth=2, identifiers=4))
+
+
+def parse(source_code: str):
+    return Parser(tokenize(source_code)).parse()
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_round_trip(parser: str) -> None:
+    program = parse(SOURCE_CODE)
+    arena = parse_arena(tokenize(SOURCE_CODE), PARSERS[parser])
+    assert arena.to_program() == program
+    assert Arena.from_program(program).to_program() == program
+    assert len(arena) == sum(1 for _ in walk(program)) - 1  # without `Program`
+
+
+def test_layout() -> None:
+    arena = parse_arena(tokenize('x = 1 + y\nprint(x, "a", 1)\n'))
+    assignment, call = arena.statements
+    assert NodeKind(arena.kind[assignment]) is NodeKind.ASSIGNMENT
+    assert arena.name(assignment) == "x" and arena.name(call) == "print"
+    binary = arena.left[assignment]
+    assert arena.left[binary] < binary and arena.right[binary] < binary
+    assert [NodeKind(arena.kind[i]) for i in arena.arguments(call)] == [
+        NodeKind.VARIABLE, NodeKind.LITERAL, NodeKind.LITERAL
+    ]
+    # `1` is stored once, for both uses
+    assert arena.constants == [1, '"a"']
+    assert [arena.kind[i] for i in arena.walk(assignment)] == [
+        NodeKind.ASSIGNMENT, NodeKind.BINARY, NodeKind.LITERAL, NodeKind.VARIABLE
+    ]
+
+
+def test_shared_subtrees_stay_shared() -> None:
+    program = PARSERS["pratt"](
+        tokenize(SOURCE_CODE), HashConsingNodeFactory()
+    ).parse()
+    arena = Arena.from_program(program)
+    assert len(arena) == len({id(node) for node in walk(program)}) - 1
+    assert arena.to_program() == program
+
+
+def test_compilers_walk_the_arena() -> None:
+    program = parse(SOURCE_CODE)
+    arena = parse_arena(tokenize(SOURCE_CODE))
+    assert Compiler().compile(arena) == Compiler().compile(program)
+    assert ClosureCompiler().compile(arena).symbols == (
+        ClosureCompiler().compile(program).symbols
+    )
+
+
+def run(program) -> set[tuple]:
+    results = set()
+    for engine in ENGINES.values():
+        stdout = io.StringIO()
+        variables = engine(stdout=stdout).execute(program)
+        results.add((stdout.getvalue(), tuple(sorted(variables.items()))))
+    return results
+
+
+def test_every_engine_runs_an_arena() -> None:
+    expected = run(parse(SOURCE_CODE))
+    assert len(expected) == 1
+    assert run(parse_arena(tokenize(SOURCE_CODE))) == expected
+
+
+def test_constant_folding_on_the_arena() -> None:
+    source_code = 'x = 1 + 2 - 3 + y\nz = "a" + "b"\nw = 1 + "a"\nprint(2 + 2, f(1 - 1))\n'
+    folding = ConstantFolding()
+    arena = folding.run_arena(parse_arena(tokenize(source_code)))
+    expected = ConstantFolding().run(parse(source_code))
+    assert arena.to_program() == expected
+    assert folding.rewrites == 5
+    # Folded operands are dropped, not left behind unreachable
+    assert len(arena) == sum(1 for _ in walk(expected)) - 1
+
+    unchanged = parse_arena(tokenize("x = y + 1\n"))
+    assert ConstantFolding().run_arena(unchanged) is unchanged
+
+
+@pytest.mark.parametrize("source_code", [
+    SOURCE_CODE,
+    "a = 1\nb = a + 2 + y\nc = y + 0 + z\nd = b + c\ne = b + c\nd = 5\nprint(d, e)\n",
+])
+def test_optimizer_matches_on_the_arena(source_code: str) -> None:
+    tree_optimizer, arena_optimizer = Optimizer(), Optimizer()
+    expected = tree_optimizer.optimize(parse(source_code))
+    arena = arena_optimizer.optimize_arena(parse_arena(tokenize(source_code)))
+    assert arena.to_program() == expected
+    assert [
+        (entry.name, entry.rewrites) for entry in arena_optimizer.report.passes
+    ] == [(entry.name, entry.rewrites) for entry in tree_optimizer.report.passes]
+    assert arena_optimizer.report.passes[-1].nodes_after == len(arena)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_pipeline_runs_an_arena(engine: str) -> None:
+    results = []
+    for arena in (False, True):
+        stdout = io.StringIO()
+        variables = run_source(SOURCE_CODE, engine, stdout=stdout, arena=arena)
+        results.append((stdout.getvalue(), variables))
+    assert results[0] == results[1]
+
+
+def test_pipeline_optimizes_an_arena(tmp_path) -> None:
+    source_code = "x = 1 + 2 + y\nprint(x)\n"
+    optimizer = Optimizer()
+    arena = parse_source(source_code, optimizer=optimizer, arena=True)
+    assert isinstance(arena, Arena)
+    assert arena.to_program() == Optimizer().optimize(parse(source_code))
+    assert [entry.name for entry in optimizer.report.passes] == [
+        entry.name for entry in Optimizer().passes
+    ]
+
+    cache = ProgramCache(tmp_path)
+    stored = parse_source(source_code, optimizer=Optimizer(), cache=cache, arena=True)
+    loaded = parse_source(source_code, optimizer=Optimizer(), cache=cache, arena=True)
+    assert isinstance(loaded, Arena)
+    assert loaded.to_program() == stored.to_program()
+    # Arenas and dataclass programs are cached apart
+    assert not isinstance(parse_source(source_code, cache=cache), Arena)
+
+    with pytest.raises(ValueError):
+        parse_source(source_code, arena=True, share_nodes=True)
@@ -0,0 +1,142 @@
+# test/test_async.py
+
+import asyncio
+import pytest
+from interpreter.executor import AsyncExecutor
+from interpreter.executor.asynchronous import serve
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import Parser
+
+PROGRAM = Parser(tokenize(
+    'name = input("name? ")\nprint("hi " + name, 1 + 2)\nx = 4 - 1\n'
+)).parse()
+
+
+class Writer:
+    def __init__(self):
+        self.data = b""
+        self.drains = 0
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        self.drains += 1
+
+
+def run_session(program, lines: bytes, **kwargs) -> tuple[dict, Writer]:
+    async def session():
+        reader = asyncio.StreamReader()
+        reader.feed_data(lines)
+        reader.feed_eof()
+        writer = Writer()
+        return await AsyncExecutor(reader, writer, **kwargs).execute(program), writer
+    return asyncio.run(session())
+
+
+def test_session() -> None:
+    variables, writer = run_session(PROGRAM, b"ann\r\n")
+    assert variables == {"name": "ann", "x": 3}
+    assert writer.data == b"name? hi ann 3\n"
+    assert writer.drains == 2
+
+
+def test_input_at_end_of_stream() -> None:
+    with pytest.raises(EOFError):
+        run_session(PROGRAM, b"")
+
+
+def test_async_host_functions() -> None:
+    async def fetch(key: str) -> str:
+        await asyncio.sleep(0)
+        return key.upper()
+
+    program = Parser(tokenize('v = fetch("a") + lower("B")')).parse()
+    variables, _ = run_session(
+        program, b"", functions={"fetch": fetch, "lower": str.lower}
+    )
+    assert variables == {"v": "Ab"}
+
+
+def test_execute_stream() -> None:
+    async def statements():
+        for statement in PROGRAM.statements:
+            await asyncio.sleep(0)
+            yield statement
+
+    async def session(source):
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"ann\n")
+        reader.feed_eof()
+        writer = Writer()
+        return await AsyncExecutor(reader, writer).execute_stream(source), writer
+
+    for source in (PROGRAM.statements, statements()):
+        variables, writer = asyncio.run(session(source))
+        assert variables == {"name": "ann", "x": 3}
+        assert writer.data == b"name? hi ann 3\n"
+
+
+def test_sessions_share_one_event_loop() -> None:
+    sessions = 200
+
+    async def client(port: int, index: int) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"user{index}\n".encode())
+        output = await reader.read()
+        writer.close()
+        return output
+
+    async def main() -> list[bytes]:
+        server = await serve(PROGRAM)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(
+                *(client(port, index) for index in range(sessions))
+            )
+
+    outputs = asyncio.run(main())
+    assert outputs == [f"name? hi user{i} 3\n".encode() for i in range(sessions)]
+
+
+def test_errors_are_reported_to_the_client() -> None:
+    async def main() -> bytes:
+        server = await serve(Parser(tokenize("print(y)")).parse())
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            output = await reader.read()
+            writer.close()
+            return output
+
+    assert asyncio.run(main()) == b"NameError: name 'y' is not defined\n"
+
+
+def test_sessions_close_cleanly_when_clients_go_away(monkeypatch) -> None:
+    waited = []
+    wait_closed = asyncio.StreamWriter.wait_closed
+
+    async def counting_wait_closed(writer: asyncio.StreamWriter) -> None:
+        waited.append(writer)
+        await wait_closed(writer)
+
+    monkeypatch.setattr(asyncio.StreamWriter, "wait_closed", counting_wait_closed)
+
+    async def main() -> list[dict]:
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+        server = await serve(PROGRAM)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            for _ in range(20):
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                # Reset the connection while the session waits for input
+                writer.transport.abort()
+            await asyncio.sleep(0.2)
+        return errors
+
+    assert asyncio.run(main()) == []
+    # Every session waited for its transport to close
+    assert len(waited) == 20
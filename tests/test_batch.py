@@ -0,0 +1,147 @@
+# test/test_batch.py
+
+import io
+import pytest
+from interpreter.executor import BatchExecutor, VirtualMachine
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import Parser
+
+np = pytest.importorskip("numpy")
+
+
+def parse(source_code: str):
+    return Parser(tokenize(source_code)).parse()
+
+
+def run_per_record(source_code: str, columns: dict[str, list]) -> tuple[list, list]:
+    '''The reference: the scalar VM, once per record.'''
+    program = VirtualMachine().compile(parse(source_code))
+    results, outputs = [], []
+    for row in zip(*columns.values()):
+        stdout = io.StringIO()
+        executor = VirtualMachine(stdout=stdout)
+        executor.variables.update(zip(columns, row))
+        results.append(executor.run(program))
+        outputs.append(stdout.getvalue())
+    return results, outputs
+
+
+@pytest.mark.parametrize("source_code, columns", [
+    ("z = 2 + 3 + x + y\nprint(z, x - y)", {"x": [1, 2, 3], "y": [10, -20, 30]}),
+    ("a = sum(x, y, 1) - max(x, y)\nb = max(x)\nc = sum()",
+     {"x": [5, 2, 9], "y": [3, 8, 9]}),
+    ('s = name + "!"\nprint("hi " + s, n)', {"name": ["ann", "bob"], "n": [1, 2]}),
+    ("m = max(s, t)\nprint(m)", {"s": ["b", "a"], "t": ["a", "c"]}),
+    ("x = 1\ny = x + 2\nprint()", {"unused": [0, 0]}),
+])
+def test_matches_scalar_execution(source_code: str, columns: dict[str, list]) -> None:
+    expected, expected_outputs = run_per_record(source_code, columns)
+
+    executor = BatchExecutor(columns)
+    variables = executor.execute(parse(source_code))
+    for record, expected_variables in enumerate(expected):
+        assert {
+            name: column[record] for name, column in variables.items()
+        } == expected_variables
+        assert executor.output(record) == expected_outputs[record]
+
+
+def test_numeric_operations_are_vectorised() -> None:
+    executor = BatchExecutor({"x": np.arange(5), "y": np.arange(5) * 10})
+    variables = executor.execute(parse("z = max(x + y - 3, 0)"))
+    assert isinstance(variables["z"], np.ndarray)
+    assert variables["z"].tolist() == [0, 8, 19, 30, 41]
+
+
+def test_integer_overflow_falls_back_to_python_ints() -> None:
+    columns = {"x": [2 ** 62, 1, -2 ** 62], "y": [2 ** 63 - 1, 0, -2 ** 63]}
+    source_code = "a = x + x\nb = sum(x, x, x)\nc = y - 1\nd = 0 - y\ne = x + 1"
+    expected, _ = run_per_record(source_code, columns)
+    variables = BatchExecutor(columns).execute(parse(source_code))
+    assert [
+        {name: column[record] for name, column in variables.items()}
+        for record in range(3)
+    ] == expected
+    assert variables["a"].tolist() == [2 ** 63, 2, -2 ** 63]
+    # Results that fit stay vectorised
+    assert variables["e"].dtype == np.int64
+
+
+def test_host_functions_run_per_record() -> None:
+    calls = []
+
+    def double(value: int) -> int:
+        calls.append(value)
+        return value * 2
+
+    executor = BatchExecutor({"x": [1, 2, 3]}, functions={"double": double})
+    variables = executor.execute(parse("y = double(x) + 1"))
+    assert variables["y"].tolist() == [3, 5, 7]
+    assert calls == [1, 2, 3]
+
+
+def test_input_reads_one_line_per_record() -> None:
+    executor = BatchExecutor(rows=2, stdin=io.StringIO("ann\nbob\n"))
+    assert executor.execute(parse("n = input()"))["n"].tolist() == ["ann", "bob"]
+
+
+@pytest.mark.parametrize("source_code, error", [
+    ('y = x + "a"', TypeError),
+    ("y = missing + 1", NameError),
+    ("y = f(x)", NameError),
+    ("y = max()", ValueError),
+])
+def test_errors_match_scalar_execution(source_code: str, error: type) -> None:
+    with pytest.raises(error):
+        BatchExecutor({"x": [1, 2]}).execute(parse(source_code))
+
+
+def test_column_lengths_must_match() -> None:
+    with pytest.raises(ValueError):
+        BatchExecutor({"x": [1, 2], "y": [1]})
+    with pytest.raises(ValueError):
+        BatchExecutor()
+
+
+def test_mixed_sign_overflow_stays_exact() -> None:
+    columns = {"a": [-5, 2 ** 63 - 1, 0]}
+    source_code = "c = a + a\nprint(c)"
+    _, expected_outputs = run_per_record(source_code, columns)
+    executor = BatchExecutor(columns)
+    variables = executor.execute(parse(source_code))
+    assert variables["c"].tolist() == [-10, 2 ** 64 - 2, 0]
+    assert [executor.output(record) for record in range(3)] == expected_outputs
+
+
+def test_scalar_max_does_not_wrap() -> None:
+    variables = BatchExecutor(rows=2).execute(
+        parse("c = max(9223372036854775807, 0) + 1")
+    )
+    assert variables["c"].tolist() == [2 ** 63, 2 ** 63]
+
+
+def test_other_dtypes_run_per_record() -> None:
+    columns = {
+        "u": np.array([1, 2], dtype=np.uint64),
+        "h": np.array([1, 2], dtype=np.int8),
+        "b": np.array([True, False]),
+    }
+    variables = BatchExecutor(columns).execute(
+        parse("x = u - 5\ny = h + 300\nz = b - b\nw = b + b")
+    )
+    assert variables["x"].tolist() == [-4, -3]
+    assert variables["y"].tolist() == [301, 302]
+    assert variables["z"].tolist() == [0, 0]
+    assert variables["w"].tolist() == [2, 0]
+
+
+@pytest.mark.parametrize("source_code", ['y = x + s', 'y = s - x', 'y = 1 - s'])
+def test_mixed_kind_errors_are_plain_type_errors(source_code: str) -> None:
+    with pytest.raises(TypeError) as batch_error:
+        BatchExecutor({"x": [1, 2], "s": ["a", "b"]}).execute(parse(source_code))
+    with pytest.raises(TypeError) as scalar_error:
+        executor = VirtualMachine()
+        executor.variables.update(x=1, s="a")
+        executor.execute(parse(source_code))
+    assert type(batch_error.value) is TypeError
+    assert str(batch_error.value) == str(scalar_error.value)
@@ -0,0 +1,106 @@
+# test/test_cache.py
+
+import os
+import stat
+import pytest
+from pathlib import Path
+from interpreter import cache as cache_module
+from interpreter.cache import ProgramCache
+from interpreter.lexer.tokenizer import LEXERS, tokenize
+from interpreter.optimizer import Optimizer
+from interpreter.parser import Parser
+from interpreter.pipeline import parse_source, run_source
+
+SOURCE_CODE = 'x = 2 + 3\ny = "a" + "b"\nprint(x, y)\n'
+
+
+def test_store_and_load(tmp_path: Path) -> None:
+    cache = ProgramCache(tmp_path)
+    program = Parser(tokenize(SOURCE_CODE)).parse()
+
+    assert cache.load(SOURCE_CODE) is None
+    cache.store(SOURCE_CODE, program)
+    assert cache.load(SOURCE_CODE) == program
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Nothing but the entry itself is left behind
+    assert [path.suffix for path in tmp_path.rglob("*.*")] == [".ast"]
+
+
+@pytest.mark.parametrize("change", ["source", "options", "version"])
+def test_key_changes_invalidate(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, change: str
+) -> None:
+    cache = ProgramCache(tmp_path)
+    cache.store(SOURCE_CODE, Parser(tokenize(SOURCE_CODE)).parse(), "passes")
+    source_code, options = SOURCE_CODE, "passes"
+    if change == "source":
+        source_code += "z = 1\n"
+    elif change == "options":
+        options = ""
+    else:
+        monkeypatch.setattr(cache_module, "__version__", "99.0.0")
+    assert cache.load(source_code, options) is None
+
+
+@pytest.mark.parametrize("contents", [b"", b"garbage", cache_module.MAGIC + b"\x80"])
+def test_unreadable_entries_are_misses(tmp_path: Path, contents: bytes) -> None:
+    cache = ProgramCache(tmp_path)
+    path = cache.path(cache.key(SOURCE_CODE))
+    path.parent.mkdir(parents=True)
+    path.write_bytes(contents)
+
+    assert cache.load(SOURCE_CODE) is None
+    cache.store(SOURCE_CODE, Parser(tokenize(SOURCE_CODE)).parse())
+    assert cache.load(SOURCE_CODE) is not None
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_cache_directory_is_private(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    directory = tmp_path / "cache"
+    cache = ProgramCache(directory)
+    program = Parser(tokenize(SOURCE_CODE)).parse()
+    cache.store(SOURCE_CODE, program)
+    path = cache.path(cache.key(SOURCE_CODE))
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+    assert stat.S_IMODE(path.parent.stat().st_mode) == 0o700
+    assert cache.load(SOURCE_CODE) == program
+
+    # Entries another user could have planted are never unpickled
+    uid = os.getuid()
+    monkeypatch.setattr(cache_module.os, "getuid", lambda: uid + 1)
+    assert cache.load(SOURCE_CODE) is None
+
+
+def test_unwritable_directory_is_skipped(tmp_path: Path) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = ProgramCache(blocker)
+    cache.store(SOURCE_CODE, Parser(tokenize(SOURCE_CODE)).parse())
+    assert cache.load(SOURCE_CODE) is None
+
+
+def test_parse_source_skips_front_end_on_hit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = ProgramCache(tmp_path)
+    program = parse_source(SOURCE_CODE, optimizer=Optimizer(), cache=cache)
+
+    def fail(source_code: str) -> None:
+        raise AssertionError("tokenized on a cache hit")
+
+    monkeypatch.setitem(LEXERS, "regex", fail)
+    assert parse_source(SOURCE_CODE, optimizer=Optimizer(), cache=cache) == program
+    # Unoptimized programs, and programs with shared nodes, are cached separately
+    with pytest.raises(AssertionError):
+        parse_source(SOURCE_CODE, cache=cache)
+    with pytest.raises(AssertionError):
+        parse_source(SOURCE_CODE, optimizer=Optimizer(), cache=cache, share_nodes=True)
+
+
+def test_run_source_with_cache(tmp_path: Path) -> None:
+    cache = ProgramCache(tmp_path)
+    for _ in range(2):
+        assert run_source("x = 1 + 2\n", cache=cache) == {"x": 3}
+    assert cache.hits == 1
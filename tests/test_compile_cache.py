@@ -0,0 +1,93 @@
+# test/test_compile_cache.py
+
+import io
+import threading
+import pytest
+from interpreter.compile_cache import CompileCache, approximate_size
+from interpreter.executor import ENGINES
+
+SNIPPET = "z = 2 + 3 + x + y"
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_compiled_program_runs_against_fresh_environments(engine: str) -> None:
+    cache = CompileCache(engine=engine)
+    first = cache.run(SNIPPET, {"x": 1, "y": 2})
+    assert cache.run(SNIPPET, {"x": 10, "y": 20}) == {"x": 10, "y": 20, "z": 35}
+    assert first == {"x": 1, "y": 2, "z": 8}
+    # Nothing from earlier runs leaks into a new environment
+    with pytest.raises(NameError):
+        cache.run(SNIPPET, {"x": 1})
+    assert cache.get(SNIPPET) is cache.get(SNIPPET)
+    statistics = cache.statistics()
+    assert (statistics.hits, statistics.misses, statistics.entries) == (4, 1, 1)
+
+
+def test_output_goes_to_the_given_stream() -> None:
+    cache = CompileCache()
+    for name in ("ann", "bob"):
+        stdout = io.StringIO()
+        cache.run('print("hi " + name)', {"name": name}, stdout=stdout)
+        assert stdout.getvalue() == f"hi {name}\n"
+    assert cache.statistics().hit_rate == 0.5
+
+
+def test_lru_eviction_by_entries() -> None:
+    cache = CompileCache(max_entries=2)
+    for source_code in ("a = 1", "b = 2", "a = 1", "c = 3"):
+        cache.get(source_code)
+    assert "a = 1" in cache and "c = 3" in cache and "b = 2" not in cache
+    assert cache.statistics().evictions == 1
+
+
+def test_eviction_by_memory() -> None:
+    small = CompileCache().get("a = 1").size
+    cache = CompileCache(max_bytes=2 * small)
+    for source_code in ("a = 1", "b = 2", "c = 3"):
+        cache.get(source_code)
+    statistics = cache.statistics()
+    assert statistics.entries == 2 and statistics.bytes <= 2 * small
+
+    # Entries larger than the whole budget are compiled but never stored
+    huge = "x = " + " + ".join(["y"] * 200)
+    assert cache.get(huge).size > cache.max_bytes
+    assert huge not in cache
+
+
+def test_errors_are_not_cached() -> None:
+    cache = CompileCache()
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            cache.get("x = (")
+    assert len(cache) == 0 and cache.statistics().misses == 2
+
+
+def test_concurrent_gets() -> None:
+    cache = CompileCache(max_entries=8)
+    sources = [f"v = x + {i}" for i in range(12)]
+    failures = []
+
+    def worker(offset: int) -> None:
+        for i in range(300):
+            index = (i + offset) % len(sources)
+            if cache.run(sources[index], {"x": 1})["v"] != index + 1:
+                failures.append(index)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    statistics = cache.statistics()
+    assert not failures
+    assert statistics.hits + statistics.misses == 8 * 300
+    assert statistics.entries <= 8
+
+
+def test_approximate_size_grows_with_program() -> None:
+    cache = CompileCache(engine="closure")
+    short = cache.get("x = y + 1").size
+    long = cache.get("x = " + " + ".join(["y"] * 50)).size
+    assert 0 < short < long
+    assert approximate_size([1, [2, 3]]) > approximate_size([])
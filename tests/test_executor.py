@@ -1 +1,227 @@
-# test/test_executor.py
\ No newline at end of file
+# test/test_executor.py
+
+import io
+import pytest
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.optimizer import optimize as default_optimize
+from interpreter.optimizer.passes import ConstantFolding
+from interpreter.parser import PARSERS, Arena, Parser
+from interpreter.executor import ENGINES, VirtualMachine
+from interpreter.executor.compiler import Compiler
+from interpreter.executor.resolver import Resolver
+
+
+def run(engine, source_code: str, stdin: str = "", functions=None):
+    stdout = io.StringIO()
+    executor = engine(
+        stdin=io.StringIO(stdin), stdout=stdout, functions=functions
+    )
+    variables = executor.execute(Parser(tokenize(source_code)).parse())
+    return variables, stdout.getvalue()
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=list(ENGINES))
+@pytest.mark.parametrize("source_code, expected_variables, expected_output", [
+    ("x = 2\n", {"x": 2}, ""),
+    ('x = "hello"\n', {"x": "hello"}, ""),
+    ("x = 'hello'\n", {"x": "hello"}, ""),
+    ("x = 2 + 3\ny = x - 10\n", {"x": 5, "y": -5}, ""),
+    ("x = 10 - 3 - 2\n", {"x": 5}, ""),
+    ('x = "a" + "b" + "c"\n', {"x": "abc"}, ""),
+    ("x = 1\nx = x + 1\nx = x + 1\n", {"x": 3}, ""),
+    ("print(1, 2)\n", {}, "1 2\n"),
+    ('x = "hi"\nprint(x)\nprint()\n', {"x": "hi"}, "hi\n\n"),
+    ("x = sum(1, 2, 3)\ny = max(4, 9, 2)\n", {"x": 6, "y": 9}, ""),
+    ("x = sum(1, max(2, 5)) - 1\n", {"x": 5}, ""),
+])
+def test_execute(
+    engine, source_code: str, expected_variables: dict, expected_output: str
+) -> None:
+    variables, output = run(engine, source_code)
+    assert variables == expected_variables
+    assert output == expected_output
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=list(ENGINES))
+def test_execute_input(engine) -> None:
+    variables, output = run(
+        engine, 'x = input()\ny = input("name? ")\nprint(y + x)\n',
+        stdin="first\nsecond\n"
+    )
+    assert variables == {"x": "first", "y": "second"}
+    assert output == "name? secondfirst\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=list(ENGINES))
+def test_execute_host_function(engine) -> None:
+    calls = []
+    variables, _ = run(
+        engine, "x = 1\nf(x, 2)\ny = f(3)\n",
+        functions={"f": lambda *args: calls.append(args) or len(calls)}
+    )
+    assert calls == [(1, 2), (3,)]
+    assert variables == {"x": 1, "y": 2}
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=list(ENGINES))
+@pytest.mark.parametrize("source_code, expected_exception, message", [
+    ("print(x)\n", NameError, "name 'x' is not defined"),
+    ("f(1)\n", NameError, "function 'f' is not defined"),
+    ('x = "a" + 1\n', TypeError, "can only concatenate str"),
+    ("input()\n", EOFError, "EOF when reading a line"),
+])
+def test_execute_exceptions(
+    engine, source_code: str, expected_exception: Exception, message: str
+) -> None:
+    with pytest.raises(expected_exception, match=message):
+        run(engine, source_code)
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=list(ENGINES))
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("arena", [False, True])
+def test_invalid_literals_raise_when_run(engine, optimize: bool, arena: bool) -> None:
+    # The lexer accepts a raw newline in a string, Python's decoder does not
+    source_code = 'x = 1\nprint(x)\ny = "a\nb" + ""\nx = 2\nx = "\\N{nope}"\n'
+    program = Parser(tokenize(source_code)).parse()
+    if optimize:
+        program = default_optimize(program)
+    if arena:
+        program = ConstantFolding().run_arena(Arena.from_program(program))
+    stdout = io.StringIO()
+    executor = engine(stdout=stdout)
+    with pytest.raises(SyntaxError, match="unterminated string"):
+        executor.execute(program)
+    assert (executor.variables, stdout.getvalue()) == ({"x": 1}, "1\n")
+
+
+def test_compile_bytecode() -> None:
+    code = Compiler().compile(Parser(tokenize("x = 2 + y\nprint(x)\n")).parse())
+    assert code.constants == (2,)
+    assert code.symbols.names == ("x", "y")
+    assert code.function_names == ("print",)
+    assert code.disassemble() == [
+        "     0 LOAD_CONST     0 (2)",
+        "     2 LOAD_FAST      1 (y)",
+        "     4 BINARY_ADD     0",
+        "     6 STORE_FAST     0 (x)",
+        "     8 LOAD_FUNCTION  0 (print)",
+        "    10 LOAD_FAST      0 (x)",
+        "    12 CALL_FUNCTION  1",
+        "    14 POP_TOP        0",
+    ]
+
+
+def test_compiled_program_is_reusable() -> None:
+    vm = VirtualMachine(stdout=io.StringIO())
+    code = vm.compile(Parser(tokenize("x = 2\ny = x + 1\n")).parse())
+    assert vm.run(code) == {"x": 2, "y": 3}
+    assert VirtualMachine().run(code) == {"x": 2, "y": 3}
+
+
+def test_closure_program_is_reusable() -> None:
+    engine = ENGINES["closure"]
+    compiled = engine().compile(Parser(tokenize("x = 2\ny = x + 1\n")).parse())
+    assert engine().run(compiled) == {"x": 2, "y": 3}
+    assert engine().run(compiled) == {"x": 2, "y": 3}
+
+
+def test_resolve_slots() -> None:
+    symbols = Resolver().resolve(
+        Parser(tokenize("x = a + b\nprint(a, c)\nb = x\n")).parse()
+    )
+    assert symbols.names == ("x", "a", "b", "c")
+    assert symbols.slots == {"x": 0, "a": 1, "b": 2, "c": 3}
+    slots = symbols.allocate({"a": 1, "z": 0})
+    assert slots[1] == 1 and slots[0] is slots[2] is slots[3]
+    variables = {}
+    symbols.store(slots, variables)
+    assert variables == {"a": 1}
+    assert str(symbols.undefined(3)) == "name 'c' is not defined"
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=list(ENGINES))
+def test_variables_survive_runtime_errors(engine) -> None:
+    executor = engine(stdout=io.StringIO())
+    with pytest.raises(NameError):
+        executor.execute(Parser(tokenize("x = 1\ny = z\n")).parse())
+    assert executor.variables == {"x": 1}
+    assert executor.execute(Parser(tokenize("y = x + 1\n")).parse()) == {"x": 1, "y": 2}
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=list(ENGINES))
+@pytest.mark.parametrize("source_code, expected", [
+    ('a = "x"\nb = "y"\nz = a + b + a + "!" + b\n', "xyx!y"),
+    ("a = 1\nb = 2\nz = a + b + a + b\n", 6),
+    ("a = 5\nb = 2\nz = a + b - a + b + b\n", 6),
+    ('a = "x"\nb = ""\nz = b + a + b + a\n', "xx"),
+])
+def test_add_chains(engine, source_code: str, expected) -> None:
+    variables, _ = run(engine, source_code)
+    assert variables["z"] == expected
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=list(ENGINES))
+def test_add_chains_keep_pairwise_semantics(engine) -> None:
+    calls = []
+
+    def host(value):
+        calls.append(value)
+        return value
+
+    # A failing `+` stops the chain before later operands are evaluated
+    with pytest.raises(TypeError, match="can only concatenate str"):
+        run(engine, 'n = 1\nz = f("a") + f("b") + n + f("c")\n', functions={"f": host})
+    assert calls == ["a", "b"]
+    with pytest.raises(TypeError, match="unsupported operand"):
+        run(engine, 'n = 1\nz = n + f("a") + f("b")\n', functions={"f": host})
+
+    # Other types, including lists after strings fall back, add as usual
+    functions = {"f": lambda: [1], "g": lambda: "s"}
+    variables, _ = run(engine, "z = f() + f() + f()\n", functions=functions)
+    assert variables["z"] == [1, 1, 1]
+
+
+def test_string_add_chain_bytecode() -> None:
+    program = Parser(tokenize('z = a + b + "c"\nw = a + b + 1\n')).parse()
+    lines = Compiler().compile(program).disassemble()
+    assert [line.split()[1] for line in lines if "ADD" in line] == [
+        "ADD_CHAIN", "ADD_CHAIN", "BINARY_ADD", "BINARY_ADD"
+    ]
+    assert lines[4].split()[1:3] == ["ADD_CHAIN", "1"]
+
+
+@pytest.mark.parametrize("engine", ["tree", "bytecode", "closure"])
+def test_long_string_add_chain(engine) -> None:
+    operands = 20_000
+    source_code = 'a = "x"\nz = ' + " + ".join(["a"] * operands) + "\n"
+    program = PARSERS["pratt"](tokenize(source_code)).parse()
+    variables = ENGINES[engine]().execute(program)
+    assert variables["z"] == "x" * operands
+
+
+@pytest.mark.parametrize("engine", ["tree", "bytecode", "closure"])
+def test_long_mixed_add_chain(engine) -> None:
+    # Integer literals keep the chain from being joined as strings
+    operands = 10_000
+    source_code = "a = 2\nz = " + " + ".join(["a", "1"] * (operands // 2)) + "\n"
+    program = PARSERS["pratt"](tokenize(source_code)).parse()
+    variables = ENGINES[engine]().execute(program)
+    assert variables["z"] == 3 * operands // 2
+
+
+@pytest.mark.parametrize("engine", ["tree", "bytecode", "closure"])
+@pytest.mark.parametrize("arena", [False, True])
+@pytest.mark.parametrize("source_code, expected", [
+    ("a = 1\nz = " + " - ".join(["a"] * 2000) + "\n", -1998),
+    ("a = 1\nz = a" + " - a + a" * 750 + "\n", 1),
+    ("a = 1\nz = " + " + ".join(["a"] * 1000) + " - a" * 1000 + "\n", 0),
+], ids=["minus", "alternating", "plus-then-minus"])
+def test_long_operator_chains(
+    engine, arena: bool, source_code: str, expected
+) -> None:
+    program = PARSERS["pratt"](tokenize(source_code)).parse()
+    if arena:
+        program = Arena.from_program(program)
+    variables = ENGINES[engine]().execute(program)
+    assert variables["z"] == expected
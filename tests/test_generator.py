@@ -0,0 +1,74 @@
+# test/test_generator.py
+
+import io
+import pytest
+from benchmarks.bench_scaling import compare
+from benchmarks.generator import ProgramShape, generate_source
+from interpreter.executor import ENGINES
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import Parser
+from interpreter.parser.ast import FunctionCall, walk
+
+SHAPES = [
+    ProgramShape(statements=200),
+    ProgramShape(statements=50, depth=3, width=2, call_density=0.5),
+    ProgramShape(statements=200, width=1, identifiers=1, string_share=1.0),
+    ProgramShape(statements=200, string_share=0.0, print_share=1.0, seed=7),
+]
+
+
+@pytest.mark.parametrize("shape", SHAPES, ids=repr)
+def test_generated_programs_run_on_every_engine(shape: ProgramShape) -> None:
+    source_code = generate_source(shape)
+    assert source_code == generate_source(shape)
+    program = Parser(tokenize(source_code)).parse()
+    assert len(program.statements) == shape.statements + 2 * shape.identifiers
+
+    outputs = set()
+    for engine in ENGINES.values():
+        stdout = io.StringIO()
+        engine(stdout=stdout).execute(program)
+        outputs.add(stdout.getvalue())
+    assert len(outputs) == 1
+
+
+def call_depth(node) -> int:
+    # Calls strictly below `node`, along the deepest path
+    children = [child for child in walk(node) if child is not node]
+    nested = [child for child in children if isinstance(child, FunctionCall)]
+    return max((1 + call_depth(call) for call in nested), default=0)
+
+
+def test_shape_controls_the_program() -> None:
+    shallow = generate_source(ProgramShape(statements=100, depth=0, call_density=1.0))
+    deep = generate_source(
+        ProgramShape(statements=10, depth=3, width=2, call_density=1.0, print_share=0.0)
+    )
+    assert "sum(" not in shallow and "max(" not in shallow
+    program = Parser(tokenize(deep)).parse()
+    assert max(map(call_depth, program.statements)) == 3
+    assert generate_source(ProgramShape(seed=1)) != generate_source(ProgramShape(seed=2))
+
+
+def results(tokenize_rate: float, parse_peak: int) -> dict:
+    return {
+        "engine": "bytecode",
+        "shape": {"depth": 1},
+        "results": [{
+            "statements": 1000,
+            "throughput": {"tokenize": tokenize_rate, "parse": 10, "execute": 10},
+            "peak_memory": {"tokenize": 100, "parse": parse_peak, "execute": 100},
+        }],
+    }
+
+
+def test_compare_against_baseline() -> None:
+    baseline = results(1000, 100)
+    assert compare(results(800, 120), baseline, tolerance=0.3) == []
+    regressions = compare(results(600, 140), baseline, tolerance=0.3)
+    assert len(regressions) == 2
+    assert "tokenize throughput" in regressions[0]
+    assert "parse peak memory" in regressions[1]
+
+    other_shape = {**results(1000, 100), "shape": {"depth": 2}}
+    assert compare(other_shape, baseline, tolerance=0.3)
@@ -1,7 +1,15 @@
 # test/test_lexer.py
 
+import io
+import mmap
+import sys
 import pytest
-from interpreter.lexer.tokenizer import tokenize, Token, TokenCategory
+from interpreter.lexer.interning import TokenInterner
+from interpreter.lexer.streaming import iter_tokens
+from interpreter.lexer.tokenizer import (
+    LEXERS, scan, tokenize, Token, TokenBuffer, TokenCategory
+)
+from interpreter.parser import PARSERS, Parser
 
 @pytest.mark.parametrize("source_code, expected_tokens", [
     ("print", [Token(category=TokenCategory.KEYWORD, lexeme="print")]),
@@ -108,10 +116,11 @@ from interpreter.lexer.tokenizer import tokenize, Token, TokenCategory
         Token(category=TokenCategory.CLOSE_PAREN, lexeme=')')
     ])
 ])
+@pytest.mark.parametrize("lexer", LEXERS.values(), ids=list(LEXERS))
 def test_tokenize_cases(
-    source_code: str, expected_tokens: list[Token]
+    lexer, source_code: str, expected_tokens: list[Token]
 ) -> None:
-    assert tokenize(source_code) == expected_tokens
+    assert list(lexer(source_code)) == expected_tokens
 
 @pytest.mark.parametrize("source_code, expected_exception, message", [
     (
@@ -125,8 +134,149 @@ def test_tokenize_cases(
         'Error: Could not find a token category for the lexeme: "'
     )
 ])
+@pytest.mark.parametrize("lexer", LEXERS.values(), ids=list(LEXERS))
 def test_tokenize_exceptions(
-        source_code: str, expected_exception: Exception, message: str
+        lexer, source_code: str, expected_exception: Exception, message: str
 ) -> None:
     with pytest.raises(expected_exception, match=message):
-        tokenize(source_code)
\ No newline at end of file
+        lexer(source_code)
+
+@pytest.mark.parametrize("source_code", [
+    "x = 1  \ny = 2\n",            # whitespace before a newline swallows it
+    "2print print2 print_ _print print",
+    "x = \"a\\\"b\" + 'c\nd' + \"'\" + '\"'",
+    "x = \"a\\\nb\"",
+    "x = 'unterminated",
+    "a\u00e9b = \u0663\u0664\n",  # Unicode word characters and digits
+    "\u00e9 = 1",
+    "x = 1\r\n\ty = 2\x0c",
+    "",
+])
+def test_lexers_agree(source_code: str) -> None:
+    results = []
+    for lexer in LEXERS.values():
+        try:
+            results.append(list(lexer(source_code)))
+        except SyntaxError as error:
+            results.append(str(error))
+    assert all(result == results[0] for result in results)
+STREAMING_SOURCES = [
+    "x = 10\nz = x + y\n\nprint(z)\n",
+    "variable_name = another_variable + 12345 - 678\n",
+    "x = \"hello world\" + 'it\\'s' + \"a\\\\\"\n  \n  y = 1",
+    "x = \"multi\nline\"\nprint(x)  \n\n",
+    "1print print1 print\n",
+    "café = \"ünicöde ☃\"\n",
+]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+@pytest.mark.parametrize("source_code", STREAMING_SOURCES)
+def test_iter_tokens_matches_tokenize(source_code: str, chunk_size: int) -> None:
+    assert list(iter_tokens(source_code, chunk_size)) == tokenize(source_code)
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+@pytest.mark.parametrize("source_code", STREAMING_SOURCES)
+def test_iter_tokens_from_files(
+    tmp_path, source_code: str, chunk_size: int
+) -> None:
+    path = tmp_path / "source.py"
+    path.write_bytes(source_code.encode("utf-8"))
+    expected = tokenize(source_code)
+
+    with open(path, encoding="utf-8", newline="") as text_file:
+        assert list(iter_tokens(text_file, chunk_size)) == expected
+    with open(path, "rb") as binary_file:
+        assert list(iter_tokens(binary_file, chunk_size)) == expected
+        with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert list(iter_tokens(mapped, chunk_size)) == expected
+
+def test_iter_tokens_is_lazy() -> None:
+    source = io.StringIO("x = 1\n" * 1000 + "@")
+    tokens = iter_tokens(source, chunk_size=16)
+    assert next(tokens) == Token(TokenCategory.IDENTIFIER, "x")
+    assert source.tell() < 100
+    with pytest.raises(SyntaxError):
+        list(tokens)
+
+def test_iter_tokens_scans_long_tokens_in_linear_time(monkeypatch) -> None:
+    from interpreter.lexer import streaming
+    scanned, original = [], streaming.scan_into
+    def scan_into(source_code, *args, **kwargs):
+        scanned.append(len(source_code))
+        return original(source_code, *args, **kwargs)
+    monkeypatch.setattr(streaming, "scan_into", scan_into)
+
+    source_code = 'x = "' + "a" * 100_000 + '"\nprint(x)\n'
+    assert list(iter_tokens(source_code, 64)) == tokenize(source_code)
+    assert sum(scanned) < 4 * len(source_code)
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 64])
+@pytest.mark.parametrize("source_code, message", [
+    ("x = 'unterminated\ny = 1\n", "lexeme: '"),
+    ('x = "a\\\nb"', 'lexeme: "'),
+    ("x = 1 @ 2", "lexeme: @"),
+])
+def test_iter_tokens_exceptions(
+    source_code: str, message: str, chunk_size: int
+) -> None:
+    with pytest.raises(SyntaxError, match=message):
+        list(iter_tokens(source_code, chunk_size))
+
+def test_token_buffer() -> None:
+    source_code = 'x = 10\n  y = "a" + x\nprint(y)'
+    tokens = TokenBuffer.from_source(source_code)
+    assert list(tokens) == tokenize(source_code)
+    assert len(tokens) == 14
+    assert tokens[2] == Token(TokenCategory.NUMBER, 10)
+    assert tokens[-1] == Token(TokenCategory.CLOSE_PAREN, ")")
+    assert tokens.category(6) == TokenCategory.STRING
+    assert tokens.lexeme(6) == '"a"'
+    assert tokens.span(6) == (13, 16)
+    assert tokens.line_column(0) == (1, 1)
+    assert tokens.line_column(6) == (2, 7)
+    assert tokens.line_column(10) == (3, 1)
+    assert tokens.nbytes() < len(tokens) * 16 + 256
+
+def test_token_buffer_stores_numbers_once() -> None:
+    tokens = TokenBuffer.from_source(f"x = 7 + {2 ** 70} + 7\n")
+    assert tokens.constants == [7, 2 ** 70]
+    assert [tokens.lexeme(i) for i in (2, 4, 6)] == [7, 2 ** 70, 7]
+    assert tokens.values.typecode == 'I' and len(tokens.values) == len(tokens)
+
+@pytest.mark.parametrize("parser", PARSERS.values(), ids=list(PARSERS))
+def test_parser_consumes_token_buffer(parser: type) -> None:
+    source_code = 'x = 10\ny = "a" + x - 2\nprint(y, sum(x, 1))\n'
+    built = []
+
+    class CountingBuffer(TokenBuffer):
+        def __getitem__(self, index: int) -> Token:
+            built.append(index)
+            return super().__getitem__(index)
+
+    tokens = CountingBuffer.from_source(source_code)
+    assert parser(tokens).parse() == Parser(tokenize(source_code)).parse()
+    # Only the tokens kept in the AST are built: names and operators
+    assert sorted({tokens.category(i) for i in built}, key=lambda c: c.value) == [
+        TokenCategory.IDENTIFIER, TokenCategory.KEYWORD, TokenCategory.OPERATOR
+    ]
+
+@pytest.mark.parametrize("lexer", [*LEXERS.values(), lambda source: list(iter_tokens(source, 4))])
+def test_repeated_tokens_are_shared(lexer) -> None:
+    source_code = "x = 1\nx = x + 1\nprint(x, y)\nprint(x, 'a')\ny = 'a'\n"
+    tokens = list(lexer(source_code))
+    assert tokens == tokenize(source_code)
+    shared = {}
+    for token in tokens:
+        first = shared.setdefault(token, token)
+        if token.category not in (TokenCategory.NUMBER, TokenCategory.STRING):
+            assert token is first
+    names = [token.lexeme for token in tokens if token.category == TokenCategory.IDENTIFIER]
+    assert all(name is sys.intern(name) for name in names)
+
+def test_interner_is_shared_across_calls() -> None:
+    interner = TokenInterner()
+    first, second = tokenize("abc = 1\n", interner), tokenize("abc + 2", interner)
+    assert first[0] is second[0] is scan("abc", interner)[0]
+    assert len(interner) == 4  # abc, =, newline, +
+    assert interner.intern(TokenCategory.NUMBER, 1) == Token(TokenCategory.NUMBER, 1)
+    assert len(interner) == 4
@@ -0,0 +1,116 @@
+# test/test_metrics.py
+
+import io
+import json
+from pathlib import Path
+import pytest
+from interpreter.cache import ProgramCache
+from interpreter.metrics import (
+    HistogramAggregator, Histogram, Instrumentation, JsonLinesExporter, RunEvent
+)
+from interpreter.pipeline import run_source
+
+SOURCE_CODE = 'x = 2 + 3\ny = "a" + "b"\nprint(x, y)\n'
+
+
+def record(
+    source_code: str = SOURCE_CODE, trace_memory: bool = False, **options
+) -> list[RunEvent]:
+    events = []
+    instrumentation = Instrumentation(trace_memory)
+    instrumentation.subscribe(events.append)
+    run_source(
+        source_code, stdout=io.StringIO(), instrumentation=instrumentation,
+        **options
+    )
+    return events
+
+
+def test_run_event_has_phases_and_sizes() -> None:
+    [event] = record(optimize=True, engine="closure")
+    assert list(event.phases) == ["lex", "parse", "optimize", "execute"]
+    assert all(
+        timing.wall >= 0 and timing.cpu >= 0 for timing in event.phases.values()
+    )
+    assert event.wall == sum(timing.wall for timing in event.phases.values())
+    assert event.labels == {"engine": "closure", "lexer": "regex", "parser": "recursive"}
+    assert event.tokens == 19
+    # Constant folding leaves the program, `x = 5`, `y = "ab"` and the call
+    assert (event.statements, event.nodes) == (3, 8)
+    assert event.cache is None and event.peak_memory is None and event.error is None
+
+
+def test_unoptimized_run_skips_the_optimize_phase() -> None:
+    [event] = record(optimize=False)
+    assert list(event.phases) == ["lex", "parse", "execute"]
+    assert event.nodes == 12
+
+
+def test_cache_hits_and_misses(tmp_path: Path) -> None:
+    cache = ProgramCache(tmp_path)
+    [miss] = record(cache=cache)
+    [hit] = record(cache=cache)
+    assert (miss.cache, hit.cache) == ("miss", "hit")
+    assert list(hit.phases) == ["cache", "execute"]
+    assert hit.tokens is None
+    assert (hit.statements, hit.nodes) == (miss.statements, miss.nodes)
+
+
+def test_parallel_parse_is_one_phase() -> None:
+    [event] = record(workers=2, optimize=False)
+    assert list(event.phases) == ["parse", "execute"]
+    assert event.statements == 3
+    assert event.tokens == 19
+
+
+def test_peak_memory() -> None:
+    [event] = record("x = 1\n" * 1000, trace_memory=True)
+    assert event.peak_memory > 1000
+
+
+def test_failed_runs_are_reported() -> None:
+    instrumentation = Instrumentation()
+    histograms = instrumentation.subscribe(HistogramAggregator())
+    with pytest.raises(NameError):
+        run_source("print(z)\n", instrumentation=instrumentation)
+    assert histograms.errors == 1
+
+
+def test_histogram_quantiles() -> None:
+    histogram = Histogram(bounds=(1, 2, 5, 10))
+    for value in (0.5, 1.5, 1.5, 3, 4, 20):
+        histogram.add(value)
+    assert histogram.count == 6 and histogram.sum == 30.5
+    assert histogram.buckets == [1, 2, 2, 0, 1]
+    assert histogram.min == 0.5 and histogram.max == 20
+    assert 1 <= histogram.quantile(0.5) <= 2
+    assert 2 <= histogram.quantile(0.75) <= 5
+    assert histogram.quantile(1.0) == 20
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_histogram_aggregator() -> None:
+    instrumentation = Instrumentation()
+    histograms = instrumentation.subscribe(HistogramAggregator())
+    for _ in range(3):
+        run_source(SOURCE_CODE, stdout=io.StringIO(), instrumentation=instrumentation)
+    assert histograms.runs == 3
+    assert histograms.histograms["tokens"].count == 3
+    assert histograms.histograms["execute.wall"].count == 3
+    assert "execute.wall" in histograms.format()
+    json.dumps(histograms.to_dict())
+
+
+def test_json_lines_exporter(tmp_path: Path) -> None:
+    path = tmp_path / "metrics.jsonl"
+    instrumentation = Instrumentation()
+    exporter = instrumentation.subscribe(JsonLinesExporter(path))
+    for _ in range(2):
+        run_source(SOURCE_CODE, stdout=io.StringIO(), instrumentation=instrumentation)
+    # Lines are flushed as they are written
+    lines = path.read_text().splitlines()
+    exporter.close()
+    assert len(lines) == 2
+    event = json.loads(lines[0])
+    assert event["tokens"] == 19
+    assert set(event["phases"]["execute"]) == {"wall", "cpu"}
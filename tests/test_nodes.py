@@ -0,0 +1,71 @@
+# test/test_nodes.py
+
+import io
+import pytest
+from benchmarks.generator import ProgramShape, generate_source
+from interpreter.executor import ENGINES
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.optimizer import optimize
+from interpreter.parallel import parse_parallel
+from interpreter.parser import PARSERS, HashConsingNodeFactory
+from interpreter.parser.ast import walk
+from interpreter.pipeline import run_source
+
+SOURCE_CODE = generate_source(ProgramShape(statements=300, depth=2, identifiers=4))
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_shared_ast_equals_plain_ast(parser: str) -> None:
+    plain = PARSERS[parser](tokenize(SOURCE_CODE)).parse()
+    factory = HashConsingNodeFactory()
+    shared = PARSERS[parser](tokenize(SOURCE_CODE), factory).parse()
+    assert shared == plain
+    assert factory.hits > 0
+    # Far fewer distinct objects than nodes
+    assert len({id(node) for node in walk(shared)}) < len(list(walk(plain))) / 2
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_equal_subtrees_are_one_object(parser: str) -> None:
+    tokens = tokenize("a = x + 1\nb = x + 1\nprint(x + 1, x)\nc = 1 + x\n")
+    first, second, call, swapped = PARSERS[parser](
+        tokens, HashConsingNodeFactory()
+    ).parse().statements
+    assert first.expression is second.expression
+    assert call.arguments[0] is first.expression
+    assert call.arguments[1] is first.expression.left
+    assert swapped.expression is not first.expression
+    assert swapped.expression.right is first.expression.left
+
+
+def test_table_stops_growing_at_max_size() -> None:
+    factory = HashConsingNodeFactory(max_size=10)
+    program = PARSERS["recursive"](tokenize(SOURCE_CODE), factory).parse()
+    assert len(factory) == 10
+    assert program == PARSERS["recursive"](tokenize(SOURCE_CODE)).parse()
+
+
+def run(program) -> set[str]:
+    outputs = set()
+    for engine in ENGINES.values():
+        stdout = io.StringIO()
+        engine(stdout=stdout).execute(program)
+        outputs.add(stdout.getvalue())
+    return outputs
+
+
+def test_engines_and_optimizer_accept_shared_ast() -> None:
+    program = PARSERS["pratt"](tokenize(SOURCE_CODE), HashConsingNodeFactory()).parse()
+    expected = run(PARSERS["pratt"](tokenize(SOURCE_CODE)).parse())
+    assert len(expected) == 1
+    assert run(program) == expected
+    assert run(optimize(program)) == expected
+
+
+def test_pipeline_shares_nodes() -> None:
+    assert parse_parallel(SOURCE_CODE, 2, min_chunk_size=1, share_nodes=True) == (
+        PARSERS["recursive"](tokenize(SOURCE_CODE)).parse()
+    )
+    stdout = io.StringIO()
+    run_source(SOURCE_CODE, stdout=stdout, share_nodes=True)
+    assert {stdout.getvalue()} == run(PARSERS["recursive"](tokenize(SOURCE_CODE)).parse())
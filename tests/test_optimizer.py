@@ -0,0 +1,190 @@
+# test/test_optimizer.py
+
+import io
+import pytest
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import Parser, PrattParser
+from interpreter.executor import Executor, VirtualMachine
+from interpreter.optimizer import Optimizer, optimize
+from interpreter.optimizer.inference import Kind, infer_variable_kinds
+from interpreter.optimizer.dataflow import (
+    CommonSubexpressionElimination, ConstantPropagation, DeadStoreElimination
+)
+from interpreter.optimizer.passes import (
+    ConstantFolding, IdentityElimination, Reassociation
+)
+
+
+def parse(source_code: str):
+    return Parser(tokenize(source_code)).parse()
+
+
+def local_passes():
+    return [ConstantFolding(), Reassociation(), IdentityElimination()]
+
+
+def fold(program):
+    return Optimizer(passes=local_passes()).optimize(program)
+
+
+def run(program, stdin: str = "one\n"):
+    stdout = io.StringIO()
+    executor = Executor(stdin=io.StringIO(stdin), stdout=stdout)
+    try:
+        executor.execute(program)
+        error = None
+    except Exception as exception:
+        error = (type(exception), str(exception))
+    return executor.variables, stdout.getvalue(), error
+
+
+@pytest.mark.parametrize("source_code, expected_source_code", [
+    ("x = 2 + 3\n", "x = 5\n"),
+    ("x = 10 - 3 - 2\n", "x = 5\n"),
+    ('x = "a" + "b" + \'c\'\n', "x = 'abc'\n"),
+    ("x = 1\ny = 2 + 3 + x + 4 - 1\n", "x = 1\ny = x + 8\n"),
+    ("x = 1\ny = 5 - x - 5\n", "x = 1\ny = 0 - x\n"),
+    ("x = 1\ny = x + 2 - 2\n", "x = 1\ny = x\n"),
+    ("x = 1\ny = x + 0\nz = 0 + x - 0\n", "x = 1\ny = x\nz = x\n"),
+    ('x = "s"\ny = "a" + x + "b" + "c"\n', 'x = "s"\ny = \'a\' + x + \'bc\'\n'),
+    ('x = "s"\ny = "" + x + ""\n', 'x = "s"\ny = x\n'),
+    ("print(2 + 3, sum(1 - 1))\n", "print(5, sum(0))\n"),
+    ("x = 1\ny = x + 1 + 2 + f() + 3 + 4\n", "x = 1\ny = x + 3 + f() + 3 + 4\n"),
+])
+def test_optimize(source_code: str, expected_source_code: str) -> None:
+    assert fold(parse(source_code)) == parse(expected_source_code)
+
+
+@pytest.mark.parametrize("source_code", [
+    'x = "a" + 1\n',           # must still raise at run time
+    'x = "a" - "b"\n',
+    "y = x + 0\n",              # x is not assigned by the program
+    "y = x + 0\nx = 1\n",       # x is read before the program assigns it
+    "x = input()\ny = x + 0\n",
+    'x = 1\nx = "a"\ny = x + 2 + 3\n',
+    "x = f(1) + 0\n",
+])
+def test_optimize_keeps_unsafe_expressions(source_code: str) -> None:
+    program = parse(source_code)
+    optimized = fold(program)
+    assert optimized.statements[-1] == program.statements[-1]
+
+
+@pytest.mark.parametrize("source_code", [
+    "x = 1\ny = 2 + 3 + x + 4 - 1\nprint(y - 2 - x + 0)\n",
+    'x = input()\nprint("<" + "" + x + ">" + "!")\n',
+    'a = "a"\nb = a + "" + a\nprint(b + "-" + "" + b)\n',
+    "x = 1\nx = x + 1 - 1 + 1\nprint(0 - x + 3)\n",
+    'x = 1 + "a"\n',
+    "y = x + 0\n",
+])
+def test_optimize_preserves_semantics(source_code: str) -> None:
+    program = parse(source_code)
+    assert run(optimize(program)) == run(program)
+
+
+@pytest.mark.parametrize("source_code", [
+    "x = 1\ny = " + " + ".join(["x", "1"] * 2_500) + "\n",
+    'x = "a"\ny = ' + " + ".join(["x", '"b"'] * 2_000) + "\n",
+    'x = input()\ny = ' + " + ".join(["x", '"b"'] * 2_500) + '\nz = y + ""\n',
+    "x = 1\ny = " + " - ".join(["x"] * 5_000) + "\nz = y + 0\n",
+    "x = 1\ny = " + " + ".join(["sum(x)", "0"] * 2_500) + "\nz = y - 1\ny = 2\n",
+    "x = 1\ny = " + "sum(" * 3000 + "x + 0" + ")" * 3000 + "\n",
+], ids=["int", "str", "unknown", "minus", "calls", "nested"])
+def test_optimize_long_expressions(source_code: str) -> None:
+    # Every pass walks the tree iteratively, and in linear time
+    program = PrattParser(tokenize(source_code)).parse()
+    expected = VirtualMachine(stdin=io.StringIO("a\n")).execute(program)
+    optimized = optimize(program)
+    assert VirtualMachine(stdin=io.StringIO("a\n")).execute(optimized) == expected
+
+
+def test_infer_variable_kinds() -> None:
+    kinds = infer_variable_kinds(parse(
+        'a = 1\nb = a + 2\nc = "x"\nd = c + c\ne = input()\n'
+        "f = 1\nf = f + 1\ng = h\nh = 1\ni = 1\ni = c\n"
+    ))
+    assert kinds == {
+        "a": Kind.INT, "b": Kind.INT, "c": Kind.STR, "d": Kind.STR,
+        "e": Kind.UNKNOWN, "f": Kind.INT, "g": Kind.UNKNOWN, "h": Kind.UNKNOWN,
+        "i": Kind.UNKNOWN,
+    }
+
+
+def test_optimizer_report() -> None:
+    optimizer = Optimizer(passes=local_passes())
+    program = optimizer.optimize(parse("x = 1\ny = 2 + 3 + x + 4 - 1 + 0\n"))
+    names = [p.name for p in optimizer.report.passes]
+    assert names == [
+        ConstantFolding.name, Reassociation.name, IdentityElimination.name
+    ]
+    folding, reassociation, _ = optimizer.report.passes
+    assert (folding.rewrites, folding.nodes_before, folding.nodes_after) == (1, 15, 13)
+    assert (reassociation.rewrites, reassociation.nodes_after) == (1, 7)
+    assert optimizer.report.nodes_eliminated == 8
+    assert "total nodes eliminated" in optimizer.report.format()
+    assert program == parse("x = 1\ny = x + 8\n")
+
+
+def test_optimizer_with_no_passes_returns_program_unchanged() -> None:
+    program = parse("x = 2 + 3\n")
+    assert Optimizer(passes=[]).optimize(program) is program
+
+
+@pytest.mark.parametrize("optimization_pass, source_code, expected_source_code", [
+    (ConstantPropagation, "x = 2\ny = x + 1\nprint(y, x)\n",
+     "x = 2\ny = 3\nprint(3, 2)\n"),
+    (ConstantPropagation, "print(x)\nx = 2\nx = input()\nprint(x)\n",
+     "print(x)\nx = 2\nx = input()\nprint(x)\n"),
+    (ConstantPropagation, 'x = "a"\ny = x + 1\n', 'x = "a"\ny = "a" + 1\n'),
+    (CommonSubexpressionElimination, "x = a + b\ny = a + b + c\nz = a + b + c\n",
+     "x = a + b\ny = x + c\nz = y\n"),
+    (CommonSubexpressionElimination, "x = a + b\na = 1\ny = a + b\n",
+     "x = a + b\na = 1\ny = a + b\n"),
+    (CommonSubexpressionElimination, "x = a + b\nx = 1\ny = a + b\n",
+     "x = a + b\nx = 1\ny = a + b\n"),
+    (CommonSubexpressionElimination, "x = f(a) + b\ny = f(a) + b\n",
+     "x = f(a) + b\ny = f(a) + b\n"),
+    (CommonSubexpressionElimination, "x = x + 1\ny = x + 1\n",
+     "x = x + 1\ny = x + 1\n"),
+    (DeadStoreElimination, "x = 1\ny = 2\nx = 3\n", "y = 2\nx = 3\n"),
+    (DeadStoreElimination, "x = 1\nx = x + 1\n", "x = 1\nx = x + 1\n"),
+    (DeadStoreElimination, "x = 1\nprint(2)\nx = 3\n", "x = 1\nprint(2)\nx = 3\n"),
+    (DeadStoreElimination, 'x = y\nx = 1\n', 'x = y\nx = 1\n'),
+    (DeadStoreElimination, 'x = "a" + 1\nx = 1\n', 'x = "a" + 1\nx = 1\n'),
+    (DeadStoreElimination, "x = f()\nx = 1\n", "x = f()\nx = 1\n"),
+    (DeadStoreElimination, "a = 1\nx = a + a\nb = 1\nx = 2\n",
+     "a = 1\nb = 1\nx = 2\n"),
+])
+def test_dataflow_pass(
+    optimization_pass, source_code: str, expected_source_code: str
+) -> None:
+    assert optimization_pass().run(parse(source_code)) == parse(expected_source_code)
+
+
+@pytest.mark.parametrize("source_code", [
+    "x = 2\ny = x + 1\nx = 5\nprint(y, x)\nx = 7\n",
+    "a = input()\nb = a + \"!\"\nc = a + \"!\" + a\nprint(b, c)\n",
+    "x = 1\nprint(x)\nx = 2\ny = z\nx = 3\n",
+    "x = 1\nx = 2\nprint(x)\nx = input() + 1\n",
+])
+def test_dataflow_preserves_semantics(source_code: str) -> None:
+    program = parse(source_code)
+    assert run(optimize(program)) == run(program)
+
+
+def test_dataflow_report_counts_eliminated_nodes() -> None:
+    optimizer = Optimizer()
+    program = optimizer.optimize(parse(
+        "x = 2\ny = x + 3\nx = y + y\nprint(x)\na = input()\nb = a + a\n"
+        "print(a + a)\n"
+    ))
+    assert program == parse(
+        "y = 5\nx = 10\nprint(10)\na = input()\nb = a + a\nprint(b)\n"
+    )
+    eliminated = {
+        p.name: p.nodes_before - p.nodes_after for p in optimizer.report.passes
+    }
+    assert eliminated[ConstantPropagation.name] == 4
+    assert eliminated[CommonSubexpressionElimination.name] == 2
+    assert eliminated[DeadStoreElimination.name] == 2
@@ -0,0 +1,127 @@
+# test/test_output.py
+
+import io
+import threading
+from pathlib import Path
+import pytest
+from interpreter.executor import ENGINES
+from interpreter.executor.output import (
+    BufferedSink, FileSink, ListSink, NullSink, OutputSink, RingBufferSink,
+    StreamSink
+)
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parser import Parser
+
+PROGRAM = Parser(tokenize('print(1)\nprint("two", 3)\nprint()')).parse()
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=list(ENGINES))
+def test_engines_print_to_sinks(engine) -> None:
+    sink = ListSink()
+    engine(stdout=sink).execute(PROGRAM)
+    assert sink.getvalue() == "1\ntwo 3\n\n"
+    assert sink.lines == ["1", "two 3", ""]
+
+
+def test_stream_and_file_sinks(tmp_path: Path) -> None:
+    stream = io.StringIO()
+    ENGINES["bytecode"](stdout=StreamSink(stream)).execute(PROGRAM)
+    assert stream.getvalue() == "1\ntwo 3\n\n"
+
+    path = tmp_path / "out.txt"
+    with FileSink(str(path)) as sink:
+        ENGINES["bytecode"](stdout=sink).execute(PROGRAM)
+    assert path.read_text() == "1\ntwo 3\n\n"
+
+
+def test_ring_buffer_keeps_the_last_lines() -> None:
+    sink = RingBufferSink(capacity=2)
+    for text in ("a\n", "b\nc", "d\n", "prompt: "):
+        sink.write(text)
+    assert sink.lines == ["b", "cd", "prompt: "]
+    assert sink.getvalue() == "b\ncd\nprompt: "
+
+
+def test_sinks_must_implement_write() -> None:
+    class Incomplete(OutputSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_null_sink() -> None:
+    sink = NullSink()
+    assert sink.write("ignored\n") == 8
+    ENGINES["closure"](stdout=sink).execute(PROGRAM)
+
+
+def test_buffered_sink_flushes_by_size() -> None:
+    target = ListSink()
+    sink = BufferedSink(target, buffer_size=10, flush_at_exit=False)
+    sink.write("12345")
+    assert target.writes == []
+    sink.write("67890")
+    assert target.writes == ["1234567890"]
+    sink.write("x")
+    sink.close()
+    assert target.writes == ["1234567890", "x"]
+
+
+def test_buffered_sink_flushes_by_time() -> None:
+    target = ListSink()
+    sink = BufferedSink(target, flush_interval=0, flush_at_exit=False)
+    sink.write("a")
+    sink.write("b")
+    assert target.writes == ["a", "b"]
+
+    sink = BufferedSink(target, flush_interval=3600, flush_at_exit=False)
+    sink.write("c")
+    assert target.writes == ["a", "b"]
+    sink._last_flush -= 3600
+    sink.write("d")
+    assert target.writes == ["a", "b", "cd"]
+    sink.close()
+    assert sink._timer is None
+
+
+def test_buffered_sink_flushes_by_time_without_writes() -> None:
+    target = ListSink()
+    flushed = threading.Event()
+    target.flush = flushed.set
+    sink = BufferedSink(target, flush_interval=0.05, flush_at_exit=False)
+    sink.write("a")
+    sink.write("b")
+    assert target.writes == []
+    assert flushed.wait(5)
+    assert target.writes == ["ab"]
+    sink.close()
+
+
+def test_buffered_sink_flushes_before_input() -> None:
+    target = ListSink()
+    seen = []
+
+    class Stdin:
+        def readline(self) -> str:
+            seen.append(target.getvalue())
+            return "bob\n"
+
+    sink = BufferedSink(target, flush_at_exit=False)
+    program = Parser(tokenize('print("hello")\nx = input("name? ")\nprint(x)')).parse()
+    ENGINES["bytecode"](stdin=Stdin(), stdout=sink).execute(program)
+    assert seen == ["hello\nname? "]
+    assert target.getvalue() == "hello\nname? "
+    sink.close()
+    assert target.getvalue() == "hello\nname? bob\n"
+
+
+def test_buffered_sink_flushes_at_exit() -> None:
+    target = ListSink()
+    sink = BufferedSink(target)
+    sink.write("pending")
+    sink._at_exit()     # What atexit would call
+    assert target.getvalue() == "pending"
+    sink.close()
+    # Closing unregisters the hook
+    assert sink._at_exit is None
@@ -0,0 +1,66 @@
+# test/test_parallel.py
+
+import pytest
+from interpreter.lexer.tokenizer import tokenize
+from interpreter.parallel import (
+    parse_parallel, parse_parallel_counted, split_source
+)
+from interpreter.parser import PARSERS, Parser
+from interpreter.pipeline import run_source
+
+SOURCE_CODE = (
+    'x = "multi\nline" + y\n'
+    "s = 'say \"hi\"\n' + x  \n+ 1\n"    # whitespace swallows the newline
+    'print(x, "\'")\n'
+    "\n\n"
+    "f(1)\ny = x - 2\n"
+) * 20
+
+
+@pytest.mark.parametrize("source_code", [
+    SOURCE_CODE,
+    "x = 1\r\ny = 2\r\n" * 10,           # `\r` swallows every newline
+    '"' + "x = 1\n" * 10 + '"',          # one string spanning everything
+    "",
+])
+@pytest.mark.parametrize("parts", [1, 2, 7, 100])
+def test_split_source_keeps_tokens(source_code: str, parts: int) -> None:
+    pieces = split_source(source_code, parts)
+    assert "".join(pieces) == source_code
+    assert len(pieces) <= max(parts, 1)
+    assert [
+        token for piece in pieces for token in tokenize(piece)
+    ] == tokenize(source_code)
+
+
+def test_split_source_splits_at_newlines() -> None:
+    pieces = split_source("x = 1\n" * 100, 4)
+    assert len(pieces) == 4
+    assert all(piece.endswith("\n") for piece in pieces)
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_parse_parallel_matches_serial(parser: str) -> None:
+    program = parse_parallel(SOURCE_CODE, workers=2, parser=parser, min_chunk_size=64)
+    assert program == Parser(tokenize(SOURCE_CODE)).parse()
+
+
+def test_parse_parallel_counts_tokens() -> None:
+    program, tokens = parse_parallel_counted(SOURCE_CODE, workers=2, min_chunk_size=64)
+    assert program == Parser(tokenize(SOURCE_CODE)).parse()
+    assert tokens == len(tokenize(SOURCE_CODE))
+
+
+def test_parse_parallel_reports_lexing_errors_first() -> None:
+    # The parse error comes first in the source, but the serial path
+    # tokenizes everything before it parses
+    source_code = "x = )\n" + "y = 1\n" * 50 + "z = @\n"
+    with pytest.raises(SyntaxError, match="lexeme: @"):
+        Parser(tokenize(source_code)).parse()
+    with pytest.raises(SyntaxError, match="lexeme: @"):
+        parse_parallel(source_code, workers=2, min_chunk_size=64)
+
+
+def test_run_source_with_workers() -> None:
+    source_code = "x = 1\n" + "x = x + 1\n" * 100
+    assert run_source(source_code, workers=2) == {"x": 101}
@@ -1,12 +1,14 @@
 # test/test_parser.py
 
+import random
 import pytest
 from interpreter.parser.ast import (
     Assignment, BinaryExpression, FunctionCall, Literal, Variable
 )
-from interpreter.lexer.tokenizer import Token, TokenCategory
-from interpreter.parser import Parser
+from interpreter.lexer.tokenizer import Token, TokenCategory, tokenize
+from interpreter.parser import PARSERS, Parser, PrattParser, iter_statements
 
+@pytest.mark.parametrize("parser_class", PARSERS.values(), ids=list(PARSERS))
 @pytest.mark.parametrize("tokens, expected_identifier, expected_value", [
     (
         [Token(lexeme="x", category=TokenCategory.IDENTIFIER),
@@ -28,11 +30,12 @@ from interpreter.parser import Parser
     )
 ])
 def test_parse_assignment(
+    parser_class: type,
     tokens: list[Token],
     expected_identifier: str,
     expected_value: int | str
 ) -> None:
-    parser = Parser(tokens)
+    parser = parser_class(tokens)
     program = parser.parse()
     statement = program.statements[0]
     
@@ -42,6 +45,7 @@ def test_parse_assignment(
     assert statement.expression.value == expected_value
 
 
+@pytest.mark.parametrize("parser_class", PARSERS.values(), ids=list(PARSERS))
 @pytest.mark.parametrize("tokens, expected_function, expected_arguments", [
     (
         [Token(lexeme="print", category=TokenCategory.KEYWORD),
@@ -87,11 +91,12 @@ def test_parse_assignment(
 
 ])
 def test_parse_function_call(
+    parser_class: type,
     tokens: list[Token],
     expected_function: str,
     expected_arguments: list[int]
 ) -> None:
-    parser = Parser(tokens)
+    parser = parser_class(tokens)
     program = parser.parse()
     statement = program.statements[0]
 
@@ -104,6 +109,7 @@ def test_parse_function_call(
         assert a.value == expected_arguments[i]
 
 
+@pytest.mark.parametrize("parser_class", PARSERS.values(), ids=list(PARSERS))
 @pytest.mark.parametrize(
     "tokens, expected_ast", [
         # Test 1: Basic addition
@@ -197,14 +203,15 @@ def test_parse_function_call(
         )
     ]
 )
-def test_parse_binary_expression(tokens: list[Token], expected_ast: BinaryExpression) -> None:
-    parser = Parser(tokens)
+def test_parse_binary_expression(parser_class: type, tokens: list[Token], expected_ast: BinaryExpression) -> None:
+    parser = parser_class(tokens)
     program = parser.parse()
     statement = program.statements[0]
 
     assert statement == expected_ast
 
 
+@pytest.mark.parametrize("parser_class", PARSERS.values(), ids=list(PARSERS))
 @pytest.mark.parametrize("tokens, num_statements", [
     (
         [
@@ -231,7 +238,100 @@ def test_parse_binary_expression(tokens: list[Token], expected_ast: BinaryExpres
         2  # Two statements: assignment and function call
     )
 ])
-def test_parse_multiple_statements(tokens: str, num_statements: int) -> None:
-    parser = Parser(tokens)
+def test_parse_multiple_statements(parser_class: type, tokens: str, num_statements: int) -> None:
+    parser = parser_class(tokens)
     program = parser.parse()
     assert len(program.statements) == num_statements
+
+
+@pytest.mark.parametrize("source_code", [
+    "x = 2\nprint(x)\n",
+    "\n\nx = 1  \ny = x + 2\n\nprint(x, y)",   # whitespace swallows a newline
+    'x = "multi\nline" + y\nf(x, 1)\n',
+    "x\ny = x\nx",                            # lone identifiers on a line
+    "",
+])
+def test_iter_statements_matches_parse(source_code: str) -> None:
+    assert (
+        list(iter_statements(tokenize(source_code)))
+        == Parser(tokenize(source_code)).parse().statements
+    )
+
+
+def test_iter_statements_is_lazy() -> None:
+    tokens = iter(tokenize("x = 1\ny = @\n".replace("@", "(")))
+    statements = iter_statements(tokens)
+    assert next(statements) == Assignment("x", Literal(1))
+    with pytest.raises(SyntaxError):
+        next(statements)
+
+
+@pytest.mark.parametrize("source_code", [
+    "x = 1 + 2 - y\nprint(x, sum(1, 2) - 3)\n",
+    'y = "a" + max() + f(g(h(1)), 2 - 3)\n',
+    "x\ny = x\nx",
+])
+def test_pratt_parser_matches_parser(source_code: str) -> None:
+    tokens = tokenize(source_code)
+    assert PrattParser(tokens).parse() == Parser(tokens).parse()
+
+
+def test_pratt_parser_matches_parser_on_random_token_streams() -> None:
+    rng = random.Random(0)
+    # The lexer only knows + - =, but the parsers accept every operator
+    vocabulary = tokenize('x = 1 "s" f print ( ) , + -\n') + [
+        Token(lexeme=lexeme, category=TokenCategory.OPERATOR)
+        for lexeme in ("*", "^", "&&")
+    ]
+    for _ in range(2000):
+        tokens = [rng.choice(vocabulary) for _ in range(rng.randint(1, 12))]
+        try:
+            expected = Parser(tokens).parse()
+        except (SyntaxError, AttributeError, IndexError):
+            # Both reject it, though `Parser` may not do so cleanly
+            with pytest.raises(SyntaxError):
+                PrattParser(tokens).parse()
+        else:
+            assert PrattParser(tokens).parse() == expected
+
+
+def test_pratt_parser_handles_deep_nesting() -> None:
+    depth = 5000
+    tokens = tokenize("f(" * depth + "1" + ")" * depth)
+    with pytest.raises(RecursionError):
+        Parser(tokens).parse()
+
+    expression = PrattParser(tokens).parse().statements[0]
+    for _ in range(depth):
+        assert isinstance(expression, FunctionCall)
+        (expression,) = expression.arguments
+    assert expression == Literal(1)
+
+
+@pytest.mark.parametrize("parser_class", PARSERS.values(), ids=list(PARSERS))
+def test_parse_long_expression(parser_class: type) -> None:
+    terms = 20000
+    program = parser_class(tokenize("x = " + " + ".join(["1"] * terms))).parse()
+    expression, depth = program.statements[0].expression, 0
+    while isinstance(expression, BinaryExpression):
+        expression, depth = expression.left, depth + 1
+    assert depth == terms - 1
+
+
+@pytest.mark.parametrize("source_code, message", [
+    ("x = 1 +", "end of input"),
+    ("f(1", "end of input"),
+    ("x = )", "Unexpected token"),
+    ("print 1", "Expected"),
+])
+def test_pratt_parser_errors(source_code: str, message: str) -> None:
+    with pytest.raises(SyntaxError, match=message):
+        PrattParser(tokenize(source_code)).parse()
+
+
+def test_iter_statements_with_pratt_parser() -> None:
+    source_code = "x = 1\ny = f(x) + 2\n"
+    assert (
+        list(iter_statements(tokenize(source_code), PrattParser))
+        == Parser(tokenize(source_code)).parse().statements
+    )
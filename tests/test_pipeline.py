@@ -0,0 +1,69 @@
+# test/test_pipeline.py
+
+import io
+import pytest
+from interpreter.executor import ENGINES
+from interpreter.pipeline import run_source, run_stream
+
+SOURCE_CODE = 'x = 2 + 3\nname = input()\nprint("hi " + name, x)\ny = x - 1\n'
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+@pytest.mark.parametrize("optimize", [True, False])
+def test_run_stream_matches_run_source(engine: str, optimize: bool) -> None:
+    results = []
+    for run, source in ((run_source, SOURCE_CODE), (run_stream, SOURCE_CODE),
+                        (run_stream, io.BytesIO(SOURCE_CODE.encode()))):
+        stdout = io.StringIO()
+        variables = run(
+            source, engine, optimize=optimize,
+            stdin=io.StringIO("bob\n"), stdout=stdout
+        )
+        results.append((variables, stdout.getvalue()))
+    assert results[0] == results[1] == results[2]
+    assert results[0] == ({"x": 5, "name": "bob", "y": 4}, "hi bob 5\n")
+
+
+def test_run_stream_executes_before_reading_everything() -> None:
+    source = io.StringIO("print(1)\n" + "x = 1\n" * 10_000 + "@\n")
+    stdout = io.StringIO()
+    with pytest.raises(SyntaxError):
+        run_stream(source, stdout=stdout, chunk_size=64)
+    assert stdout.getvalue().startswith("1\n")
+
+    # The first statement runs after reading a single chunk
+    source = io.StringIO("print(1)\n" + "x = 1\n" * 10_000)
+    positions = []
+    run_stream(
+        source, functions={"print": lambda *args: positions.append(source.tell())},
+        chunk_size=64
+    )
+    assert positions == [64]
+
+
+@pytest.mark.parametrize("parser", ["recursive", "pratt"])
+@pytest.mark.parametrize("source_code", [
+    "print(1)\nx = 1 +\n", "print(x\n", "print(1)\nx = 1 +", "print(x, 1", "x =",
+])
+def test_run_stream_raises_the_same_syntax_error(source_code: str, parser: str) -> None:
+    errors = []
+    for run in (run_source, run_stream):
+        with pytest.raises(SyntaxError) as error:
+            run(source_code, stdout=io.StringIO(), parser=parser)
+        errors.append(str(error.value))
+    assert errors[0] == errors[1]
+
+
+@pytest.mark.parametrize("optimize", [True, False])
+def test_bytecode_engine_runs_expressions_beyond_the_recursion_limit(
+    optimize: bool
+) -> None:
+    depth, terms = 3000, 20000
+    source_code = (
+        "x = " + " + ".join(["1"] * terms) + "\n"
+        + "y = " + "sum(" * depth + "x" + ")" * depth + "\n"
+    )
+    variables = run_source(
+        source_code, "bytecode", optimize=optimize, parser="pratt"
+    )
+    assert variables == {"x": terms, "y": terms}
@@ -0,0 +1,116 @@
+# test/test_profiler.py
+
+import io
+import sys
+import time
+from itertools import count
+import pytest
+from interpreter.executor.profiler import (
+    ProfilingExecutor, node_label, parse_with_lines, profile_program
+)
+from interpreter.parser import PARSERS
+from interpreter.parser.ast import Literal
+
+SOURCE_CODE = '''
+a = 1
+
+b = sum(a, 2)
+print(b + a, "x;y")
+'''
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_statement_lines(parser: str) -> None:
+    program, lines = parse_with_lines(SOURCE_CODE, parser)
+    assert len(program.statements) == 3
+    assert lines == [2, 4, 5]
+
+
+def test_exact_profile_counts_and_times_every_node() -> None:
+    program, lines = parse_with_lines(SOURCE_CODE)
+    stdout = io.StringIO()
+    profile = profile_program(program, "exact", lines, stdout=stdout)
+    assert stdout.getvalue() == "4 x;y\n"
+
+    by_label = {(stats.line, stats.label): stats for stats in profile.nodes.values()}
+    assert set(by_label) == {
+        (2, "a ="), (2, "1"), (4, "b ="), (4, "sum()"), (4, "a"), (4, "2"),
+        (5, "print()"), (5, "+"), (5, "b"), (5, "a"), (5, '"x:y"'),
+    }
+    assert all(stats.count == 1 for stats in profile.nodes.values())
+    assert all(
+        stats.inclusive >= stats.exclusive >= 0 for stats in profile.nodes.values()
+    )
+    assert by_label[4, "b ="].inclusive >= by_label[4, "sum()"].inclusive
+    assert sorted(profile.lines) == [2, 4, 5]
+    assert sum(stats.inclusive for stats in profile.lines.values()) == profile.total
+
+
+def test_exact_profile_with_a_fake_clock() -> None:
+    # Every clock reading advances time by one unit
+    clock = count().__next__
+    program, lines = parse_with_lines("x = 1 + 2\n")
+    executor = ProfilingExecutor(lines=lines, clock=clock)
+    executor.execute(program)
+    profile = executor.profile
+    assert profile.stacks == {
+        ("line 1", "x =", "+", "1"): 1,
+        ("line 1", "x =", "+", "2"): 1,
+        ("line 1", "x =", "+"): 3,
+        ("line 1", "x ="): 2,
+    }
+    assert profile.lines[1].inclusive == profile.total == 7
+    assert profile.collapsed() == (
+        "line 1;x = 2\n"
+        "line 1;x =;+ 3\n"
+        "line 1;x =;+;1 1\n"
+        "line 1;x =;+;2 1\n"
+    )
+
+
+def test_exact_profile_of_a_stream_numbers_statements() -> None:
+    program, _ = parse_with_lines("x = 1\nprint(x)\n")
+    executor = ProfilingExecutor(stdout=io.StringIO())
+    executor.execute_stream(program.statements)
+    assert sorted(executor.profile.lines) == [1, 2]
+
+
+def test_report_sorts_by_self_time() -> None:
+    program, lines = parse_with_lines(SOURCE_CODE)
+    profile = profile_program(program, "exact", lines, stdout=io.StringIO())
+    report = profile.report(limit=2)
+    assert report.startswith("exact profile: ")
+    node_rows = report.split("by node (self):\n")[1].split("\n\n")[0].splitlines()
+    assert len(node_rows) == 3  # Header and two nodes
+    hottest = max(profile.nodes.values(), key=lambda stats: stats.exclusive)
+    assert node_rows[1].endswith(hottest.label)
+
+
+def test_labels_are_safe_frame_names() -> None:
+    assert node_label(Literal('"a;b"')) == '"a:b"'
+    assert node_label(Literal('"' + "x" * 100 + '"')).endswith("...")
+
+
+def test_sampling_profile_attributes_samples_to_the_running_node() -> None:
+    program, lines = parse_with_lines("a = 1\n\nb = slow(a) + 1\nprint(b)\n")
+    switch_interval = sys.getswitchinterval()
+    stdout = io.StringIO()
+    profile = profile_program(
+        program, "sampling", lines, interval=0.001, stdout=stdout,
+        functions={"slow": lambda value: time.sleep(0.1) or value}
+    )
+    assert stdout.getvalue() == "2\n"
+    assert sys.getswitchinterval() == switch_interval
+    assert profile.stacks[("line 3", "b =", "+", "slow()")] > 10
+    assert profile.lines[3].inclusive >= profile.stacks[("line 3", "b =", "+", "slow()")]
+    slow = next(
+        stats for stats in profile.nodes.values() if stats.label == "slow()"
+    )
+    assert slow.line == 3 and slow.exclusive == slow.inclusive > 10
+    assert "sampling profile: " in profile.report()
+
+
+def test_unknown_mode() -> None:
+    program, _ = parse_with_lines("x = 1\n")
+    with pytest.raises(ValueError):
+        profile_program(program, "tracing")
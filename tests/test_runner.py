@@ -0,0 +1,54 @@
+# test/test_runner.py
+
+from pathlib import Path
+import pytest
+from interpreter.runner import Job, JobRunner, RunnerMetrics
+
+
+@pytest.fixture(scope="module")
+def runner():
+    with JobRunner(workers=2) as runner:
+        yield runner
+
+
+def test_jobs_are_isolated(runner: JobRunner) -> None:
+    jobs = [
+        Job('x = input()\nprint("hi " + x)', stdin="ann\n", name="greet"),
+        Job("y = x + 1", name="leak"),     # must not see `x` from another job
+        Job("print(1 + 2)\nz = 5", name="sum"),
+    ]
+    results = {result.name: result for result in runner.run(jobs)}
+
+    assert results["greet"].stdout == "hi ann\n"
+    assert results["greet"].variables == {"x": "ann"}
+    assert results["leak"].error == "NameError: name 'x' is not defined"
+    assert not results["leak"].ok
+    assert (results["sum"].stdout, results["sum"].variables) == ("3\n", {"z": 5})
+    assert sorted(result.index for result in results.values()) == [0, 1, 2]
+
+
+def test_results_stream_from_lazy_job_iterables(runner: JobRunner) -> None:
+    count = 50
+    jobs = (Job(f"print({i})", name=str(i)) for i in range(count))
+    results = list(runner.run(jobs))
+    assert sorted(int(result.stdout) for result in results) == list(range(count))
+    assert all(result.worker > 0 and result.seconds >= 0 for result in results)
+
+
+def test_metrics(runner: JobRunner) -> None:
+    runner.metrics = RunnerMetrics(runner.workers)
+    results = list(runner.run([Job("x = 1"), Job("x = ("), Job("print(2)")]))
+
+    metrics = runner.metrics
+    assert len(results) == metrics.submitted == metrics.completed == 3
+    assert metrics.failed == 1
+    assert metrics.queue_depth == metrics.in_flight == 0
+    assert metrics.throughput > 0 and 0 <= metrics.worker_busy <= 1
+    assert "3 jobs (1 failed)" in metrics.format()
+
+
+def test_job_from_file(tmp_path: Path) -> None:
+    path = tmp_path / "script.py"
+    path.write_text("print(input())\n")
+    job = Job.from_file(str(path), stdin="line\n")
+    assert job == Job("print(input())\n", "line\n", str(path))
@@ -0,0 +1,132 @@
+# test/test_transpiler.py
+
+import ast as python_ast
+import io
+import random
+import pytest
+from interpreter.lexer.tokenizer import Token, TokenCategory, tokenize
+from interpreter.parser import PARSERS, Parser
+from interpreter.parser.ast import (
+    Assignment, BinaryExpression, FunctionCall, Literal, Program
+)
+from interpreter.executor import Executor, PythonExecutor, VirtualMachine
+from interpreter.executor.transpiler import Transpiler
+
+
+def run(engine, source_code: str, stdin: str = "", functions=None):
+    stdout = io.StringIO()
+    executor = engine(stdin=io.StringIO(stdin), stdout=stdout, functions=functions)
+    try:
+        executor.execute(Parser(tokenize(source_code)).parse())
+        error = None
+    except Exception as exception:
+        error = (type(exception), str(exception))
+    return executor.variables, stdout.getvalue(), error
+
+
+def generate_source(seed: int, statements: int = 50) -> str:
+    rng = random.Random(seed)
+    names = ["a", "b", "c", "d"]
+    lines = [f"{name} = {rng.randint(0, 9)}" for name in names]
+    for _ in range(statements):
+        terms = [
+            rng.choice(names + [str(rng.randint(0, 99))])
+            for _ in range(rng.randint(1, 5))
+        ]
+        expression = terms[0] + "".join(
+            f" {rng.choice('+-')} {term}" for term in terms[1:]
+        )
+        match rng.randint(0, 3):
+            case 0:
+                lines.append(f"print({expression}, sum({expression}, 1))")
+            case 1:
+                lines.append(f"{rng.choice(names)} = max({expression}, 0)")
+            case _:
+                lines.append(f"{rng.choice(names)} = {expression}")
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize("source_code", [
+    "x = 2 + 3 - 1\n",
+    'x = "a" + \'b\'\nprint(x, x + "c")\n',
+    'x = "say \\"hi\\""\nprint(x)\n',
+    "x = input()\ny = input(x)\nprint(y)\n",
+    "x = 1\nprint(x)\ny = x + z\nprint(y)\n",
+    "print(1)\nf(2)\nprint(3)\n",
+    'x = 1 + "a"\n',
+    "x = max()\n",
+    "x = len(1)\n",
+    "True = 1\nNone = True + 1\nprint(True, None)\n",
+    "__builtins__ = 1\nprint(__builtins__)\n",
+    "print(__builtins__)\n",
+    "print(1)\nprint(True)\n",
+    'x = 1\nprint(x)\ny = "a\nb"\n',
+] + [generate_source(seed) for seed in range(20)])
+def test_transpiled_semantics_match_reference(source_code: str) -> None:
+    expected = run(Executor, source_code, stdin="one\ntwo\n")
+    assert run(PythonExecutor, source_code, stdin="one\ntwo\n") == expected
+
+
+def test_functions_and_variables_do_not_clash() -> None:
+    functions = {"f": lambda value: value * 2}
+    expected = run(Executor, "f = 4\nf = f(f)\n", functions=functions)
+    assert run(PythonExecutor, "f = 4\nf = f(f)\n", functions=functions) == expected
+    assert expected[0] == {"f": 8}
+
+
+def test_python_builtins_are_not_exposed() -> None:
+    _, _, error = run(PythonExecutor, "x = abs(1)\n")
+    assert error == (NameError, "function 'abs' is not defined")
+
+
+def test_transpile_to_python_module() -> None:
+    module = Transpiler().transpile(
+        Parser(tokenize('x = 2 + y\nprint(x, "a")\n')).parse()
+    )
+    assert python_ast.unparse(module) == "$x = 2 + $y\n@print($x, 'a')"
+
+
+@pytest.mark.parametrize("operator", ["&&", "||"])
+def test_boolean_operators_evaluate_both_operands(operator: str) -> None:
+    # The lexer has no `&&`/`||`, so the expression is built by hand
+    called = []
+    functions = {"f": lambda value: called.append(value) or value}
+    program = Program([Assignment("x", BinaryExpression(
+        FunctionCall(Token(TokenCategory.IDENTIFIER, "f"), [Literal(0)]),
+        Token(TokenCategory.OPERATOR, operator),
+        FunctionCall(Token(TokenCategory.IDENTIFIER, "f"), [Literal(1)]),
+    ))])
+    expected = Executor(functions=functions).execute(program)
+    assert called == [0, 1]
+    called.clear()
+    assert PythonExecutor(functions=functions).execute(program) == expected
+    assert called == [0, 1]
+
+
+def test_variables_persist_between_runs() -> None:
+    executor = PythonExecutor(stdout=io.StringIO())
+    executor.execute(Parser(tokenize("x = 1\n")).parse())
+    assert executor.execute(Parser(tokenize("y = x + 1\n")).parse()) == {"x": 1, "y": 2}
+
+
+@pytest.mark.parametrize("source_code", [
+    "a = 1\nz = " + " + ".join(["a"] * 2000) + "\n",
+    "a = 1\nz = " + " - ".join(["a"] * 2000) + "\n",
+    "a = 1\nz = a" + " - a + a" * 750 + "\n",
+    # Long chains nested in the operands of a long chain get their own temporary
+    "a = 1\nz = " + " - ".join([f"max({' + '.join(['a'] * 300)})", "a"] * 300) + "\n",
+    'a = 1\nz = ' + " + ".join(["a"] * 500) + ' + "s"' + " + a" * 500 + "\n",
+])
+def test_long_chains_do_not_nest(source_code: str) -> None:
+    program = PARSERS["pratt"](tokenize(source_code)).parse()
+
+    def run_program(engine):
+        executor = engine()
+        try:
+            executor.execute(program)
+            error = None
+        except TypeError as exception:
+            error = str(exception)
+        return executor.variables, error
+
+    assert run_program(PythonExecutor) == run_program(VirtualMachine)